@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_key(content: bytes, *parts) -> str:
+    """Content-addressed cache key: SHA-256 of the parts and the raw bytes"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class MemoryTier:
+    """Thread-safe in-process LRU with TTL and a total size budget"""
+
+    def __init__(self, max_items: int, max_bytes: int, ttl: float):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, size: int, expires_at: float = None):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at or time.time() + self.ttl, size, value)
+            self.total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_items or self.total_bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteTier:
+    """On-disk tier shared by every worker process on the host"""
+
+    def __init__(self, path: str, max_bytes: int, ttl: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_created ON analysis_cache (created_at)"
+        )
+
+    def _connect(self):
+        # One connection per thread; WAL lets workers read while one writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        """Return (payload, size, expires_at) or None"""
+        return (
+            self._connect()
+            .execute(
+                "SELECT value, size, expires_at FROM analysis_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+
+    def set(self, key: str, payload: str, size: int):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_cache (key, value, size, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (key, payload, size, now, now + self.ttl),
+        )
+        self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        conn.execute("DELETE FROM analysis_cache WHERE expires_at <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM analysis_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop the oldest entries until the tier is back under budget
+        excess = total - self.max_bytes
+        freed = 0
+        stale_keys = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM analysis_cache ORDER BY created_at"
+        ):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM analysis_cache WHERE key = ?", stale_keys)
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+
+class AnalysisCache:
+    """Two-tier (memory LRU + SQLite) cache for finished analysis results"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 24 * 3600,
+        memory_items: int = 256,
+        memory_bytes: int = 64 * 1024 * 1024,
+        disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.memory = MemoryTier(memory_items, memory_bytes, ttl)
+        self.disk = None
+        try:
+            self.disk = SQLiteTier(path, disk_bytes, ttl)
+        except Exception as e:
+            print(f"⚠️ Disk cache disabled: {str(e)}")
+
+        self._lock = threading.Lock()
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.disk is not None:
+            try:
+                row = self.disk.get(key)
+            except Exception as e:
+                print(f"⚠️ Disk cache read error: {str(e)}")
+                self._count("errors")
+                row = None
+            if row is not None:
+                payload, size, expires_at = row
+                value = json.loads(payload)
+                self.memory.set(key, value, size, expires_at)
+                self._count("disk_hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value):
+        payload = json.dumps(value)
+        size = len(payload)
+        self.memory.set(key, value, size)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, payload, size)
+            except Exception as e:
+                print(f"⚠️ Disk cache write error: {str(e)}")
+                self._count("errors")
+        self._count("stores")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4)
+            if lookups
+            else 0.0
+        )
+        stats["memory_entries"] = len(self.memory)
+        stats["memory_bytes"] = self.memory.total_bytes
+        stats["disk_enabled"] = self.disk is not None
+        if self.disk is not None:
+            try:
+                stats["disk_entries"] = self.disk.count()
+            except Exception:
+                stats["disk_entries"] = None
+        return stats
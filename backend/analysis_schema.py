@@ -0,0 +1,229 @@
+import json
+import re
+
+# Compact wire format the model is asked to produce. Keys are short, rows
+# are positional arrays and anything validate_and_clean_analysis derives
+# (counts, candidate type, experience level) is left out.
+FIELD_EXAMPLES = {
+    "i": '"i":["name","email","phone"]',
+    "y": '"y":0',
+    "e": '"e":[["degree","institution","year"]]',
+    "p": '"p":[["name","description",["technology"],["main point"]]]',
+    "s": '"s":{"L":[],"W":[],"D":[],"F":[],"T":[]}',
+    "c": '"c":[["name","year"]]',
+    "a": '"a":["achievement"]',
+    "st": '"st":["overall strength"]',
+}
+
+FIELD_LEGEND = {
+    "i": "i = personal info",
+    "y": "y = total years of professional experience (a number)",
+    "e": "e = education",
+    "p": "p = projects",
+    "s": "s = skills",
+    "c": "c = certifications",
+    "a": "a = achievements",
+    "st": "st = overall strengths",
+}
+
+FIELD_NOTES = {
+    "p": "Project main points are the key features/bullet points of the project.",
+    "s": "Skill codes: L = Programming Languages, W = Web Technologies, D = Databases, F = Frameworks & Libraries, T = Tools & Platforms. Omit empty skill codes.",
+}
+
+
+def compact_fields(keys) -> str:
+    return ",".join(FIELD_EXAMPLES[key] for key in keys)
+
+
+def compact_field_notes(keys) -> str:
+    lines = [", ".join(FIELD_LEGEND[key] for key in keys) + "."]
+    lines += [FIELD_NOTES[key] for key in keys if key in FIELD_NOTES]
+    lines.append('Use "" or [] for anything missing. Return ONLY minified JSON, no other text.')
+    return "\n".join(lines)
+
+
+def compact_prompt(keys) -> str:
+    """Analysis prompt asking only for the given compact fields"""
+    return f"""You are an expert resume analyzer. Extract the resume into this compact JSON:
+{{{compact_fields(keys)}}}
+
+{compact_field_notes(keys)}"""
+
+
+COMPACT_FIELDS = compact_fields(FIELD_EXAMPLES)
+COMPACT_FIELD_NOTES = compact_field_notes(FIELD_EXAMPLES)
+
+COMPACT_ANALYSIS_PROMPT = compact_prompt(FIELD_EXAMPLES)
+
+# Validation verdict and analysis in one completion, for borderline documents.
+# The verdict comes first so a non-resume costs only a handful of tokens.
+COMBINED_ANALYSIS_PROMPT = f"""You are a document validator and resume analyzer. First decide whether the text is from a RESUME/CV: contact information, work experience, education, skills, projects, certifications. Invoices, reports, research papers, contracts, letters, manuals, forms, articles, stories and menus are NOT resumes.
+
+If it is NOT a resume, return only:
+{{"r":false,"cf":90,"why":"brief reason"}}
+
+If it IS a resume, return the verdict followed by the compact analysis:
+{{"r":true,"cf":90,"why":"brief reason",{COMPACT_FIELDS}}}
+
+r = is a resume, cf = confidence 0-100, why = brief explanation.
+{COMPACT_FIELD_NOTES}"""
+
+SKILL_CATEGORIES = {
+    "L": "Programming Languages",
+    "W": "Web Technologies",
+    "D": "Databases",
+    "F": "Frameworks & Libraries",
+    "T": "Tools & Platforms",
+}
+
+FIELD_NAMES = {
+    "i": "personal_info",
+    "y": "experience",
+    "e": "education",
+    "p": "projects",
+    "s": "skills",
+    "c": "certifications",
+    "a": "achievements",
+    "st": "analysis_summary",
+}
+
+PERSONAL_INFO_FIELDS = ("name", "email", "phone")
+EDUCATION_FIELDS = ("degree", "institution", "year")
+PROJECT_FIELDS = ("name", "description", "technologies", "main_points")
+CERTIFICATION_FIELDS = ("name", "year")
+LIST_FIELDS = {"technologies", "main_points"}
+
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    match = NUMBER_PATTERN.search(str(value or ""))
+    if not match:
+        return 0
+    number = float(match.group(0))
+    return int(number) if number.is_integer() else number
+
+
+def _row(value, fields: tuple) -> dict:
+    """Positional row (or a stray object/string) to a dict with every field"""
+    if isinstance(value, dict):
+        values = [value.get(field) for field in fields]
+    elif isinstance(value, list):
+        values = list(value[: len(fields)])
+    else:
+        values = [value]
+    values += [None] * (len(fields) - len(values))
+
+    row = {}
+    for field, item in zip(fields, values):
+        if field in LIST_FIELDS:
+            row[field] = item if isinstance(item, list) else ([item] if item else [])
+        else:
+            row[field] = "" if item is None else str(item)
+    return row
+
+
+def _rows(value, fields: tuple) -> list:
+    return [_row(item, fields) for item in value] if isinstance(value, list) else []
+
+
+def _skills(value) -> dict:
+    skills = {}
+    if not isinstance(value, dict):
+        return skills
+    for code, items in value.items():
+        category = SKILL_CATEGORIES.get(code, code)
+        if isinstance(items, list) and items:
+            skills.setdefault(category, []).extend(str(item) for item in items)
+    return skills
+
+
+def expand_analysis(compact: dict) -> dict:
+    """Expand the compact wire format into the ResumeAnalysis shape
+
+    Responses already in the verbose shape are returned unchanged.
+    """
+    if not any(key in compact for key in FIELD_NAMES):
+        return compact
+
+    strengths = compact.get("st")
+    achievements = compact.get("a")
+    return {
+        "education": _rows(compact.get("e"), EDUCATION_FIELDS),
+        "projects": _rows(compact.get("p"), PROJECT_FIELDS),
+        "experience": {"years": _number(compact.get("y"))},
+        "skills": _skills(compact.get("s")),
+        "certifications": _rows(compact.get("c"), CERTIFICATION_FIELDS),
+        "achievements": [str(item) for item in achievements]
+        if isinstance(achievements, list)
+        else [],
+        "personal_info": _row(compact.get("i"), PERSONAL_INFO_FIELDS),
+        "analysis_summary": {
+            "overall_strengths": [str(item) for item in strengths]
+            if isinstance(strengths, list)
+            else []
+        },
+    }
+
+
+def split_verdict(combined: dict) -> tuple:
+    """(validation verdict, compact analysis or None) from a combined response"""
+    verdict = {
+        "is_resume": combined.get("r", combined.get("is_resume")) is True,
+        "confidence": _number(combined.get("cf", combined.get("confidence"))),
+        "reason": str(combined.get("why", combined.get("reason", ""))),
+    }
+    analysis = {key: combined[key] for key in FIELD_NAMES if key in combined}
+    if not verdict["is_resume"] or not analysis:
+        return verdict, None
+    return verdict, analysis
+
+
+def merge_compact(parts: list) -> dict:
+    """Merge compact analyses of separate sections (or chunks of one)"""
+    merged = {}
+    seen = {}
+    for part in parts:
+        for key, value in part.items():
+            if key == "i" and isinstance(value, list):
+                current = merged.setdefault("i", [])
+                current += [""] * (len(value) - len(current))
+                for index, item in enumerate(value):
+                    if item and not current[index]:
+                        current[index] = item
+            elif key == "y":
+                merged["y"] = max(_number(merged.get("y")), _number(value))
+            elif key == "s" and isinstance(value, dict):
+                skills = merged.setdefault("s", {})
+                for code, items in value.items():
+                    if not isinstance(items, list):
+                        continue
+                    known = skills.setdefault(code, [])
+                    lowered = {str(item).lower() for item in known}
+                    for item in items:
+                        if str(item).lower() not in lowered:
+                            known.append(item)
+                            lowered.add(str(item).lower())
+            elif isinstance(value, list):
+                # Overlapping chunks can report the same row twice
+                rows = merged.setdefault(key, [])
+                keys = seen.setdefault(key, set())
+                for item in value:
+                    identity = json.dumps(item, sort_keys=True).lower()
+                    if identity not in keys:
+                        keys.add(identity)
+                        rows.append(item)
+            else:
+                merged.setdefault(key, value)
+    return merged
+
+
+def expand_field(key: str, value) -> tuple:
+    """(name, value) in the ResumeAnalysis shape for one streamed compact field"""
+    name = FIELD_NAMES.get(key)
+    if name is None:
+        return key, value
+    return name, expand_analysis({key: value})[name]
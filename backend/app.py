@@ -1,14 +1,57 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
 import re
+import sys
 import json
 import io
+import threading
+import time
 import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed, wait
+from contextlib import nullcontext
 from datetime import datetime
-import pdfplumber
-from docx import Document
-import requests
+from functools import partial
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.serving import is_running_from_reloader
+from analysis_cache import AnalysisCache, content_key
+from batch_upload import BatchMemberTooLarge, is_zip_upload, read_member, zip_members
+from analysis_schema import (
+    COMBINED_ANALYSIS_PROMPT,
+    COMPACT_ANALYSIS_PROMPT,
+    compact_prompt,
+    expand_analysis,
+    expand_field,
+    merge_compact,
+    split_verdict,
+)
+from docx_extraction import iter_docx_text
+from circuit_breaker import CircuitBreaker
+from deadline import Deadline, DeadlineExceeded, socket_disconnect_probe
+from groq_client import GroqClient
+from job_queue import JobStore, JobWorkers
+from keyword_matcher import KeywordAutomaton
+from model_router import ModelRouter
+from upload_stream import UploadRequest, upload_size, upload_source, upload_view
+from pdf_extraction import PDFExtractionService, PDFExtractionTimeout
+from response_decoder import decode_json_object
+from prompt_compressor import PAGE_BREAK, compress_resume, estimate_tokens, normalize_text
+from resume_sections import plan_fanout
+from pdf_inspector import PDFCostGuard, PDFRejectedError, ScannedPDFError, check_text_layer
+from single_flight import SingleFlight
+from skill_ontology import SkillOntology
+from streaming_json import IncrementalObjectParser
+from document_features import (
+    DocumentFeatures,
+    HAS_BULLETS,
+    HAS_CONTACT,
+    HAS_DATES,
+    HAS_EDUCATION,
+    HAS_EXPERIENCE,
+    HAS_SKILLS,
+    STRUCTURED_LINES,
+)
 
 app = Flask(__name__)
 
@@ -18,9 +61,189 @@ CORS(app)
 # Configuration
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+# Uploads are streamed straight into (named) spool files; Werkzeug rejects
+# bodies over the limit while parsing instead of after buffering them
+app.request_class = UploadRequest
+app.config["MAX_CONTENT_LENGTH"] = MAX_FILE_SIZE + 64 * 1024  # multipart overhead
+
 # Groq API Configuration
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_API_URL = os.getenv(
+    "GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions"
+)
+
+# Simple resumes and validation-only checks go to the fast model, complex
+# documents to the large one (which is downgraded while rate-limited)
+GROQ_FAST_MODEL = os.getenv("GROQ_FAST_MODEL", "llama-3.1-8b-instant")
+GROQ_LARGE_MODEL = os.getenv("GROQ_LARGE_MODEL", "llama-3.3-70b-versatile")
+MODEL_ROUTING = os.getenv("MODEL_ROUTING", "true").lower() == "true"
+model_router = ModelRouter(GROQ_FAST_MODEL, GROQ_LARGE_MODEL)
+
+# End-to-end request deadline. Clients can ask for a shorter (or, up to the
+# max, longer) budget with the X-Request-Timeout header (seconds). The
+# default stays below the Next.js route's 60s abort.
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", 55))
+REQUEST_DEADLINE_MAX = float(os.getenv("REQUEST_DEADLINE_MAX", 120))
+
+# Keep-alive connections to Groq; size the pool to the worker's thread count
+GROQ_POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", 10))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", 3))
+
+# Per-call Groq timeouts (seconds), bounded by the request deadline
+VALIDATION_TIMEOUT = 15
+ANALYSIS_TIMEOUT = 30
+
+# Validate and analyze borderline documents in a single Groq completion
+# instead of two sequential calls
+COMBINED_BORDERLINE_CALL = os.getenv("COMBINED_BORDERLINE_CALL", "true").lower() == "true"
+
+# Long resumes are split by section and analyzed by concurrent, smaller
+# Groq requests instead of one truncated monolithic completion. At most
+# FANOUT_MAX_REQUESTS chunks of FANOUT_CHUNK_CHARS are sent (24000 characters
+# by default): beyond that, each section group keeps its first chunk and
+# later chunks are dropped
+ANALYSIS_FANOUT = os.getenv("ANALYSIS_FANOUT", "true").lower() == "true"
+FANOUT_MIN_CHARS = int(os.getenv("FANOUT_MIN_CHARS", 5000))
+FANOUT_CHUNK_CHARS = int(os.getenv("FANOUT_CHUNK_CHARS", 4000))
+FANOUT_MAX_REQUESTS = int(os.getenv("FANOUT_MAX_REQUESTS", 6))
+FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", 8))
+FANOUT_MAX_TOKENS = int(os.getenv("FANOUT_MAX_TOKENS", 1000))
+
+# Prompt budgets (estimated tokens) for the resume text sent to Groq. The
+# text is normalized and filled section by section, most useful first.
+ANALYSIS_PROMPT_TOKENS = int(os.getenv("ANALYSIS_PROMPT_TOKENS", 1500))
+VALIDATION_PROMPT_TOKENS = int(os.getenv("VALIDATION_PROMPT_TOKENS", 600))
+
+# While Groq is failing or slow, skip it and use the local fallbacks
+groq_breaker = CircuitBreaker(
+    "groq",
+    error_rate_threshold=float(os.getenv("GROQ_BREAKER_ERROR_RATE", 0.5)),
+    slow_call_seconds=float(os.getenv("GROQ_BREAKER_SLOW_SECONDS", 20)),
+    open_seconds=float(os.getenv("GROQ_BREAKER_OPEN_SECONDS", 30)),
+)
+groq_client = GroqClient(
+    GROQ_API_KEY,
+    GROQ_API_URL,
+    pool_size=GROQ_POOL_SIZE,
+    max_retries=GROQ_MAX_RETRIES,
+    breaker=groq_breaker,
+    on_rate_limit=model_router.record_rate_limit,
+)
+
+
+def groq_post(route: str, data: dict, timeout: float, deadline: Deadline = None):
+    """POST a completion on its routed model, recording the route's outcome"""
+    start = time.monotonic()
+    try:
+        response = groq_client.post(
+            data,
+            timeout=timeout,
+            deadline=deadline,
+            fallback_model=model_router.fallback_model(data["model"]),
+        )
+    except Exception:
+        model_router.record(route, time.monotonic() - start, fallback=True)
+        raise
+    model_router.record(route, time.monotonic() - start, fallback=response.status_code != 200)
+    return response
+
+
+def run_groq_steps(steps, deadline: Deadline = None):
+    """Run a pipeline written as Groq call steps, calling Groq synchronously
+
+    The *_steps generators hold the pipeline's logic without its Groq I/O, so
+    asgi_app awaits the very same steps. A step is one call, (route, payload,
+    timeout), answered with its response (its exception is thrown in), or a
+    list of calls to make concurrently, answered with a list of responses or
+    exceptions. The generator's return value is the result.
+    """
+    outcome = error = None
+    while True:
+        try:
+            step = steps.send(outcome) if error is None else steps.throw(error)
+        except StopIteration as done:
+            return done.value
+        outcome = error = None
+        try:
+            if isinstance(step, list):
+                outcome = run_groq_calls(step, deadline)
+            else:
+                outcome = groq_post(*step, deadline=deadline)
+        except Exception as e:
+            error = e
+
+
+def run_groq_calls(calls: list, deadline: Deadline = None) -> list:
+    """Responses (or exceptions) of concurrent Groq calls, in order
+
+    Calls still running when the deadline runs out are abandoned and get
+    DeadlineExceeded.
+    """
+    futures = [fanout_executor.submit(groq_post, *call, deadline=deadline) for call in calls]
+    wait(futures, timeout=deadline.remaining() if deadline is not None else None)
+    outcomes = []
+    for future in futures:
+        if future.done():
+            outcomes.append(future.exception() or future.result())
+        else:
+            future.cancel()
+            outcomes.append(
+                DeadlineExceeded(
+                    f"Request deadline of {deadline.seconds:g}s exceeded during Groq analysis"
+                )
+            )
+    return outcomes
+
+# Analysis cache configuration. Bump ANALYSIS_PIPELINE_VERSION whenever the
+# prompts, model routing, validation or extraction change so stale results are not served.
+ANALYSIS_PIPELINE_VERSION = "6"
+ANALYSIS_CACHE_PATH = os.getenv(
+    "ANALYSIS_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis_cache.sqlite3"),
+)
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", 24 * 3600))
+
+# Background analysis jobs (POST /jobs, GET /jobs/<id>). JOB_WORKERS jobs run
+# at once per process; job state is kept in SQLite so queued work survives
+# restarts. GET /jobs/<id>?wait=N long-polls for up to JOB_WAIT_MAX seconds.
+JOB_STORE_PATH = os.getenv(
+    "JOB_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.sqlite3"),
+)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+JOB_DEADLINE_SECONDS = float(os.getenv("JOB_DEADLINE_SECONDS", 120))
+JOB_WAIT_MAX = float(os.getenv("JOB_WAIT_MAX", 30))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", 24 * 3600))
+
+# Batch endpoint (POST /batch): many files or one ZIP, with one NDJSON line
+# streamed back per file. BATCH_WORKERS files are extracted at once; at most
+# BATCH_GROQ_CONCURRENCY of them (per process) are in the Groq stage.
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", 500))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", 200 * 1024 * 1024))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", 8))
+BATCH_GROQ_CONCURRENCY = int(os.getenv("BATCH_GROQ_CONCURRENCY", 4))
+
+# PDF extraction process pool
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", 0)) or None
+PDF_PAGES_PER_JOB = int(os.getenv("PDF_PAGES_PER_JOB", 2))
+PDF_JOBS_AHEAD = int(os.getenv("PDF_JOBS_AHEAD", 2))
+PDF_EXTRACTION_TIMEOUT = float(os.getenv("PDF_EXTRACTION_TIMEOUT", 20))
+
+# PDFs whose pre-parse cost estimate exceeds PDF_HEAVY_SECONDS go to a
+# single-worker heavy lane with a tighter timeout; above PDF_REJECT_SECONDS
+# (or with compression-bomb signs) they are rejected before parsing
+PDF_HEAVY_SECONDS = float(os.getenv("PDF_HEAVY_SECONDS", 5))
+PDF_REJECT_SECONDS = float(os.getenv("PDF_REJECT_SECONDS", 60))
+PDF_HEAVY_TIMEOUT = float(os.getenv("PDF_HEAVY_TIMEOUT", 10))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 100))
+
+# Characters of PDF text the pipeline needs: validation and the Groq prompts
+# only look at the start of the document, so later pages are not parsed
+# (0 disables the budget). With fan-out on, it is raised to what the section
+# requests can cover
+PDF_TEXT_BUDGET = int(os.getenv("PDF_TEXT_BUDGET", 12000))
+if ANALYSIS_FANOUT and PDF_TEXT_BUDGET:
+    PDF_TEXT_BUDGET = max(PDF_TEXT_BUDGET, FANOUT_MAX_REQUESTS * FANOUT_CHUNK_CHARS)
 
 
 def allowed_file(filename):
@@ -107,6 +330,41 @@ class ResumeAnalyzer:
             ],
         }
 
+        # Alternative spellings reported under the canonical skill name
+        self.skill_aliases = {
+            "nodejs": ["node.js", "node"],
+            "nextjs": ["next.js"],
+            "vue": ["vue.js", "vuejs"],
+            "express": ["express.js", "expressjs"],
+            "c++": ["cpp"],
+            "c#": ["csharp"],
+            "go": ["golang"],
+            "postgresql": ["postgres"],
+            "kubernetes": ["k8s"],
+            "scikit-learn": ["sklearn"],
+        }
+        self.skill_ontology = SkillOntology(self.skill_categories, self.skill_aliases)
+
+        # pdfplumber is CPU-bound and holds the GIL, so PDFs are parsed in
+        # worker processes (started on first use)
+        self.pdf_extractor = PDFExtractionService(
+            max_workers=PDF_EXTRACTION_WORKERS,
+            pages_per_job=PDF_PAGES_PER_JOB,
+            jobs_ahead=PDF_JOBS_AHEAD,
+            timeout=PDF_EXTRACTION_TIMEOUT,
+        )
+        self.pdf_heavy_extractor = PDFExtractionService(
+            max_workers=1,
+            pages_per_job=PDF_PAGES_PER_JOB,
+            jobs_ahead=1,
+            timeout=PDF_HEAVY_TIMEOUT,
+        )
+        self.pdf_cost_guard = PDFCostGuard(
+            heavy_seconds=PDF_HEAVY_SECONDS,
+            reject_seconds=PDF_REJECT_SECONDS,
+            max_pages=PDF_MAX_PAGES,
+        )
+
         # STRONG Resume validation - very specific resume keywords
         self.resume_keywords = [
             "resume",
@@ -239,15 +497,52 @@ class ResumeAnalyzer:
             "meeting notes",
         ]
 
+        # Section indicators used by the strict validation checks
+        self.experience_keywords = [
+            "experience",
+            "work history",
+            "employment",
+            "work experience",
+            "professional experience",
+        ]
+        self.education_keywords = [
+            "education",
+            "academic",
+            "qualifications",
+            "degree",
+            "university",
+            "college",
+        ]
+        self.skills_section_keywords = [
+            "skills",
+            "technical skills",
+            "expertise",
+            "competencies",
+            "proficiencies",
+        ]
+
+        # Compile every keyword list into one automaton so validation scans
+        # the document once instead of once per keyword
+        self.keyword_matcher = KeywordAutomaton(
+            {
+                "resume": self.resume_keywords,
+                "non_resume": self.non_resume_keywords,
+                "experience": self.experience_keywords,
+                "education": self.education_keywords,
+                "skills": self.skills_section_keywords,
+            }
+        )
+        self.document_features = DocumentFeatures(self.keyword_matcher)
+
         # Minimum thresholds
         self.MIN_LENGTH = 300  # Minimum characters for a resume
         self.MIN_KEYWORDS = 5  # Minimum resume keywords required
         self.MAX_NON_RESUME_KEYWORDS = 2  # Maximum non-resume keywords allowed
 
-    def validate_resume_with_ai(self, text: str) -> dict:
-        """Use AI to validate if text is from a resume"""
-        try:
-            system_prompt = """You are a document validator. Your ONLY job is to determine if the provided text is from a RESUME/CV or not.
+    def validation_request(self, text: str) -> tuple:
+        """(route, payload) for the AI resume check"""
+        prompt_text = compress_resume(text, VALIDATION_PROMPT_TOKENS, "validate")
+        system_prompt = """You are a document validator. Your ONLY job is to determine if the provided text is from a RESUME/CV or not.
 
 A RESUME/CV typically contains:
 1. Personal/contact information (name, email, phone)
@@ -278,50 +573,157 @@ Return ONLY this JSON format:
     "issues": ["list", "of", "issues", "if", "any"]
 }"""
 
-            headers = {
-                "Authorization": f"Bearer {GROQ_API_KEY}",
-                "Content-Type": "application/json",
-            }
+        route, model = model_router.route("validate", complex_document=not MODEL_ROUTING)
+        return route, {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {
+                    "role": "user",
+                    "content": f"Is this text from a RESUME/CV? Answer with JSON only.\n\nText:\n{prompt_text}",
+                },
+            ],
+            "temperature": 0.1,
+            "max_tokens": 500,
+            "response_format": {"type": "json_object"},
+        }
 
-            data = {
-                "model": "llama-3.3-70b-versatile",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {
-                        "role": "user",
-                        "content": f"Is this text from a RESUME/CV? Answer with JSON only.\n\nText:\n{text[:2000]}",
-                    },
-                ],
-                "temperature": 0.1,
-                "max_tokens": 500,
-                "response_format": {"type": "json_object"},
-            }
+    def validation_response(self, response) -> dict:
+        """Verdict from the AI resume check's response"""
+        if response.status_code != 200:
+            print(f"❌ AI validation API error: {response.status_code}")
+            return {"is_resume": False, "reason": "AI validation failed"}
 
-            response = requests.post(
-                GROQ_API_URL, headers=headers, json=data, timeout=15
-            )
+        result = response.json()
+        content = result["choices"][0]["message"]["content"]
+
+        # Extract JSON
+        try:
+            return decode_json_object(content)
+        except ValueError:
+            return {"is_resume": False, "reason": "Invalid AI response"}
 
-            if response.status_code != 200:
-                print(f"❌ AI validation API error: {response.status_code}")
-                return {"is_resume": False, "reason": "AI validation failed"}
+    def validate_resume_with_ai(self, text: str, deadline: Deadline = None) -> dict:
+        """Use AI to validate if text is from a resume"""
+        return run_groq_steps(self.validation_steps(text), deadline)
 
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
+    def validation_steps(self, text: str):
+        """validate_resume_with_ai as Groq call steps (see run_groq_steps)"""
+        try:
+            route, data = self.validation_request(text)
+            response = yield route, data, VALIDATION_TIMEOUT
+            return self.validation_response(response)
 
-            # Extract JSON
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                validation_result = json.loads(json_match.group(0))
-                return validation_result
-            else:
-                return {"is_resume": False, "reason": "Invalid AI response"}
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"❌ AI validation error: {str(e)}")
+            return {"is_resume": False, "reason": f"AI validation error: {str(e)}"}
 
+    def combined_request(self, text: str) -> tuple:
+        """(route, payload) for validating and analyzing in one completion"""
+        prompt_text = compress_resume(text, ANALYSIS_PROMPT_TOKENS, "analyze")
+        # Borderline documents are the hard cases: keep the large model
+        route, model = model_router.route("combined")
+        return route, {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": COMBINED_ANALYSIS_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Is this text from a RESUME/CV? If it is, analyze it.\n\nText:\n{prompt_text}",
+                },
+            ],
+            "temperature": 0.1,
+            "max_tokens": 2000,
+            "response_format": {"type": "json_object"},
+        }
+
+    def combined_response(self, response, text: str) -> dict:
+        """Verdict (and analysis, for resumes) from a combined completion"""
+        if response.status_code != 200:
+            print(f"❌ AI validation API error: {response.status_code}")
+            return {"is_resume": False, "reason": "AI validation failed"}
+
+        content = response.json()["choices"][0]["message"]["content"]
+        try:
+            verdict, compact = split_verdict(decode_json_object(content))
+        except ValueError:
+            return {"is_resume": False, "reason": "Invalid AI response"}
+
+        verdict["method"] = "ai_combined"
+        if compact is not None:
+            analysis = self.validate_and_clean_analysis(expand_analysis(compact))
+            verdict["analysis"] = self.fill_personal_info(analysis, text)
+        return verdict
+
+    def combined_validation_steps(self, text: str):
+        """Validate a borderline document and analyze it in one AI call
+
+        Returns the validation verdict; when the document is a resume it also
+        carries the finished analysis under "analysis".
+        """
+        try:
+            route, data = self.combined_request(text)
+            response = yield route, data, ANALYSIS_TIMEOUT
+            return self.combined_response(response, text)
+
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"❌ AI validation error: {str(e)}")
             return {"is_resume": False, "reason": f"AI validation error: {str(e)}"}
 
-    def is_valid_resume(self, text: str) -> dict:
-        """Check if the extracted text is a valid resume using MULTIPLE methods"""
+    def is_valid_resume(
+        self,
+        text: str,
+        deadline: Deadline = None,
+        with_analysis: bool = False,
+        verdict: dict = None,
+    ) -> dict:
+        """Check if the extracted text is a valid resume using MULTIPLE methods
+
+        With with_analysis, borderline documents are validated and analyzed in
+        one AI call and the analysis is returned under "analysis". verdict is
+        the text's local_validation result, when it was already computed.
+        """
+        return run_groq_steps(
+            self.is_valid_resume_steps(text, with_analysis, verdict), deadline
+        )
+
+    def is_valid_resume_steps(
+        self, text: str, with_analysis: bool = False, verdict: dict = None
+    ):
+        """is_valid_resume as Groq call steps (see run_groq_steps)"""
+        if verdict is None:
+            verdict = self.local_validation(text)
+        if verdict["method"] != "borderline":
+            return verdict
+
+        local_decision = verdict["local_decision"]
+        if not groq_client.available():
+            # Groq circuit is open - decide locally instead of waiting
+            print("⚠️ Borderline case, Groq unavailable, using local decision...")
+            return local_decision
+
+        # Borderline case - use AI validation
+        print("⚠️ Borderline case, using AI validation...")
+        try:
+            if with_analysis and COMBINED_BORDERLINE_CALL:
+                return (yield from self.combined_validation_steps(text))
+            return (yield from self.validation_steps(text))
+        except DeadlineExceeded as e:
+            if e.disconnected:
+                raise
+            print(f"⏱️ {e}, using local decision...")
+            return local_decision
+
+    def local_validation(self, text: str) -> dict:
+        """Keyword and structure checks of is_valid_resume, without AI
+
+        Borderline documents (score 40-60) come back with method "borderline"
+        and the decision to fall back on under "local_decision".
+        """
         print("🔍 STRICT Resume validation started...")
 
         try:
@@ -334,125 +736,34 @@ Return ONLY this JSON format:
                     "method": "length_check",
                 }
 
-            text_lower = text.lower()
+            # Single pass over the text for every keyword list
+            keyword_hits = self.keyword_matcher.scan(text)
 
             # Check 2: Count resume-specific keywords
-            resume_keyword_count = 0
-            found_resume_keywords = []
-            for keyword in self.resume_keywords:
-                if keyword in text_lower:
-                    resume_keyword_count += 1
-                    found_resume_keywords.append(keyword)
+            found_resume_keywords = self.keyword_matcher.found(keyword_hits, "resume")
+            resume_keyword_count = len(found_resume_keywords)
 
             # Check 3: Count NON-resume keywords (negative indicators)
-            non_resume_keyword_count = 0
-            found_non_resume_keywords = []
-            for keyword in self.non_resume_keywords:
-                if keyword in text_lower:
-                    non_resume_keyword_count += 1
-                    found_non_resume_keywords.append(keyword)
-
-            # Check 4: Look for specific resume sections
-            has_contact = bool(
-                re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", text)
-            ) or bool(
-                re.search(
-                    r"(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text
-                )
-            )
-
-            has_experience = any(
-                word in text_lower
-                for word in [
-                    "experience",
-                    "work history",
-                    "employment",
-                    "work experience",
-                    "professional experience",
-                ]
-            )
-            has_education = any(
-                word in text_lower
-                for word in [
-                    "education",
-                    "academic",
-                    "qualifications",
-                    "degree",
-                    "university",
-                    "college",
-                ]
-            )
-            has_skills = any(
-                word in text_lower
-                for word in [
-                    "skills",
-                    "technical skills",
-                    "expertise",
-                    "competencies",
-                    "proficiencies",
-                ]
-            )
-
-            # Check 5: Look for structured formatting (resumes often have sections with colons or bold text)
-            lines = text.split("\n")
-            structured_lines = 0
-            for line in lines:
-                if re.search(r"^[A-Z][a-zA-Z\s]+:", line) or re.search(
-                    r"^[A-Z][a-zA-Z\s]+\s+[A-Z]", line
-                ):
-                    structured_lines += 1
-
-            # Check 6: Look for dates in experience/education (resumes have dates)
-            date_patterns = [
-                r"\b(19|20)\d{2}\b",  # Years like 2020, 2019
-                r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\b",  # Month Year
-                r"\b\d{1,2}/\d{4}\b",  # MM/YYYY
-                r"\b\d{4}\s*[-–]\s*(Present|Current|\d{4})\b",  # Date ranges
-            ]
-
-            has_dates = any(
-                re.search(pattern, text, re.IGNORECASE) for pattern in date_patterns
-            )
-
-            # Check 7: Look for bullet points (resumes use bullet points)
-            has_bullets = (
-                text.count("•") > 2 or text.count("- ") > 2 or text.count("* ") > 2
+            found_non_resume_keywords = self.keyword_matcher.found(
+                keyword_hits, "non_resume"
             )
-
-            # SCORING SYSTEM (0-100)
-            score = 0
-
-            # Length score (max 10)
-            length_score = min(len(text) / 500, 10)
-            score += length_score
-
-            # Resume keywords score (max 30)
-            keyword_score = min(resume_keyword_count * 3, 30)
-            score += keyword_score
-
-            # Section score (max 30)
-            section_score = 0
-            if has_contact:
-                section_score += 5
-            if has_experience:
-                section_score += 10
-            if has_education:
-                section_score += 10
-            if has_skills:
-                section_score += 5
-            score += section_score
-
-            # Structure score (max 20)
-            structure_score = min(structured_lines * 2, 10)
-            if has_dates:
-                structure_score += 5
-            if has_bullets:
-                structure_score += 5
-            score += min(structure_score, 20)
-
-            # Penalty for non-resume keywords (max -20)
-            penalty = min(non_resume_keyword_count * 5, 20)
-            score = max(0, score - penalty)
+            non_resume_keyword_count = len(found_non_resume_keywords)
+
+            # Checks 4-7: section, structure, date and bullet signals in one
+            # feature vector (see document_features.FEATURE_NAMES)
+            features = self.document_features.extract(text, keyword_hits)
+            has_contact = bool(features[HAS_CONTACT])
+            has_experience = bool(features[HAS_EXPERIENCE])
+            has_education = bool(features[HAS_EDUCATION])
+            has_skills = bool(features[HAS_SKILLS])
+            has_dates = bool(features[HAS_DATES])
+            has_bullets = bool(features[HAS_BULLETS])
+            structured_lines = int(features[STRUCTURED_LINES])
+
+            # SCORING SYSTEM (0-100): capped per-feature weights, i.e. length
+            # (max 10), keywords (max 30), sections (max 30), structure
+            # (max 20) and a non-resume keyword penalty (max -20)
+            score = self.document_features.score(features)
 
             print(f"📊 STRICT VALIDATION RESULTS:")
             print(f"   Total length: {len(text)} chars")
@@ -508,10 +819,14 @@ Return ONLY this JSON format:
                     },
                 }
             elif score < 60:
-                # Borderline case - use AI validation
-                print("⚠️ Borderline case, using AI validation...")
-                ai_result = self.validate_resume_with_ai(text[:3000])
-                return ai_result
+                return {
+                    "is_resume": False,
+                    "score": score,
+                    "method": "borderline",
+                    "local_decision": self.local_borderline_decision(
+                        score, non_resume_keyword_count, has_experience, has_education
+                    ),
+                }
             else:
                 return {
                     "is_resume": True,
@@ -529,28 +844,89 @@ Return ONLY this JSON format:
                 "method": "error",
             }
 
-    def extract_text_from_pdf(self, file_content: bytes) -> str:
-        """Extract text from PDF using pdfplumber"""
+    def local_borderline_decision(
+        self, score, non_resume_keyword_count, has_experience, has_education
+    ) -> dict:
+        """Decide a borderline (40-60) document without AI validation"""
+        is_resume = (
+            score >= 50
+            and non_resume_keyword_count <= self.MAX_NON_RESUME_KEYWORDS
+            and (has_experience or has_education)
+        )
+        if is_resume:
+            reason = f"✅ Likely resume (local decision, AI unavailable). Score: {score}/100"
+        else:
+            reason = f"❌ This doesn't appear to be a resume (local decision, AI unavailable). Score: {score}/100"
+        return {
+            "is_resume": is_resume,
+            "score": score,
+            "reason": reason,
+            "issues": [],
+            "method": "local_fallback",
+        }
+
+    def iter_text_from_pdf(
+        self, source, max_chars: int = PDF_TEXT_BUDGET, deadline: Deadline = None
+    ):
+        """Lazily yield PDF page texts until the character budget is reached"""
+        # Cheap structural scan first, so bloated or crafted PDFs never
+        # reach pdfplumber in the shared pool
+        assessment = self.pdf_cost_guard.assess(source)
+        if assessment["lane"] == "reject":
+            print(f"🚫 PDF rejected before parsing: {assessment['reason']}")
+            raise PDFRejectedError(
+                f"This PDF is too large or complex to process: {assessment['reason']}"
+            )
+
+        extractor = self.pdf_extractor
+        if assessment["lane"] == "heavy":
+            print(f"🐢 Heavy PDF lane: {assessment['reason']}")
+            extractor = self.pdf_heavy_extractor
+
+        timeout = extractor.timeout
+        if deadline is not None:
+            timeout = deadline.timeout(timeout, stage="PDF extraction")
+        # Scanned resumes have no text layer; the worker checks that first
+        # and fails fast instead of parsing every page only to find less than
+        # 50 characters
+        return extractor.iter_pages(
+            source,
+            max_chars=max_chars,
+            timeout=timeout,
+            check=partial(check_text_layer, stats=assessment),
+        )
+
+    def extract_text_from_pdf(self, source, deadline: Deadline = None) -> str:
+        """Extract text from PDF (bytes or file path) in the extraction process pool"""
         try:
-            text = ""
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+            page_texts = []
+            for page_text in self.iter_text_from_pdf(source, deadline=deadline):
+                if deadline is not None:
+                    deadline.check("PDF extraction")
+                if page_text:
+                    page_texts.append(page_text)
+            return PAGE_BREAK.join(page_texts).strip()
+        except ScannedPDFError as e:
+            print(f"🖼️ Scanned PDF rejected: {e}")
+            raise
+        except (PDFRejectedError, DeadlineExceeded):
+            raise
         except Exception as e:
+            # The timeout is capped by the request deadline: when that is
+            # what ran out, report it as such (504) rather than a failure
+            if isinstance(e, PDFExtractionTimeout) and deadline is not None:
+                deadline.check("PDF extraction")
             print(f"PDF extraction error: {str(e)}")
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
-    def extract_text_from_docx(self, file_content: bytes) -> str:
-        """Extract text from DOCX using python-docx"""
+    def extract_text_from_docx(self, source) -> str:
+        """Extract text from DOCX (bytes, path or file object)
+
+        Streams word/document.xml plus header and footer parts, so text in
+        tables, headers and text boxes is included.
+        """
         try:
-            doc = Document(io.BytesIO(file_content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return "\n".join(iter_docx_text(source)).strip()
         except Exception as e:
             print(f"DOCX extraction error: {str(e)}")
             raise Exception(f"Failed to extract text from DOCX: {str(e)}")
@@ -606,78 +982,112 @@ Return ONLY this JSON format:
 
         return info
 
-    def analyze_resume_with_groq(self, text: str):
-        """Analyze resume text using Groq API directly"""
-        if not GROQ_API_KEY:
-            raise Exception("Groq API key not configured")
+    def route_analysis(self, text: str) -> tuple:
+        """(route, model) for analyzing text, from its local complexity"""
+        if not MODEL_ROUTING:
+            return model_router.route("analyze")
+        score = self.document_features.score(self.document_features.extract(text))
+        return model_router.route("analyze", model_router.is_complex(text, score))
 
-        system_prompt = """You are an expert resume analyzer. Extract and structure information from the resume text into JSON format.
+    def analysis_request(self, text: str, model: str) -> dict:
+        """Groq chat completion payload for analyzing resume text"""
+        prompt_text = compress_resume(text, ANALYSIS_PROMPT_TOKENS, "analyze")
 
-Extract the following information in JSON format:
-{
-    "education": [{"degree": "...", "institution": "...", "year": "..."}],
-    "projects": [{"name": "...", "description": "...", "technologies": ["..."], "main_points": ["..."]}],
-    "experience": {"years": 0, "level": "Fresher/Junior/Mid-Level/Senior"},
-    "skills": {"Programming Languages": [], "Web Technologies": [], "Databases": [], "Frameworks & Libraries": [], "Tools & Platforms": []},
-    "certifications": [{"name": "...", "year": "..."}],
-    "achievements": ["..."],
-    "personal_info": {"name": "...", "email": "...", "phone": "..."},
-    "analysis_summary": {"total_projects": 0, "education_entries": 0, "skill_categories": 0, "certifications_count": 0, "achievements_count": 0, "candidate_type": "...", "overall_strengths": []}
-}
+        print(
+            f"🤖 Sending {len(prompt_text)} chars (~{estimate_tokens(prompt_text)} tokens) to Groq API..."
+        )
 
-IMPORTANT: For projects, include BOTH "description" (string) AND "main_points" (array of strings).
-"main_points" should be key features/bullet points extracted from the project description.
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": COMPACT_ANALYSIS_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Analyze this resume:\n\n{prompt_text}",
+                },
+            ],
+            "temperature": 0.1,
+            "max_tokens": 2000,
+        }
 
-Return ONLY the JSON, no other text."""
+    def analysis_response(self, response) -> dict:
+        """Cleaned analysis from a Groq analysis response"""
+        if response.status_code != 200:
+            print(f"❌ Groq API error: {response.status_code} - {response.text}")
+            raise Exception(f"API error: {response.status_code}")
 
-        try:
-            # Truncate if too long
-            truncated_text = text[:5000] if len(text) > 5000 else text
+        result = response.json()
+        content = result["choices"][0]["message"]["content"]
 
-            print(f"🤖 Sending {len(truncated_text)} chars to Groq API...")
+        # Extract JSON from response (repairing truncated or sloppy output)
+        try:
+            analysis_result, repaired = decode_json_object(content, with_status=True)
+        except ValueError:
+            print(f"⚠️ No JSON found in response: {content[:200]}")
+            raise Exception("Invalid response format from AI")
+        if repaired:
+            print("🩹 Repaired malformed JSON in the AI response")
+        return self.validate_and_clean_analysis(expand_analysis(analysis_result))
+
+    def analyze_resume_with_groq(self, text: str, deadline: Deadline = None):
+        """Analyze resume text using Groq API directly"""
+        return run_groq_steps(self.groq_analysis_steps(text), deadline)
 
-            headers = {
-                "Authorization": f"Bearer {GROQ_API_KEY}",
-                "Content-Type": "application/json",
-            }
+    def groq_analysis_steps(self, text: str):
+        """analyze_resume_with_groq as Groq call steps (see run_groq_steps)"""
+        if not GROQ_API_KEY:
+            raise Exception("Groq API key not configured")
 
-            data = {
-                "model": "llama-3.3-70b-versatile",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {
-                        "role": "user",
-                        "content": f"Analyze this resume:\n\n{truncated_text}",
-                    },
-                ],
-                "temperature": 0.1,
-                "max_tokens": 2000,
-            }
+        try:
+            route, model = self.route_analysis(text)
+            data = self.analysis_request(text, model)
+            response = yield route, data, ANALYSIS_TIMEOUT
+            return self.analysis_response(response)
 
-            response = requests.post(
-                GROQ_API_URL, headers=headers, json=data, timeout=30
-            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"❌ Groq analysis error: {str(e)}")
+            raise Exception(f"AI analysis failed: {str(e)}")
 
-            if response.status_code != 200:
-                print(f"❌ Groq API error: {response.status_code} - {response.text}")
-                raise Exception(f"API error: {response.status_code}")
+    def stream_resume_with_groq(self, text: str, deadline: Deadline = None):
+        """Stream the Groq analysis, yielding ("field", name, value) as each field closes
 
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
+        The cleaned, complete analysis is the generator's return value.
+        """
+        if not GROQ_API_KEY:
+            raise Exception("Groq API key not configured")
 
-            # Extract JSON from response
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                analysis_result = json.loads(json_str)
-                return self.validate_and_clean_analysis(analysis_result)
-            else:
-                print(f"⚠️ No JSON found in response: {content[:200]}")
+        route, model = self.route_analysis(text)
+        start = time.monotonic()
+        failed = True
+        try:
+            parser = IncrementalObjectParser()
+            for content in groq_client.stream(
+                self.analysis_request(text, model),
+                timeout=ANALYSIS_TIMEOUT,
+                deadline=deadline,
+                fallback_model=model_router.fallback_model(model),
+            ):
+                if deadline is not None:
+                    deadline.check("Groq analysis")
+                for key, value in parser.feed(content):
+                    yield ("field", *expand_field(key, value))
+            for key, value in parser.finish():
+                yield ("field", *expand_field(key, value))
+
+            if not parser.members:
                 raise Exception("Invalid response format from AI")
+            failed = False
+            return self.validate_and_clean_analysis(expand_analysis(parser.members))
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
-            print(f"❌ Groq analysis error: {str(e)}")
+            print(f"❌ Groq streaming analysis error: {str(e)}")
             raise Exception(f"AI analysis failed: {str(e)}")
+        finally:
+            model_router.record(route, time.monotonic() - start, fallback=failed)
 
     def validate_and_clean_analysis(self, analysis):
         """Validate and clean the analysis result"""
@@ -729,42 +1139,207 @@ Return ONLY the JSON, no other text."""
 
         return validated
 
-    def analyze_resume_text(self, text: str):
+    def analyze_resume_text(self, text: str, deadline: Deadline = None):
         """Main function to analyze resume text"""
+        return run_groq_steps(self.analysis_steps(text), deadline)
+
+    def analysis_steps(self, text: str):
+        """analyze_resume_text as Groq call steps (see run_groq_steps)"""
         print(f"📄 Analyzing resume text ({len(text)} characters)...")
 
         try:
-            print("🤖 Using Groq API for analysis...")
-            result = self.analyze_resume_with_groq(text)
-
-            # Enhance with personal info from text
-            personal_info = self.extract_personal_info(text)
-            if not result["personal_info"]["name"] and personal_info["name"]:
-                result["personal_info"]["name"] = personal_info["name"]
-            if not result["personal_info"]["email"] and personal_info["email"]:
-                result["personal_info"]["email"] = personal_info["email"]
-            if not result["personal_info"]["phone"] and personal_info["phone"]:
-                result["personal_info"]["phone"] = personal_info["phone"]
+            plan = self.fanout_plan(text)
+            if plan:
+                print(f"🤖 Using {len(plan)} parallel Groq requests for analysis...")
+                result = yield from self.fanout_steps(plan)
+            else:
+                print("🤖 Using Groq API for analysis...")
+                result = yield from self.groq_analysis_steps(text)
+            return self.fill_personal_info(result, text)
+
+        except DeadlineExceeded as e:
+            if e.disconnected:
+                raise
+            print(f"⏱️ {e}, using fallback analysis")
+            return self.basic_resume_analysis(text)
+        except Exception as e:
+            print(f"⚠️ AI analysis failed, using fallback: {str(e)}")
+            return self.basic_resume_analysis(text)
 
-            return result
+    def iter_resume_analysis(self, text: str, deadline: Deadline = None):
+        """Streaming analyze_resume_text: yields ("field", name, value) as the
+        model finishes each field, then ("result", analysis, None)"""
+        print(f"📄 Streaming analysis of resume text ({len(text)} characters)...")
 
+        try:
+            plan = self.fanout_plan(text)
+            if plan:
+                print(f"🤖 Using {len(plan)} parallel Groq requests for analysis...")
+                result = yield from self.iter_resume_fanout(plan, deadline)
+            else:
+                print("🤖 Streaming Groq API analysis...")
+                result = yield from self.stream_resume_with_groq(text, deadline)
+            result = self.fill_personal_info(result, text)
+
+        except DeadlineExceeded as e:
+            if e.disconnected:
+                raise
+            print(f"⏱️ {e}, using fallback analysis")
+            result = self.basic_resume_analysis(text)
         except Exception as e:
             print(f"⚠️ AI analysis failed, using fallback: {str(e)}")
-            return self.basic_resume_analysis(text)
+            result = self.basic_resume_analysis(text)
+
+        yield "result", result, None
+
+    def fanout_plan(self, text: str) -> list:
+        """Section requests for a long resume, or [] to analyze it in one call"""
+        if not ANALYSIS_FANOUT:
+            return []
+        text = normalize_text(text)
+        if len(text) <= FANOUT_MIN_CHARS:
+            return []
+        return plan_fanout(text, FANOUT_CHUNK_CHARS, FANOUT_MAX_REQUESTS)
+
+    def section_request(self, keys: tuple, text: str) -> tuple:
+        """(route, payload) asking for only the given compact fields of a section"""
+        # Only long documents fan out, so sections keep the large model
+        route, model = model_router.route("section")
+        return route, {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": compact_prompt(keys)},
+                {"role": "user", "content": f"Analyze this part of a resume:\n\n{text}"},
+            ],
+            "temperature": 0.1,
+            "max_tokens": FANOUT_MAX_TOKENS,
+        }
+
+    def section_response(self, keys: tuple, response) -> dict:
+        """The requested compact fields from a section response"""
+        if response.status_code != 200:
+            raise Exception(f"API error: {response.status_code}")
+
+        content = response.json()["choices"][0]["message"]["content"]
+        section = decode_json_object(content)
+        return {key: section[key] for key in keys if key in section}
+
+    def section_call(self, keys: tuple, text: str) -> tuple:
+        """Groq call step (route, payload, timeout) for one fan-out section"""
+        return (*self.section_request(keys, text), ANALYSIS_TIMEOUT)
+
+    def add_section(self, parts: dict, group: str, keys: tuple, outcome):
+        """Add a section request's outcome (its response, or the exception it
+        raised) to {group: [compact section results]}"""
+        try:
+            if isinstance(outcome, BaseException):
+                raise outcome
+            parts[group].append(self.section_response(keys, outcome))
+        except DeadlineExceeded as e:
+            if e.disconnected:
+                raise
+            print(f"⏱️ Fan-out {group} request: {e}")
+        except Exception as e:
+            print(f"⚠️ Fan-out {group} request failed: {str(e)}")
+
+    def iter_resume_fanout(self, plan: list, deadline: Deadline = None):
+        """Run the section requests concurrently, yielding ("field", name, value)
+        as each group completes; the merged analysis is the return value"""
+        if not GROQ_API_KEY:
+            raise Exception("Groq API key not configured")
+
+        futures = {
+            fanout_executor.submit(
+                groq_post, *self.section_call(keys, text), deadline=deadline
+            ): (group, keys)
+            for group, keys, text in plan
+        }
+        pending = {}
+        for group, _ in futures.values():
+            pending[group] = pending.get(group, 0) + 1
+        parts = {group: [] for group in pending}
+        unfinished = set()
+
+        remaining = deadline.remaining() if deadline is not None else None
+        try:
+            for future in as_completed(futures, timeout=remaining):
+                group, keys = futures[future]
+                pending[group] -= 1
+                outcome = future.exception() or future.result()
+                if isinstance(outcome, DeadlineExceeded):
+                    unfinished.add(group)
+                self.add_section(parts, group, keys, outcome)
+
+                if pending[group] == 0 and parts[group]:
+                    for key, value in merge_compact(parts[group]).items():
+                        yield ("field", *expand_field(key, value))
+                if deadline is not None:
+                    deadline.check("Groq analysis")
+        # Out of time: keep the sections that already finished
+        except DeadlineExceeded as e:
+            if e.disconnected:
+                raise
+            print(f"⏱️ {e}, merging the finished sections")
+        except TimeoutError:
+            print("⏱️ Fan-out deadline reached, merging the finished sections")
+        finally:
+            for future in futures:
+                future.cancel()
+
+        unfinished.update(group for group, count in pending.items() if count)
+        return self.fanout_result(parts, unfinished)
+
+    def fanout_steps(self, plan: list):
+        """Non-streaming iter_resume_fanout as Groq call steps: all section
+        requests in one step, then the merged analysis"""
+        if not GROQ_API_KEY:
+            raise Exception("Groq API key not configured")
+
+        outcomes = yield [self.section_call(keys, text) for _, keys, text in plan]
+        parts = {group: [] for group, _, _ in plan}
+        unfinished = set()
+        for (group, keys, _), outcome in zip(plan, outcomes):
+            if isinstance(outcome, DeadlineExceeded):
+                unfinished.add(group)
+            self.add_section(parts, group, keys, outcome)
+        return self.fanout_result(parts, unfinished)
+
+    def fanout_result(self, parts: dict, unfinished=()) -> dict:
+        """Merged analysis from {group: [compact section results]}
+
+        Groups without results, or with requests that ran out of time, are
+        listed as incomplete sections.
+        """
+        merged = merge_compact([part for group in parts.values() for part in group])
+        if not merged:
+            raise Exception("All section requests failed")
+        result = self.validate_and_clean_analysis(expand_analysis(merged))
+        missing = [
+            group
+            for group, group_parts in parts.items()
+            if not group_parts or group in unfinished
+        ]
+        if missing:
+            result["analysis_summary"]["incomplete_sections"] = missing
+        return result
+
+    def fill_personal_info(self, result: dict, text: str) -> dict:
+        """Enhance the AI analysis with personal info found in the text"""
+        personal_info = self.extract_personal_info(text)
+        if not result["personal_info"]["name"] and personal_info["name"]:
+            result["personal_info"]["name"] = personal_info["name"]
+        if not result["personal_info"]["email"] and personal_info["email"]:
+            result["personal_info"]["email"] = personal_info["email"]
+        if not result["personal_info"]["phone"] and personal_info["phone"]:
+            result["personal_info"]["phone"] = personal_info["phone"]
+        return result
 
     def basic_resume_analysis(self, text: str):
         """Basic resume analysis as fallback"""
         personal_info = self.extract_personal_info(text)
 
-        # Simple skill extraction
-        skills_found = {}
-        for category, skill_list in self.skill_categories.items():
-            found = []
-            for skill in skill_list:
-                if re.search(r"\b" + re.escape(skill) + r"\b", text, re.IGNORECASE):
-                    found.append(skill.title())
-            if found:
-                skills_found[category] = found
+        # Simple skill extraction (single scan over the compiled taxonomy)
+        skills_found = self.skill_ontology.categorize(text)
 
         return {
             "education": [],
@@ -789,6 +1364,384 @@ Return ONLY the JSON, no other text."""
 # Initialize analyzer
 analyzer = ResumeAnalyzer()
 
+# Section requests of fan-out analyses, shared by all requests
+fanout_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS)
+
+# Files of batch uploads, and the Groq-stage slots they share
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS)
+batch_groq_slots = threading.BoundedSemaphore(BATCH_GROQ_CONCURRENCY)
+UploadRequest.endpoint_limits = {"analyze_batch": BATCH_MAX_BYTES + 64 * 1024}
+
+# Analyses in flight in this process, keyed like the cache, so concurrent
+# duplicates share one computation
+analysis_flights = SingleFlight()
+
+# Finished analyses keyed by content hash, shared by all workers on the host
+analysis_cache = AnalysisCache(ANALYSIS_CACHE_PATH, ttl=ANALYSIS_CACHE_TTL)
+
+
+# Queued analysis jobs, shared by all workers on the host
+job_store = JobStore(
+    JOB_STORE_PATH,
+    lease_seconds=JOB_DEADLINE_SECONDS + 60,
+    retention_seconds=JOB_RETENTION_SECONDS,
+)
+
+
+def upload_cache_key(filename: str, stream) -> str:
+    """Cache key for an uploaded file (the extension selects the extractor)"""
+    extension = filename.rsplit(".", 1)[-1].lower()
+    with upload_view(stream) as content:
+        return content_key(content, ANALYSIS_PIPELINE_VERSION, "file", extension)
+
+
+def extract_text_from_upload(file, deadline: Deadline = None) -> str:
+    """Run the extractor for an uploaded file straight from its spooled stream"""
+    return extract_text_from_stream(file.filename, file.stream, deadline)
+
+
+def extract_text_from_stream(filename: str, stream, deadline: Deadline = None) -> str:
+    """Run the extractor selected by the filename's extension on a stream"""
+    filename = filename.lower()
+    if filename.endswith(".pdf"):
+        text = analyzer.extract_text_from_pdf(upload_source(stream), deadline)
+    elif filename.endswith((".docx", ".doc")):
+        text = analyzer.extract_text_from_docx(stream)
+    elif filename.endswith(".txt"):
+        text = analyzer.extract_text_from_txt(stream.read())
+    else:
+        text = ""
+
+    if deadline is not None:
+        deadline.check("text extraction")
+    return text
+
+
+def request_deadline() -> Deadline:
+    """Deadline for the current request, honoring the X-Request-Timeout header"""
+    seconds = REQUEST_DEADLINE_SECONDS
+    header = request.headers.get("X-Request-Timeout")
+    if header:
+        try:
+            seconds = min(max(float(header), 1.0), REQUEST_DEADLINE_MAX)
+        except ValueError:
+            pass
+    return Deadline(seconds, socket_disconnect_probe(request.environ))
+
+
+def deadline_error_response(error: DeadlineExceeded):
+    """504 when the budget ran out, 499 when the client already went away"""
+    if error.disconnected:
+        print(f"🔌 {error}, abandoning request")
+        return jsonify({"error": str(error), "success": False}), 499
+    print(f"⏱️ {error}")
+    return jsonify({"error": str(error), "success": False}), 504
+
+
+def text_flight_key(text: str) -> str:
+    """Single-flight key for text submitted to /analyze"""
+    return content_key(normalize_text(text).encode("utf-8"), ANALYSIS_PIPELINE_VERSION, "text")
+
+
+def text_cache_key(text: str) -> str:
+    """Cache key for text submitted to /analyze"""
+    return content_key(text.encode("utf-8"), ANALYSIS_PIPELINE_VERSION, "text")
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def is_fallback_analysis(result: dict) -> bool:
+    """True when the result came from basic_resume_analysis or is missing
+    sections whose requests failed (not worth caching)"""
+    summary = result.get("analysis_summary", {})
+    return bool(summary.get("incomplete_sections")) or summary.get(
+        "overall_strengths"
+    ) == ["Basic information extracted"]
+
+
+def cached_upload_body(filename: str, file_size: int, cached: dict) -> dict:
+    """/upload response body for a file whose analysis was cached"""
+    return {
+        "success": True,
+        "data": cached["data"],
+        "filename": filename,
+        "fileSize": file_size,
+        "extractedTextLength": cached["extractedTextLength"],
+        "timestamp": datetime.now().isoformat(),
+        "validation": cached["validation"],
+    }
+
+
+# Error messages of the two file endpoints
+UPLOAD_MESSAGES = {
+    "too_large": "File too large (max 10MB)",
+    "invalid_type": "Invalid file type. Allowed: PDF, DOC, DOCX, TXT",
+    "no_text": "Could not extract sufficient text",
+    "log": "Upload error",
+}
+DIRECT_MESSAGES = {
+    "too_large": "File too large",
+    "invalid_type": "Invalid file type",
+    "no_text": "Insufficient text",
+    "log": "Direct analysis error",
+}
+
+
+def analyze_upload(
+    filename: str,
+    stream,
+    file_size: int,
+    deadline: Deadline,
+    messages: dict = UPLOAD_MESSAGES,
+    groq_slots=None,
+) -> tuple:
+    """(response body, status) of /upload for an uploaded file's stream
+
+    groq_slots (a semaphore) is held while the file is validated and
+    analyzed, so callers can bound how many files wait on Groq at once.
+    """
+    if file_size > MAX_FILE_SIZE:
+        return {"error": messages["too_large"]}, 413
+
+    # Check file type
+    if not allowed_file(filename):
+        return {"error": messages["invalid_type"]}, 400
+
+    # Serve repeat uploads from the cache
+    cache_key = upload_cache_key(filename, stream)
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        print("⚡ Returning cached analysis")
+        return cached_upload_body(filename, file_size, cached), 200
+
+    # Identical files already in flight (double clicks, client retries) wait
+    # for that analysis instead of running their own
+    (body, status), shared = analysis_flights.do(
+        (cache_key, messages["log"]),
+        lambda: extract_and_analyze_upload(
+            filename, stream, file_size, cache_key, deadline, messages, groq_slots
+        ),
+        deadline,
+    )
+    if shared:
+        print("🔗 Shared an identical in-flight analysis")
+        if "filename" in body:
+            body = {**body, "filename": filename}
+    return body, status
+
+
+def extract_and_analyze_upload(
+    filename: str,
+    stream,
+    file_size: int,
+    cache_key: str,
+    deadline: Deadline,
+    messages: dict,
+    groq_slots=None,
+) -> tuple:
+    """Uncached half of analyze_upload: extraction, validation and analysis"""
+    text = extract_text_from_stream(filename, stream, deadline)
+
+    if not text or len(text.strip()) < 50:
+        return {"error": messages["no_text"]}, 400
+
+    with groq_slots or nullcontext():
+        return analyze_extracted_upload(
+            filename, file_size, text, cache_key, deadline
+        )
+
+
+def analyze_extracted_upload(
+    filename: str,
+    file_size: int,
+    text: str,
+    cache_key: str,
+    deadline: Deadline,
+    verdict: dict = None,
+) -> tuple:
+    """Validation and analysis half of analyze_upload
+
+    verdict is the text's local_validation result, when it was already
+    computed (e.g. by bulk_analyze's extraction workers).
+    """
+    return run_groq_steps(
+        extracted_upload_steps(filename, file_size, text, cache_key, verdict), deadline
+    )
+
+
+def extracted_upload_steps(
+    filename: str, file_size: int, text: str, cache_key: str, verdict: dict = None
+):
+    """analyze_extracted_upload as Groq call steps (see run_groq_steps)"""
+    # STRICT VALIDATION - Check if it's a resume
+    print("🔍 STRICT Resume validation started...")
+    validation_result = yield from analyzer.is_valid_resume_steps(
+        text, with_analysis=True, verdict=verdict
+    )
+
+    if not validation_result.get("is_resume", False):
+        reason = validation_result.get("reason", "This doesn't appear to be a resume.")
+        details = validation_result.get("details", {})
+        issues = validation_result.get("issues", [])
+
+        error_msg = f"❌ {reason}"
+        if issues:
+            error_msg += f" Issues: {', '.join(issues[:3])}"
+
+        return {
+            "error": error_msg,
+            "validation_score": validation_result.get("score", 0),
+            "validation_details": details,
+            "is_resume": False,
+            "success": False,
+        }, 400
+
+    print(f"✅ Document validated as resume (score: {validation_result.get('score', 0)}/100)")
+
+    # Borderline documents may already have been analyzed during validation
+    result = validation_result.pop("analysis", None)
+    if result is None:
+        result = yield from analyzer.analysis_steps(text)
+    if not is_fallback_analysis(result):
+        analysis_cache.set(
+            cache_key,
+            {
+                "data": result,
+                "validation": validation_result,
+                "extractedTextLength": len(text),
+            },
+        )
+
+    return {
+        "success": True,
+        "data": result,
+        "filename": filename,
+        "fileSize": file_size,
+        "extractedTextLength": len(text),
+        "timestamp": datetime.now().isoformat(),
+        "validation": validation_result,
+    }, 200
+
+
+def analyze_submitted_text(text: str, deadline: Deadline) -> tuple:
+    """(response body, status) of /analyze for submitted text"""
+    text = text.strip()
+    if len(text) < 50:
+        return {"error": "Text too short"}, 400
+
+    cache_key = text_cache_key(text)
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        print("⚡ Returning cached analysis")
+        return {
+            "success": True,
+            "data": cached["data"],
+            "timestamp": datetime.now().isoformat(),
+            "validation": cached["validation"],
+        }, 200
+
+    # Keyed on the normalized text, so resubmissions differing only in
+    # whitespace or page markers share one analysis too
+    (body, status), shared = analysis_flights.do(
+        text_flight_key(text),
+        lambda: validate_and_analyze_text(text, cache_key, deadline),
+        deadline,
+    )
+    if shared:
+        print("🔗 Shared an identical in-flight analysis")
+    return body, status
+
+
+def validate_and_analyze_text(text: str, cache_key: str, deadline: Deadline) -> tuple:
+    """Uncached half of analyze_submitted_text"""
+    return run_groq_steps(submitted_text_steps(text, cache_key), deadline)
+
+
+def submitted_text_steps(text: str, cache_key: str):
+    """validate_and_analyze_text as Groq call steps (see run_groq_steps)"""
+    # STRICT VALIDATION
+    print("🔍 STRICT Resume validation started...")
+    validation_result = yield from analyzer.is_valid_resume_steps(text, with_analysis=True)
+
+    if not validation_result.get("is_resume", False):
+        reason = validation_result.get("reason", "This doesn't appear to be a resume.")
+        return {
+            "error": f"❌ {reason}",
+            "validation_score": validation_result.get("score", 0),
+            "is_resume": False,
+            "success": False,
+        }, 400
+
+    # Borderline documents may already have been analyzed during validation
+    result = validation_result.pop("analysis", None)
+    if result is None:
+        result = yield from analyzer.analysis_steps(text)
+    if not is_fallback_analysis(result):
+        analysis_cache.set(
+            cache_key,
+            {
+                "data": result,
+                "validation": validation_result,
+                "extractedTextLength": len(text),
+            },
+        )
+
+    return {
+        "success": True,
+        "data": result,
+        "timestamp": datetime.now().isoformat(),
+        "validation": validation_result,
+    }, 200
+
+
+def run_job(job: dict) -> tuple:
+    """(response body, status) for a queued job, as /upload or /analyze"""
+    deadline = Deadline(JOB_DEADLINE_SECONDS)
+    try:
+        if job["kind"] == "text":
+            return analyze_submitted_text(job["payload"].decode("utf-8"), deadline)
+        payload = job["payload"]
+        return analyze_upload(job["filename"], io.BytesIO(payload), len(payload), deadline)
+    except PDFRejectedError as e:
+        return {"error": str(e), "success": False}, 422
+    except DeadlineExceeded as e:
+        print(f"⏱️ {e}")
+        return {"error": str(e), "success": False}, 504
+
+
+# Started by the first request a serving process handles (and by __main__),
+# never at import: spawned PDF extraction workers and asgi_app import this
+# module too
+job_workers = JobWorkers(job_store, run_job, workers=JOB_WORKERS)
+
+
+@app.before_request
+def start_job_workers():
+    job_workers.start()
+
+
+def job_response(job: dict) -> dict:
+    """GET /jobs/<id> body"""
+
+    def timestamp(value):
+        return datetime.fromtimestamp(value).isoformat() if value else None
+
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "filename": job["filename"],
+        "attempts": job["attempts"],
+        "created_at": timestamp(job["created_at"]),
+        "started_at": timestamp(job["started_at"]),
+        "finished_at": timestamp(job["finished_at"]),
+        # The /upload (or /analyze) response the job produced, and its status
+        "result": job["result"],
+        "result_status": job["status_code"],
+    }
+
 
 @app.route("/")
 def index():
@@ -799,7 +1752,11 @@ def index():
             "validation": "STRICT ENABLED",
             "endpoints": {
                 "POST /upload": "Upload and analyze resume",
+                "POST /upload/stream": "Upload and analyze resume (Server-Sent Events)",
                 "POST /analyze": "Analyze resume text",
+                "POST /batch": "Analyze many resume files or a ZIP of them (NDJSON)",
+                "POST /jobs": "Queue a resume file or text for analysis",
+                "GET /jobs/<id>": "Job status and result (?wait=seconds to long-poll)",
                 "GET /health": "Health check",
                 "POST /backend/analyze_resume_direct": "Legacy endpoint",
             },
@@ -813,6 +1770,8 @@ def upload_file():
         return jsonify({"status": "ok"}), 200
 
     try:
+        deadline = request_deadline()
+
         if "file" not in request.files:
             return jsonify({"error": "No file provided"}), 400
 
@@ -820,87 +1779,157 @@ def upload_file():
         if file.filename == "":
             return jsonify({"error": "No file selected"}), 400
 
-        # Check file size
-        file.seek(0, 2)
-        file_size = file.tell()
-        file.seek(0)
+        # Check file size (the upload is already spooled; nothing is read)
+        file_size = upload_size(file.stream)
+
+        body, status = analyze_upload(
+            file.filename, file.stream, file_size, deadline, UPLOAD_MESSAGES
+        )
+        return jsonify(body), status
+
+    except RequestEntityTooLarge:
+        # Raised while the body streams in, before anything is buffered
+        return jsonify({"error": "File too large (max 10MB)"}), 413
+
+    except PDFRejectedError as e:
+        return jsonify({"error": str(e), "success": False}), 422
+
+    except DeadlineExceeded as e:
+        return deadline_error_response(e)
+
+    except Exception as e:
+        print(f"Upload error: {str(e)}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/upload/stream", methods=["POST", "OPTIONS"])
+def upload_file_stream():
+    """Like /upload, but streams stage events and partial analysis fields
+
+    Events: "stage" (extracted, validated, analyzing), "field" for each
+    top-level analysis field as soon as the model finishes it, then either
+    "result" (the /upload response body) or "error".
+    """
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"}), 200
+
+    try:
+        deadline = request_deadline()
+
+        if "file" not in request.files:
+            return jsonify({"error": "No file provided"}), 400
+
+        file = request.files["file"]
+        if file.filename == "":
+            return jsonify({"error": "No file selected"}), 400
 
+        file_size = upload_size(file.stream)
         if file_size > MAX_FILE_SIZE:
             return jsonify({"error": "File too large (max 10MB)"}), 413
 
-        # Check file type
         if not allowed_file(file.filename):
             return (
                 jsonify({"error": "Invalid file type. Allowed: PDF, DOC, DOCX, TXT"}),
                 400,
             )
 
-        # Read and extract text
-        file_content = file.read()
-        filename = file.filename.lower()
-
-        text = ""
-        if filename.endswith(".pdf"):
-            text = analyzer.extract_text_from_pdf(file_content)
-        elif filename.endswith((".docx", ".doc")):
-            text = analyzer.extract_text_from_docx(file_content)
-        elif filename.endswith(".txt"):
-            text = analyzer.extract_text_from_txt(file_content)
-
-        if not text or len(text.strip()) < 50:
-            return jsonify({"error": "Could not extract sufficient text"}), 400
-
-        # STRICT VALIDATION - Check if it's a resume
-        print("🔍 STRICT Resume validation started...")
-        validation_result = analyzer.is_valid_resume(text)
-
-        if not validation_result.get("is_resume", False):
-            reason = validation_result.get(
-                "reason", "This doesn't appear to be a resume."
-            )
-            details = validation_result.get("details", {})
-            issues = validation_result.get("issues", [])
-
-            error_msg = f"❌ {reason}"
-            if issues:
-                error_msg += f" Issues: {', '.join(issues[:3])}"
+    except RequestEntityTooLarge:
+        return jsonify({"error": "File too large (max 10MB)"}), 413
 
-            return (
-                jsonify(
+    def events():
+        try:
+            cache_key = upload_cache_key(file.filename, file.stream)
+            cached = analysis_cache.get(cache_key)
+            if cached is not None:
+                print("⚡ Returning cached analysis")
+                yield sse_event("result", cached_upload_body(file.filename, file_size, cached))
+                return
+
+            text = extract_text_from_upload(file, deadline)
+            if not text or len(text.strip()) < 50:
+                yield sse_event(
+                    "error", {"error": "Could not extract sufficient text", "status": 400}
+                )
+                return
+            yield sse_event("stage", {"stage": "extracted", "extractedTextLength": len(text)})
+
+            print("🔍 STRICT Resume validation started...")
+            validation_result = analyzer.is_valid_resume(text, deadline, with_analysis=True)
+            if not validation_result.get("is_resume", False):
+                reason = validation_result.get(
+                    "reason", "This doesn't appear to be a resume."
+                )
+                issues = validation_result.get("issues", [])
+                error_msg = f"❌ {reason}"
+                if issues:
+                    error_msg += f" Issues: {', '.join(issues[:3])}"
+                yield sse_event(
+                    "error",
                     {
                         "error": error_msg,
                         "validation_score": validation_result.get("score", 0),
-                        "validation_details": details,
+                        "validation_details": validation_result.get("details", {}),
                         "is_resume": False,
                         "success": False,
-                    }
-                ),
-                400,
-            )
+                        "status": 400,
+                    },
+                )
+                return
+            result = validation_result.pop("analysis", None)
+            yield sse_event("stage", {"stage": "validated", "validation": validation_result})
+
+            yield sse_event("stage", {"stage": "analyzing"})
+            if result is None:
+                for kind, name, value in analyzer.iter_resume_analysis(text, deadline):
+                    if kind == "field":
+                        yield sse_event("field", {"field": name, "value": value})
+                    else:
+                        result = name
+
+            if not is_fallback_analysis(result):
+                analysis_cache.set(
+                    cache_key,
+                    {
+                        "data": result,
+                        "validation": validation_result,
+                        "extractedTextLength": len(text),
+                    },
+                )
 
-        print(
-            f"✅ Document validated as resume (score: {validation_result.get('score', 0)}/100)"
-        )
+            yield sse_event(
+                "result",
+                {
+                    "success": True,
+                    "data": result,
+                    "filename": file.filename,
+                    "fileSize": file_size,
+                    "extractedTextLength": len(text),
+                    "timestamp": datetime.now().isoformat(),
+                    "validation": validation_result,
+                },
+            )
 
-        # Analyze
-        result = analyzer.analyze_resume_text(text)
+        except PDFRejectedError as e:
+            yield sse_event("error", {"error": str(e), "success": False, "status": 422})
 
-        return jsonify(
-            {
-                "success": True,
-                "data": result,
-                "filename": file.filename,
-                "fileSize": file_size,
-                "extractedTextLength": len(text),
-                "timestamp": datetime.now().isoformat(),
-                "validation": validation_result,
-            }
-        )
+        except DeadlineExceeded as e:
+            if e.disconnected:
+                print(f"🔌 {e}, abandoning request")
+                return
+            print(f"⏱️ {e}")
+            yield sse_event("error", {"error": str(e), "success": False, "status": 504})
 
-    except Exception as e:
-        print(f"Upload error: {str(e)}")
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        except Exception as e:
+            print(f"Upload stream error: {str(e)}")
+            traceback.print_exc()
+            yield sse_event("error", {"error": str(e), "status": 500})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.route("/analyze", methods=["POST", "OPTIONS"])
@@ -909,44 +1938,21 @@ def analyze():
         return jsonify({"status": "ok"}), 200
 
     try:
+        deadline = request_deadline()
+
         data = request.get_json()
         if not data or "text" not in data:
             return jsonify({"error": "No text provided"}), 400
 
-        text = data["text"].strip()
-        if len(text) < 50:
-            return jsonify({"error": "Text too short"}), 400
-
-        # STRICT VALIDATION
-        print("🔍 STRICT Resume validation started...")
-        validation_result = analyzer.is_valid_resume(text)
-
-        if not validation_result.get("is_resume", False):
-            reason = validation_result.get(
-                "reason", "This doesn't appear to be a resume."
-            )
-            return (
-                jsonify(
-                    {
-                        "error": f"❌ {reason}",
-                        "validation_score": validation_result.get("score", 0),
-                        "is_resume": False,
-                        "success": False,
-                    }
-                ),
-                400,
-            )
+        body, status = analyze_submitted_text(data["text"], deadline)
+        return jsonify(body), status
 
-        result = analyzer.analyze_resume_text(text)
+    except RequestEntityTooLarge:
+        # Raised while the body streams in, before anything is buffered
+        return jsonify({"error": "Request too large"}), 413
 
-        return jsonify(
-            {
-                "success": True,
-                "data": result,
-                "timestamp": datetime.now().isoformat(),
-                "validation": validation_result,
-            }
-        )
+    except DeadlineExceeded as e:
+        return deadline_error_response(e)
 
     except Exception as e:
         print(f"Analysis error: {str(e)}")
@@ -961,6 +1967,8 @@ def analyze_resume_direct():
         return jsonify({"status": "ok"}), 200
 
     try:
+        deadline = request_deadline()
+
         if "file" not in request.files:
             return jsonify({"error": "No file provided"}), 400
 
@@ -968,83 +1976,218 @@ def analyze_resume_direct():
         if file.filename == "":
             return jsonify({"error": "No file selected"}), 400
 
-        # Check file size
-        file.seek(0, 2)
-        file_size = file.tell()
-        file.seek(0)
+        # Check file size (the upload is already spooled; nothing is read)
+        file_size = upload_size(file.stream)
 
-        if file_size > MAX_FILE_SIZE:
-            return jsonify({"error": "File too large"}), 413
+        body, status = analyze_upload(
+            file.filename, file.stream, file_size, deadline, DIRECT_MESSAGES
+        )
+        return jsonify(body), status
 
-        if not allowed_file(file.filename):
-            return jsonify({"error": "Invalid file type"}), 400
+    except RequestEntityTooLarge:
+        # Raised while the body streams in, before anything is buffered
+        return jsonify({"error": "File too large"}), 413
 
-        file_content = file.read()
-        filename = file.filename.lower()
+    except PDFRejectedError as e:
+        return jsonify({"error": str(e), "success": False}), 422
 
-        text = ""
-        if filename.endswith(".pdf"):
-            text = analyzer.extract_text_from_pdf(file_content)
-        elif filename.endswith((".docx", ".doc")):
-            text = analyzer.extract_text_from_docx(file_content)
-        elif filename.endswith(".txt"):
-            text = analyzer.extract_text_from_txt(file_content)
+    except DeadlineExceeded as e:
+        return deadline_error_response(e)
 
-        if not text or len(text.strip()) < 50:
-            return jsonify({"error": "Insufficient text"}), 400
+    except Exception as e:
+        print(f"Direct analysis error: {str(e)}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
 
-        # STRICT VALIDATION
-        print("🔍 STRICT Resume validation started...")
-        validation_result = analyzer.is_valid_resume(text)
 
-        if not validation_result.get("is_resume", False):
-            reason = validation_result.get(
-                "reason", "This doesn't appear to be a resume."
-            )
-            details = validation_result.get("details", {})
-            issues = validation_result.get("issues", [])
+def analyze_batch_item(filename: str, file_size: int, open_stream, probe) -> tuple:
+    """(response body, status) of one batch file, like analyze_resume_direct
 
-            error_msg = f"❌ {reason}"
-            if issues:
-                error_msg += f" Issues: {', '.join(issues[:3])}"
+    Each file gets its own deadline, started when a worker picks it up.
+    """
+    deadline = Deadline(REQUEST_DEADLINE_SECONDS, probe)
+    try:
+        return analyze_upload(
+            filename, open_stream(), file_size, deadline, DIRECT_MESSAGES, batch_groq_slots
+        )
 
-            return (
-                jsonify(
-                    {
-                        "error": error_msg,
-                        "validation_score": validation_result.get("score", 0),
-                        "validation_details": details,
-                        "is_resume": False,
-                        "success": False,
+    except BatchMemberTooLarge:
+        return {"error": DIRECT_MESSAGES["too_large"]}, 413
+
+    except PDFRejectedError as e:
+        return {"error": str(e), "success": False}, 422
+
+    except DeadlineExceeded as e:
+        print(f"⏱️ {filename}: {e}")
+        return {"error": str(e), "success": False}, 499 if e.disconnected else 504
+
+    except Exception as e:
+        print(f"Batch analysis error ({filename}): {str(e)}")
+        traceback.print_exc()
+        return {"error": str(e)}, 500
+
+
+@app.route("/batch", methods=["POST", "OPTIONS"])
+def analyze_batch():
+    """Analyze many resumes: several multipart "files", or one ZIP of them
+
+    Streams NDJSON, one line per file as soon as it finishes (in completion
+    order): the analyze_resume_direct response body plus "index",
+    "filename" and "status". A final {"summary": ...} line closes the stream.
+    """
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"}), 200
+
+    try:
+        uploads = [
+            file
+            for file in request.files.getlist("files") + request.files.getlist("file")
+            if file.filename
+        ]
+        if not uploads:
+            return jsonify({"error": "No files provided"}), 400
+
+        archive = None
+        if len(uploads) == 1 and is_zip_upload(uploads[0].filename):
+            archive, members = zip_members(uploads[0].stream)
+            items = [
+                (name, size, lambda info=info: read_member(archive, info, MAX_FILE_SIZE))
+                for name, size, info in members
+            ]
+        else:
+            items = [
+                (file.filename, upload_size(file.stream), lambda file=file: file.stream)
+                for file in uploads
+            ]
+
+        if not items:
+            return jsonify({"error": "No files in the archive"}), 400
+        if len(items) > BATCH_MAX_FILES:
+            if archive is not None:
+                archive.close()
+            return jsonify({"error": f"Too many files (max {BATCH_MAX_FILES})"}), 400
+
+    except RequestEntityTooLarge:
+        # Raised while the body streams in, before anything is buffered
+        return jsonify({"error": f"Batch too large (max {BATCH_MAX_BYTES // (1024 * 1024)}MB)"}), 413
+
+    except zipfile.BadZipFile:
+        return jsonify({"error": "Invalid ZIP archive"}), 400
+
+    probe = socket_disconnect_probe(request.environ)
+    print(f"📦 Batch of {len(items)} files")
+
+    def lines():
+        started = time.monotonic()
+        succeeded = 0
+        futures = {
+            batch_executor.submit(analyze_batch_item, name, size, open_stream, probe): (index, name)
+            for index, (name, size, open_stream) in enumerate(items)
+        }
+        try:
+            for future in as_completed(futures):
+                index, name = futures[future]
+                body, status = future.result()
+                if status == 200:
+                    succeeded += 1
+                yield json.dumps({**body, "index": index, "filename": name, "status": status}) + "\n"
+
+            yield json.dumps(
+                {
+                    "summary": {
+                        "total": len(items),
+                        "succeeded": succeeded,
+                        "failed": len(items) - succeeded,
+                        "elapsed": round(time.monotonic() - started, 3),
                     }
-                ),
-                400,
-            )
+                }
+            ) + "\n"
+        finally:
+            # Client gone: drop the files no worker has started yet
+            for future in futures:
+                future.cancel()
+            if archive is not None:
+                archive.close()
+
+    return Response(
+        stream_with_context(lines()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        print(
-            f"✅ Document validated as resume (score: {validation_result.get('score', 0)}/100)"
-        )
 
-        result = analyzer.analyze_resume_text(text)
+@app.route("/jobs", methods=["POST", "OPTIONS"])
+def submit_job():
+    """Queue a file (multipart "file") or text (JSON "text") for analysis
+
+    Returns 202 with the job id right away; the result is fetched from
+    GET /jobs/<id>.
+    """
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"}), 200
+
+    try:
+        if "file" in request.files:
+            file = request.files["file"]
+            if file.filename == "":
+                return jsonify({"error": "No file selected"}), 400
+
+            file_size = upload_size(file.stream)
+            if file_size > MAX_FILE_SIZE:
+                return jsonify({"error": "File too large (max 10MB)"}), 413
+            if not allowed_file(file.filename):
+                return (
+                    jsonify({"error": "Invalid file type. Allowed: PDF, DOC, DOCX, TXT"}),
+                    400,
+                )
 
-        return jsonify(
+            with upload_view(file.stream) as content:
+                job_id = job_store.submit("file", bytes(content), file.filename)
+        else:
+            data = request.get_json(silent=True)
+            if not data or "text" not in data:
+                return jsonify({"error": "No file or text provided"}), 400
+            if len(data["text"].strip()) < 50:
+                return jsonify({"error": "Text too short"}), 400
+            job_id = job_store.submit("text", data["text"].encode("utf-8"))
+
+        job_workers.notify()
+        print(f"🧾 Queued job {job_id}")
+        response = jsonify(
             {
                 "success": True,
-                "data": result,
-                "filename": file.filename,
-                "fileSize": file_size,
-                "extractedTextLength": len(text),
-                "timestamp": datetime.now().isoformat(),
-                "validation": validation_result,
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/jobs/{job_id}",
             }
         )
+        response.headers["Location"] = f"/jobs/{job_id}"
+        return response, 202
+
+    except RequestEntityTooLarge:
+        # Raised while the body streams in, before anything is buffered
+        return jsonify({"error": "File too large (max 10MB)"}), 413
 
     except Exception as e:
-        print(f"Direct analysis error: {str(e)}")
+        print(f"Job submission error: {str(e)}")
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Job status; with ?wait=N, hold the request until it finishes (up to N s)"""
+    try:
+        wait = min(max(float(request.args.get("wait", 0)), 0.0), JOB_WAIT_MAX)
+    except ValueError:
+        return jsonify({"error": "wait must be a number of seconds"}), 400
+
+    job = job_store.wait(job_id, wait) if wait else job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job_response(job))
+
+
 @app.route("/health", methods=["GET"])
 def health_check():
     return jsonify(
@@ -1054,6 +2197,11 @@ def health_check():
             "service": "resume-analyzer",
             "validation": "STRICT ENABLED",
             "groq_api_key_configured": bool(GROQ_API_KEY),
+            "cache": analysis_cache.stats(),
+            "groq_circuit": groq_breaker.snapshot(),
+            "model_routing": model_router.snapshot(),
+            "coalescing": analysis_flights.snapshot(),
+            "jobs": job_store.counts(),
         }
     )
 
@@ -1082,4 +2230,12 @@ if __name__ == "__main__":
     ============================================
     """
     )
+    # Spawned PDF extraction workers re-run the __main__ script (as
+    # __mp_main__) when it has a __file__, rebuilding the analyzer, caches
+    # and executors in every worker; they only need pdf_extraction
+    del sys.modules["__main__"].__file__
+
+    # With the reloader, only the serving child runs jobs, not the watcher
+    if is_running_from_reloader():
+        job_workers.start()
     app.run(host="0.0.0.0", port=port, debug=True)
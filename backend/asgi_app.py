@@ -0,0 +1,352 @@
+import asyncio
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app import (
+    DIRECT_MESSAGES,
+    GROQ_API_KEY,
+    GROQ_API_URL,
+    GROQ_MAX_RETRIES,
+    MAX_FILE_SIZE,
+    REQUEST_DEADLINE_MAX,
+    REQUEST_DEADLINE_SECONDS,
+    UPLOAD_MESSAGES,
+    allowed_file,
+    analysis_cache,
+    cached_upload_body,
+    extract_text_from_stream,
+    extracted_upload_steps,
+    groq_breaker,
+    model_router,
+    submitted_text_steps,
+    text_cache_key,
+    text_flight_key,
+    upload_cache_key,
+)
+from deadline import Deadline, DeadlineExceeded
+from groq_client import AsyncGroqClient
+from pdf_inspector import PDFRejectedError
+from single_flight import AsyncSingleFlight
+from upload_stream import upload_size
+
+# Async serving mode for /upload, /analyze and /backend/analyze_resume_direct:
+#
+#     uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+#
+# Same pipeline, caches and JSON responses as the Flask app: it runs the
+# app's Groq call steps (see app.run_groq_steps), but awaits the Groq calls
+# on one shared async connection pool and runs the code between them and
+# extraction in threads, so a single process holds hundreds of in-flight
+# analyses instead of one per worker thread. /upload/stream stays on the
+# Flask app.
+
+# Concurrent Groq connections per process (calls beyond it queue for one)
+ASYNC_GROQ_CONNECTIONS = int(os.getenv("ASYNC_GROQ_CONNECTIONS", 200))
+# Threads running extractors (PDF pages are still parsed in the process pool)
+ASYNC_EXTRACTION_WORKERS = int(os.getenv("ASYNC_EXTRACTION_WORKERS", 8))
+
+groq_client = AsyncGroqClient(
+    GROQ_API_KEY,
+    GROQ_API_URL,
+    pool_size=ASYNC_GROQ_CONNECTIONS,
+    max_retries=GROQ_MAX_RETRIES,
+    breaker=groq_breaker,
+    on_rate_limit=model_router.record_rate_limit,
+)
+extraction_executor = ThreadPoolExecutor(max_workers=ASYNC_EXTRACTION_WORKERS)
+# Analyses in flight on this event loop (app.analysis_flights serves the
+# Flask app's threads)
+analysis_flights = AsyncSingleFlight()
+
+
+class FlaskJSONResponse(JSONResponse):
+    """JSON rendered the way Flask's jsonify renders it"""
+
+    def render(self, content) -> bytes:
+        body = json.dumps(content, ensure_ascii=True, sort_keys=True, separators=(",", ":"))
+        return f"{body}\n".encode("utf-8")
+
+
+def jsonify(body: dict, status_code: int = 200) -> FlaskJSONResponse:
+    return FlaskJSONResponse(body, status_code=status_code)
+
+
+async def groq_post(route: str, data: dict, timeout: float, deadline: Deadline = None):
+    """Async app.groq_post: POST on the routed model, recording the outcome"""
+    start = time.monotonic()
+    try:
+        response = await groq_client.post(
+            data,
+            timeout=timeout,
+            deadline=deadline,
+            fallback_model=model_router.fallback_model(data["model"]),
+        )
+    except Exception:
+        model_router.record(route, time.monotonic() - start, fallback=True)
+        raise
+    model_router.record(route, time.monotonic() - start, fallback=response.status_code != 200)
+    return response
+
+
+def advance(steps, outcome, error) -> tuple:
+    """Run Groq call steps up to the next call: ("step", step) or ("done", result)"""
+    try:
+        step = steps.send(outcome) if error is None else steps.throw(error)
+    except StopIteration as done:
+        return "done", done.value
+    return "step", step
+
+
+async def run_groq_steps(steps, deadline: Deadline = None):
+    """Async app.run_groq_steps
+
+    Groq calls are awaited on the event loop; the pipeline code between them
+    (local validation, prompt compression, the analysis cache) is CPU or disk
+    bound and runs in the thread pool.
+    """
+    outcome = error = None
+    while True:
+        state, value = await run_in_threadpool(advance, steps, outcome, error)
+        if state == "done":
+            return value
+        outcome = error = None
+        try:
+            if isinstance(value, list):
+                outcome = await run_groq_calls(value, deadline)
+            else:
+                outcome = await groq_post(*value, deadline=deadline)
+        except Exception as e:
+            error = e
+
+
+async def run_groq_calls(calls: list, deadline: Deadline = None) -> list:
+    """Async app.run_groq_calls: calls still running at the deadline are cancelled"""
+    tasks = [asyncio.ensure_future(groq_post(*call, deadline=deadline)) for call in calls]
+    done, pending = await asyncio.wait(
+        tasks, timeout=deadline.remaining() if deadline is not None else None
+    )
+    outcomes = []
+    for task in tasks:
+        if task in done:
+            outcomes.append(task.exception() or task.result())
+        else:
+            task.cancel()
+            outcomes.append(
+                DeadlineExceeded(
+                    f"Request deadline of {deadline.seconds:g}s exceeded during Groq analysis"
+                )
+            )
+    return outcomes
+
+
+def request_deadline(request) -> Deadline:
+    """Deadline for the request, honoring the X-Request-Timeout header
+
+    There is no client-disconnect probe here: an abandoned request runs until
+    its deadline, but only holds a coroutine while it does.
+    """
+    seconds = REQUEST_DEADLINE_SECONDS
+    header = request.headers.get("X-Request-Timeout")
+    if header:
+        try:
+            seconds = min(max(float(header), 1.0), REQUEST_DEADLINE_MAX)
+        except ValueError:
+            pass
+    return Deadline(seconds)
+
+
+def deadline_error_response(error: DeadlineExceeded):
+    print(f"⏱️ {error}")
+    return jsonify({"error": str(error), "success": False}, 504)
+
+
+def body_too_large(request) -> bool:
+    """Reject oversized bodies from Content-Length before parsing them"""
+    try:
+        length = int(request.headers.get("content-length", 0))
+    except ValueError:
+        return False
+    return length > MAX_FILE_SIZE + 64 * 1024  # multipart overhead
+
+
+async def extract_and_analyze_upload(
+    file: UploadFile, file_size: int, cache_key: str, deadline: Deadline, messages: dict
+) -> tuple:
+    """Async app.extract_and_analyze_upload: (response body, status)"""
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(
+        extraction_executor, extract_text_from_stream, file.filename, file.file, deadline
+    )
+
+    if not text or len(text.strip()) < 50:
+        return {"error": messages["no_text"]}, 400
+
+    return await run_groq_steps(
+        extracted_upload_steps(file.filename, file_size, text, cache_key), deadline
+    )
+
+
+async def analyze_upload(request, messages: dict):
+    """Shared body of /upload and /backend/analyze_resume_direct"""
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"})
+
+    try:
+        deadline = request_deadline(request)
+
+        if body_too_large(request):
+            return jsonify({"error": messages["too_large"]}, 413)
+
+        async with request.form() as form:
+            file = form.get("file")
+            if not isinstance(file, UploadFile):
+                return jsonify({"error": "No file provided"}, 400)
+            if not file.filename:
+                return jsonify({"error": "No file selected"}, 400)
+
+            file_size = upload_size(file.file)
+            if file_size > MAX_FILE_SIZE:
+                return jsonify({"error": messages["too_large"]}, 413)
+
+            if not allowed_file(file.filename):
+                return jsonify({"error": messages["invalid_type"]}, 400)
+
+            # Hashing the file and SQLite lookups block: keep them off the loop
+            cache_key = await run_in_threadpool(upload_cache_key, file.filename, file.file)
+            cached = await run_in_threadpool(analysis_cache.get, cache_key)
+            if cached is not None:
+                print("⚡ Returning cached analysis")
+                return jsonify(cached_upload_body(file.filename, file_size, cached))
+
+            # Identical files already in flight wait for that analysis
+            (body, status), shared = await analysis_flights.do(
+                (cache_key, messages["log"]),
+                lambda: extract_and_analyze_upload(file, file_size, cache_key, deadline, messages),
+                deadline,
+            )
+
+        if shared:
+            print("🔗 Shared an identical in-flight analysis")
+            if "filename" in body:
+                body = {**body, "filename": file.filename}
+        return jsonify(body, status)
+
+    except PDFRejectedError as e:
+        return jsonify({"error": str(e), "success": False}, 422)
+
+    except DeadlineExceeded as e:
+        return deadline_error_response(e)
+
+    except Exception as e:
+        print(f"{messages['log']}: {str(e)}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}, 500)
+
+
+async def upload_file(request):
+    return await analyze_upload(request, UPLOAD_MESSAGES)
+
+
+async def analyze_resume_direct(request):
+    """Legacy endpoint for frontend compatibility"""
+    return await analyze_upload(request, DIRECT_MESSAGES)
+
+
+async def analyze(request):
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"})
+
+    try:
+        deadline = request_deadline(request)
+
+        if body_too_large(request):
+            return jsonify({"error": "Request too large"}, 413)
+
+        data = await request.json()
+        if not data or "text" not in data:
+            return jsonify({"error": "No text provided"}, 400)
+
+        text = data["text"].strip()
+        if len(text) < 50:
+            return jsonify({"error": "Text too short"}, 400)
+
+        cache_key = await run_in_threadpool(text_cache_key, text)
+        cached = await run_in_threadpool(analysis_cache.get, cache_key)
+        if cached is not None:
+            print("⚡ Returning cached analysis")
+            return jsonify(
+                {
+                    "success": True,
+                    "data": cached["data"],
+                    "timestamp": datetime.now().isoformat(),
+                    "validation": cached["validation"],
+                }
+            )
+
+        # Keyed on the normalized text, like the Flask app
+        (body, status), shared = await analysis_flights.do(
+            await run_in_threadpool(text_flight_key, text),
+            lambda: run_groq_steps(submitted_text_steps(text, cache_key), deadline),
+            deadline,
+        )
+        if shared:
+            print("🔗 Shared an identical in-flight analysis")
+        return jsonify(body, status)
+
+    except DeadlineExceeded as e:
+        return deadline_error_response(e)
+
+    except Exception as e:
+        print(f"Analysis error: {str(e)}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}, 500)
+
+
+async def health_check(request):
+    return jsonify(
+        {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "service": "resume-analyzer",
+            "validation": "STRICT ENABLED",
+            "groq_api_key_configured": bool(GROQ_API_KEY),
+            "cache": await run_in_threadpool(analysis_cache.stats),
+            "groq_circuit": groq_breaker.snapshot(),
+            "model_routing": model_router.snapshot(),
+            "coalescing": analysis_flights.snapshot(),
+        }
+    )
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await groq_client.aclose()
+    extraction_executor.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route("/upload", upload_file, methods=["POST", "OPTIONS"]),
+        Route("/analyze", analyze, methods=["POST", "OPTIONS"]),
+        Route("/backend/analyze_resume_direct", analyze_resume_direct, methods=["POST", "OPTIONS"]),
+        Route("/health", health_check, methods=["GET"]),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    ],
+    lifespan=lifespan,
+)
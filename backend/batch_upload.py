@@ -0,0 +1,50 @@
+import io
+import posixpath
+import zipfile
+
+
+class BatchMemberTooLarge(Exception):
+    """A ZIP member decompresses to more than the per-file limit"""
+
+
+def is_zip_upload(filename: str) -> bool:
+    # DOCX files are ZIPs too, so only the extension decides
+    return filename.lower().endswith(".zip")
+
+
+def _skip_member(info: zipfile.ZipInfo) -> bool:
+    """Directories and archiver metadata (__MACOSX/, .DS_Store, dotfiles)"""
+    if info.is_dir():
+        return True
+    parts = info.filename.split("/")
+    return parts[0] == "__MACOSX" or posixpath.basename(info.filename).startswith(".")
+
+
+def read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, max_bytes: int) -> io.BytesIO:
+    """Decompress one member into memory, never past max_bytes
+
+    The declared size is checked first, and the read is capped as well in
+    case the header lies (zip bombs).
+    """
+    if info.file_size > max_bytes:
+        raise BatchMemberTooLarge(info.filename)
+    with archive.open(info) as member:
+        content = member.read(max_bytes + 1)
+    if len(content) > max_bytes:
+        raise BatchMemberTooLarge(info.filename)
+    return io.BytesIO(content)
+
+
+def zip_members(stream) -> tuple:
+    """(archive, [(name, declared size, ZipInfo)]) for the files in a ZIP upload
+
+    Members are read straight from the uploaded stream (read_member) one at
+    a time; nothing is unpacked to disk.
+    """
+    archive = zipfile.ZipFile(stream)
+    members = [
+        (info.filename, info.file_size, info)
+        for info in archive.infolist()
+        if not _skip_member(info)
+    ]
+    return archive, members
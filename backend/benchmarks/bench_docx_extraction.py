@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming DOCX extractor against the python-docx object model.
+
+Run from the backend directory:
+    python benchmarks/bench_docx_extraction.py [--paragraphs 2000] [--runs 20]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+from docx import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_extraction import iter_docx_text  # noqa: E402
+
+
+def build_sample_docx(paragraphs: int) -> bytes:
+    """Resume-like DOCX with a header, body paragraphs and a skills table"""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com | +1 555 123 4567"
+    doc.add_heading("Work Experience", level=1)
+    for i in range(paragraphs):
+        doc.add_paragraph(
+            f"• Led project {i}: built Python and React services, cut latency by {i % 90}%"
+        )
+    doc.add_heading("Skills", level=1)
+    table = doc.add_table(rows=20, cols=3)
+    for row_index, row in enumerate(table.rows):
+        for col_index, cell in enumerate(row.cells):
+            cell.text = f"Skill {row_index}-{col_index}"
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_extract(content: bytes) -> str:
+    """Previous implementation: body paragraphs via python-docx"""
+    doc = Document(io.BytesIO(content))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+
+def streaming_extract(content: bytes) -> str:
+    return "\n".join(iter_docx_text(content)).strip()
+
+
+def measure(name: str, extract, content: bytes, runs: int):
+    start = time.perf_counter()
+    for _ in range(runs):
+        text = extract(content)
+    elapsed = (time.perf_counter() - start) / runs
+
+    tracemalloc.start()
+    extract(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<14} {elapsed * 1000:9.2f} ms/doc   peak {peak / 1024:9.1f} KiB   {len(text):8d} chars"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    content = build_sample_docx(args.paragraphs)
+    print(f"Sample DOCX: {len(content) / 1024:.1f} KiB, {args.paragraphs} paragraphs\n")
+
+    baseline = measure("python-docx", python_docx_extract, content, args.runs)
+    streaming = measure("streaming", streaming_extract, content, args.runs)
+    print(f"\nSpeedup: {baseline / streaming:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
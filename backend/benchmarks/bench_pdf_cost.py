@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Fit the PDFCostGuard constants to measured pdfplumber parse times.
+
+Times a full pdfplumber parse (open plus extract_text on every page, as the
+extraction workers do) of each PDF in a corpus, then fits seconds per page,
+per MB of inflated content and per thousand objects by non-negative least
+squares. Without --corpus, a synthetic corpus covering page count, text
+density, compression, vector-heavy pages and embedded fonts is generated.
+
+Run from the backend directory:
+    python benchmarks/bench_pdf_cost.py [--corpus DIR] [--repeats 2]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import zlib
+
+import numpy as np
+import pdfplumber
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_inspector import PDFCostGuard, scan_pdf  # noqa: E402
+
+WORDS = "Led design of Python services on Kubernetes cutting p95 latency by 40 percent".split()
+
+
+def font_program(name: str, size: int) -> bytes:
+    """Type1 font file stream: a cleartext header pdfminer parses for the
+    encoding, then `size` bytes standing in for the encrypted glyph data"""
+    cleartext = (
+        b"%%!PS-AdobeFont-1.0: %s 003.002\n/FontName /%s def\n"
+        b"/Encoding StandardEncoding def\ncurrentfile eexec\n" % (name, name)
+    )
+    binary = random.Random(name).randbytes(size)
+    content = zlib.compress(cleartext + binary)
+    return (
+        b"<< /Length %d /Length1 %d /Length2 %d /Length3 0 /Filter /FlateDecode >>"
+        % (len(content), len(cleartext), len(binary))
+        + b"\nstream\n" + content + b"\nendstream"
+    )
+
+
+def build_pdf(
+    pages: int,
+    lines: int,
+    words: int,
+    compress: bool,
+    rects: int = 0,
+    fonts: int = 0,
+    font_bytes: int = 0,
+) -> bytes:
+    """Minimal PDF with `lines` lines of `words` words (and `rects` rectangles)
+    per page, in Helvetica or in `fonts` embedded Type1 fonts of `font_bytes`"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]  # pages tree filled in below
+    font_names = []
+    for index in range(fonts):
+        name = b"CMR%d" % (index + 10)
+        objects.append(font_program(name, font_bytes))
+        objects.append(
+            b"<< /Type /FontDescriptor /FontName /%s /Flags 4 /FontBBox [0 -250 1000 750] "
+            b"/ItalicAngle 0 /Ascent 750 /Descent -250 /CapHeight 700 /StemV 80 "
+            b"/FontFile %d 0 R >>" % (name, len(objects))
+        )
+        objects.append(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /FirstChar 32 /LastChar 126 "
+            b"/Encoding /WinAnsiEncoding /Widths [%s] /FontDescriptor %d 0 R >>"
+            % (name, b" ".join([b"500"] * 95), len(objects))
+        )
+        font_names.append((b"/F%d" % (index + 1), len(objects)))
+    if not fonts:
+        objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        font_names.append((b"/F1", len(objects)))
+    resources = b"<< /Font << %s >> >>" % b" ".join(
+        b"%s %d 0 R" % (font, number) for font, number in font_names
+    )
+
+    kids = []
+    for page in range(pages):
+        operators = [b"BT 40 780 Td 11 TL"]
+        for line in range(lines):
+            text = " ".join(WORDS[(page + line + i) % len(WORDS)] for i in range(words))
+            font = font_names[line % len(font_names)][0]
+            operators.append(b"%s 9 Tf (" % font + text.encode("latin-1") + b") Tj T*")
+        operators.append(b"ET")
+        for i in range(rects):
+            operators.append(b"%d %d 20 8 re S" % (40 + (i * 23) % 520, 40 + (i * 11) % 700))
+        content = b"\n".join(operators)
+        if compress:
+            content = zlib.compress(content)
+            header = b"<< /Length %d /Filter /FlateDecode >>" % len(content)
+        else:
+            header = b"<< /Length %d >>" % len(content)
+        objects.append(header + b"\nstream\n" + content + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources %s >>" % (len(objects), resources)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+def synthetic_corpus():
+    """(name, PDF bytes) from one-page CVs to long, dense or vector-heavy
+    documents, with base-14 or embedded fonts"""
+    for pages in (1, 3, 10, 30, 60):
+        for lines, words in ((12, 4), (45, 10), (90, 14)):
+            for compress in (False, True):
+                name = f"p{pages}-l{lines}x{words}{'-flate' if compress else ''}"
+                yield name, build_pdf(pages, lines, words, compress)
+        yield f"p{pages}-vector", build_pdf(pages, 20, 6, True, rects=400)
+        # TeX-style: a handful of embedded Type1 fonts, from subsets to full
+        yield f"p{pages}-fonts", build_pdf(pages, 45, 10, True, fonts=4, font_bytes=40_000)
+        yield f"p{pages}-bigfonts", build_pdf(pages, 45, 10, True, fonts=3, font_bytes=400_000)
+
+
+def directory_corpus(path: str):
+    for filename in sorted(os.listdir(path)):
+        if filename.lower().endswith(".pdf"):
+            with open(os.path.join(path, filename), "rb") as f:
+                yield filename, f.read()
+
+
+def parse_seconds(content: bytes, repeats: int) -> float:
+    """Best-of-repeats wall time of a full pdfplumber parse"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with pdfplumber.open(io.BytesIO(content)) as pdf:
+            for page in pdf.pages:
+                page.extract_text()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def features(stats: dict) -> list:
+    """The PDFCostGuard.estimate terms, in constructor argument order"""
+    return [
+        stats["pages"],
+        stats["inflated_content_bytes"] / (1024 * 1024),
+        stats["objects"] / 1000,
+    ]
+
+
+def fit_non_negative(matrix: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    """Least squares with coefficients clamped at zero (small active set)"""
+    active = list(range(matrix.shape[1]))
+    while True:
+        solution, *_ = np.linalg.lstsq(matrix[:, active], seconds, rcond=None)
+        if (solution >= 0).all():
+            coefficients = np.zeros(matrix.shape[1])
+            coefficients[active] = solution
+            return coefficients
+        active.pop(int(np.argmin(solution)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="directory of PDFs (default: synthetic corpus)")
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    corpus = directory_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    guard = PDFCostGuard()
+    rows = []
+    for name, content in corpus:
+        stats = scan_pdf(content)
+        rows.append((name, stats, parse_seconds(content, args.repeats)))
+
+    matrix = np.array([features(stats) for _, stats, _ in rows])
+    seconds = np.array([elapsed for _, _, elapsed in rows])
+    per_page, per_mb, per_thousand_objects = fit_non_negative(matrix, seconds)
+    fitted = PDFCostGuard(
+        seconds_per_page=per_page,
+        seconds_per_mb=per_mb,
+        seconds_per_thousand_objects=per_thousand_objects,
+    )
+
+    print(f"{'document':<22} {'pages':>5} {'MB':>6} {'objs':>6} {'actual s':>9} {'current':>8} {'fitted':>8}")
+    for name, stats, elapsed in rows:
+        print(
+            f"{name:<22} {stats['pages']:>5} {stats['inflated_content_bytes'] / 2**20:>6.2f} "
+            f"{stats['objects']:>6} {elapsed:>9.3f} {guard.estimate(stats):>8.3f} "
+            f"{fitted.estimate(stats):>8.3f}"
+        )
+
+    for label, model in (("current", guard), ("fitted", fitted)):
+        estimates = np.array([model.estimate(stats) for _, stats, _ in rows])
+        ratios = estimates / np.maximum(seconds, 1e-6)
+        print(
+            f"\n{label:<8} mean |error| {np.abs(estimates - seconds).mean():.3f}s, "
+            f"estimate/actual min {ratios.min():.2f} median {np.median(ratios):.2f} "
+            f"max {ratios.max():.2f}"
+        )
+    print(
+        f"\nFitted: seconds_per_page={per_page:.4f} seconds_per_mb={per_mb:.3f} "
+        f"seconds_per_thousand_objects={per_thousand_objects:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
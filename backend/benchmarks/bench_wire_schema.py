@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Compare the verbose analysis JSON with the compact wire schema.
+
+Offline (default) it encodes a synthetic corpus of analyses both ways and
+counts output tokens, checking that both decode to the same response.
+With --live and GROQ_API_KEY set it also sends sample resumes through both
+prompts and reports Groq's completion_tokens and wall time.
+
+Run from the backend directory:
+    python benchmarks/bench_wire_schema.py [--resumes 50] [--live]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_schema import (  # noqa: E402
+    COMPACT_ANALYSIS_PROMPT,
+    SKILL_CATEGORIES,
+    expand_analysis,
+)
+
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# Previous implementation: verbose keys plus a summary the backend recomputes
+VERBOSE_ANALYSIS_PROMPT = """You are an expert resume analyzer. Extract and structure information from the resume text into JSON format.
+
+Extract the following information in JSON format:
+{
+    "education": [{"degree": "...", "institution": "...", "year": "..."}],
+    "projects": [{"name": "...", "description": "...", "technologies": ["..."], "main_points": ["..."]}],
+    "experience": {"years": 0, "level": "Fresher/Junior/Mid-Level/Senior"},
+    "skills": {"Programming Languages": [], "Web Technologies": [], "Databases": [], "Frameworks & Libraries": [], "Tools & Platforms": []},
+    "certifications": [{"name": "...", "year": "..."}],
+    "achievements": ["..."],
+    "personal_info": {"name": "...", "email": "...", "phone": "..."},
+    "analysis_summary": {"total_projects": 0, "education_entries": 0, "skill_categories": 0, "certifications_count": 0, "achievements_count": 0, "candidate_type": "...", "overall_strengths": []}
+}
+
+IMPORTANT: For projects, include BOTH "description" (string) AND "main_points" (array of strings).
+"main_points" should be key features/bullet points extracted from the project description.
+
+Return ONLY the JSON, no other text."""
+
+SKILLS = {
+    "L": ["Python", "Java", "TypeScript", "Go", "C++", "SQL"],
+    "W": ["React", "Next.js", "HTML", "CSS", "REST APIs"],
+    "D": ["PostgreSQL", "MongoDB", "Redis", "MySQL"],
+    "F": ["Django", "Flask", "Spring Boot", "Express", "TensorFlow"],
+    "T": ["Docker", "Kubernetes", "AWS", "Git", "Jenkins"],
+}
+
+# Offline stand-in for the model's tokenizer: words, numbers and single
+# punctuation marks count as one token each. Whitespace is free, which
+# understates the cost of the indented verbose output.
+TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def count_tokens(text: str) -> int:
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def sample_analysis(rng: random.Random, index: int) -> dict:
+    """Compact analysis for one synthetic candidate"""
+    projects = [
+        [
+            f"Project {index}-{p}",
+            f"Service that processes {rng.randint(1, 900)}k events per day",
+            rng.sample(SKILLS["L"] + SKILLS["F"], 3),
+            [f"Reduced latency by {rng.randint(5, 80)}%", "Added CI/CD pipeline"],
+        ]
+        for p in range(rng.randint(1, 4))
+    ]
+    return {
+        "i": [f"Candidate {index}", f"candidate{index}@example.com", "+1 555 010 0000"],
+        "y": rng.randint(0, 12),
+        "e": [["B.Tech Computer Science", "State University", str(rng.randint(2005, 2023))]],
+        "p": projects,
+        "s": {code: rng.sample(items, rng.randint(1, 3)) for code, items in SKILLS.items()},
+        "c": [["AWS Certified Developer", "2022"]] if index % 2 else [],
+        "a": [f"Hackathon winner {rng.randint(2015, 2024)}"],
+        "st": ["Backend development", "System design"],
+    }
+
+
+def verbose_encoding(compact: dict) -> str:
+    """What the old prompt made the model emit for the same content"""
+    analysis = expand_analysis(compact)
+    for category in SKILL_CATEGORIES.values():
+        analysis["skills"].setdefault(category, [])
+    analysis["analysis_summary"] = {
+        "total_projects": len(analysis["projects"]),
+        "education_entries": len(analysis["education"]),
+        "skill_categories": len(analysis["skills"]),
+        "certifications_count": len(analysis["certifications"]),
+        "achievements_count": len(analysis["achievements"]),
+        "candidate_type": "Mid-Level",
+        "overall_strengths": analysis["analysis_summary"]["overall_strengths"],
+    }
+    analysis["experience"]["level"] = "Mid-Level"
+    return json.dumps(analysis, indent=4)
+
+
+def offline(resumes: int):
+    rng = random.Random(42)
+    verbose_tokens, compact_tokens = [], []
+    for index in range(resumes):
+        compact = sample_analysis(rng, index)
+        verbose = verbose_encoding(compact)
+        wire = json.dumps(compact, separators=(",", ":"))
+
+        decoded = expand_analysis(json.loads(wire))
+        assert decoded["projects"] == expand_analysis(json.loads(verbose))["projects"]
+
+        verbose_tokens.append(count_tokens(verbose))
+        compact_tokens.append(count_tokens(wire))
+
+    verbose_mean = statistics.mean(verbose_tokens)
+    compact_mean = statistics.mean(compact_tokens)
+    print(f"Output tokens per analysis over {resumes} synthetic resumes")
+    print(f"  verbose schema: {verbose_mean:8.1f}")
+    print(f"  compact schema: {compact_mean:8.1f}")
+    print(f"  reduction:      {1 - compact_mean / verbose_mean:8.1%}")
+    print(
+        f"System prompt tokens: verbose {count_tokens(VERBOSE_ANALYSIS_PROMPT)}, "
+        f"compact {count_tokens(COMPACT_ANALYSIS_PROMPT)}"
+    )
+
+
+def resume_text(compact: dict) -> str:
+    """Plain-text resume that should produce the given analysis"""
+    name, email, phone = compact["i"]
+    lines = [name, f"{email} | {phone}", "", "Education"]
+    lines += [f"{degree}, {school}, {year}" for degree, school, year in compact["e"]]
+    lines += ["", f"Work Experience ({compact['y']} years)", "", "Projects"]
+    for project_name, description, technologies, points in compact["p"]:
+        lines.append(f"{project_name}: {description} ({', '.join(technologies)})")
+        lines += [f"• {point}" for point in points]
+    skills = sorted({skill for items in compact["s"].values() for skill in items})
+    lines += ["", "Skills: " + ", ".join(skills), "", "Achievements"]
+    lines += [f"• {item}" for item in compact["a"]]
+    return "\n".join(lines)
+
+
+def live(resumes: int, model: str):
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        sys.exit("--live needs GROQ_API_KEY")
+
+    session = requests.Session()
+    session.headers.update({"Authorization": f"Bearer {api_key}"})
+    rng = random.Random(7)
+    texts = [resume_text(sample_analysis(rng, index)) for index in range(resumes)]
+
+    for label, prompt in (("verbose", VERBOSE_ANALYSIS_PROMPT), ("compact", COMPACT_ANALYSIS_PROMPT)):
+        tokens, seconds = [], []
+        for text in texts:
+            payload = {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": f"Analyze this resume:\n\n{text}"},
+                ],
+                "temperature": 0.1,
+                "max_tokens": 2000,
+            }
+            start = time.perf_counter()
+            response = session.post(GROQ_API_URL, json=payload, timeout=60)
+            seconds.append(time.perf_counter() - start)
+            response.raise_for_status()
+            tokens.append(response.json()["usage"]["completion_tokens"])
+        print(
+            f"{label:8s} completion tokens {statistics.mean(tokens):7.1f}   "
+            f"latency p50 {statistics.median(seconds):5.2f}s   max {max(seconds):5.2f}s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--live", action="store_true", help="also call the Groq API")
+    parser.add_argument("--model", default="llama-3.3-70b-versatile")
+    args = parser.parse_args()
+
+    offline(args.resumes)
+    if args.live:
+        live(min(args.resumes, 10), args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Load-test the sync (gunicorn + Flask) and async (uvicorn + asgi_app) servers.
+
+Starts a fake Groq endpoint (in its own process) that answers every
+completion after a fixed latency, runs each server against it (GROQ_API_URL)
+and fires concurrent /analyze requests with distinct resumes, so nothing is
+served from the cache.
+Reports throughput and latency percentiles per mode.
+
+Run from the backend directory:
+    python benchmarks/load_test.py [--requests 400] [--concurrency 200]
+        [--groq-latency 2] [--mode both] [--sync-workers 4] [--sync-threads 1]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import aiohttp
+import uvicorn
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from circuit_breaker import percentile  # noqa: E402
+
+COMPACT_ANALYSIS = json.dumps(
+    {
+        "i": ["Jane Doe", "jane@example.com", "+1 555 123 4567"],
+        "y": 6,
+        "e": [["M.S. Computer Science", "Stanford University", "2016"]],
+        "p": [["Log pipeline", "Streaming log analysis", ["Rust", "Kafka"], ["1M events/s"]]],
+        "s": {"L": ["Python", "Go"], "D": ["PostgreSQL"], "T": ["Kubernetes"]},
+        "c": [["AWS Solutions Architect", "2021"]],
+        "a": ["Speaker at PyCon 2019"],
+        "st": ["Distributed systems"],
+    }
+)
+
+
+def build_resume(index: int) -> str:
+    return f"""Candidate {index}
+candidate{index}@example.com  +1 555 123 {index % 10000:04d}
+Summary
+Backend engineer with 6 years of professional experience.
+Work Experience
+Acme Corp  Senior Engineer  Jan 2019 - Present
+• Built payment services in Python and Go
+• Led a team of four engineers
+Education
+M.S. Computer Science, Stanford University, 2016
+Skills
+Python, Go, PostgreSQL, Docker, Kubernetes
+Projects
+Log pipeline: streaming log analysis with Rust and Kafka
+Certifications
+AWS Solutions Architect, 2021
+Achievements
+Speaker at PyCon 2019
+"""
+
+
+def fake_groq_app(latency: float):
+    """ASGI app answering every chat completion after `latency` seconds"""
+    body = json.dumps({"choices": [{"message": {"content": COMPACT_ANALYSIS}}]}).encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        more_body = True
+        while more_body:
+            more_body = (await receive()).get("more_body", False)
+        await asyncio.sleep(latency)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def run_fake_groq(port: int, latency: float):
+    uvicorn.run(
+        fake_groq_app(latency), host="127.0.0.1", port=port, backlog=2048, log_level="warning"
+    )
+
+
+def start_fake_groq(latency: float):
+    """Fake Groq in its own process, so it does not share a GIL with the load"""
+    port = free_port()
+    process = multiprocessing.Process(target=run_fake_groq, args=(port, latency), daemon=True)
+    process.start()
+    wait_for(f"http://127.0.0.1:{port}/", "fake Groq", method="POST", timeout=latency + 5)
+    return process, f"http://127.0.0.1:{port}/openai/v1/chat/completions"
+
+
+def wait_for(url: str, name: str, method: str = "GET", timeout: float = 5):
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(
+                urllib.request.Request(url, data=b"{}" if method == "POST" else None),
+                timeout=timeout,
+            ) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{name} did not start")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, port: int, groq_url: str, args):
+    env = {
+        **os.environ,
+        "GROQ_API_URL": groq_url,
+        "GROQ_API_KEY": "load-test",
+        "ANALYSIS_CACHE_PATH": os.path.join(tempfile.mkdtemp(), "cache.sqlite3"),
+    }
+    if mode == "sync":
+        command = [
+            sys.executable, "-m", "gunicorn", "app:app",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(args.sync_workers),
+            "--threads", str(args.sync_threads),
+            "--backlog", "2048",
+            "--timeout", "120",
+        ]
+    else:
+        command = [
+            sys.executable, "-m", "uvicorn", "asgi_app:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--backlog", "2048",
+            "--log-level", "warning",
+        ]
+    process = subprocess.Popen(
+        command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        wait_for(f"http://127.0.0.1:{port}/health", f"{mode} server")
+    except RuntimeError:
+        process.kill()
+        raise
+    return process
+
+
+async def fire(base_url: str, total: int, concurrency: int, offset: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    # A connection per request: kept-alive connections would pin the load to
+    # whichever gunicorn worker accepted them
+    connector = aiohttp.TCPConnector(limit=concurrency, force_close=True)
+    timeout = aiohttp.ClientTimeout(total=300)
+
+    async with aiohttp.ClientSession(base_url, connector=connector, timeout=timeout) as client:
+
+        async def one(index: int):
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    async with client.post(
+                        "/analyze", json={"text": build_resume(offset + index)}
+                    ) as response:
+                        ok = response.status == 200 and (await response.json()).get("success")
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "ok": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "max": max(latencies, default=0.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--groq-latency", type=float, default=2.0)
+    parser.add_argument("--mode", choices=("sync", "async", "both"), default="both")
+    parser.add_argument("--sync-workers", type=int, default=4)
+    parser.add_argument("--sync-threads", type=int, default=1)
+    args = parser.parse_args()
+
+    fake_groq, groq_url = start_fake_groq(args.groq_latency)
+    modes = ("sync", "async") if args.mode == "both" else (args.mode,)
+    print(
+        f"{args.requests} requests, {args.concurrency} concurrent, "
+        f"Groq latency {args.groq_latency:g}s"
+    )
+    print(
+        f"{'mode':<7} {'ok':>5} {'errors':>6} {'req/s':>8} "
+        f"{'p50 s':>7} {'p95 s':>7} {'max s':>7}"
+    )
+
+    for offset, mode in enumerate(modes):
+        port = free_port()
+        process = start_server(mode, port, groq_url, args)
+        try:
+            stats = asyncio.run(
+                fire(
+                    f"http://127.0.0.1:{port}",
+                    args.requests,
+                    args.concurrency,
+                    offset * args.requests,
+                )
+            )
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        print(
+            f"{mode:<7} {stats['ok']:>5} {stats['errors']:>6} {stats['throughput']:>8.1f} "
+            f"{stats['p50']:>7.2f} {stats['p95']:>7.2f} {stats['max']:>7.2f}"
+        )
+
+    fake_groq.terminate()
+
+
+if __name__ == "__main__":
+    main()
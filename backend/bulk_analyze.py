@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Bulk-analyze resume files offline, without going through the HTTP service.
+
+Walks a directory (or reads a manifest of paths, one per line), extracts and
+locally validates files in a process pool, analyzes them with bounded Groq
+concurrency and appends one JSON line per file to the output: the
+/backend/analyze_resume_direct response body plus "path" and "status".
+
+Finished files are appended to a checkpoint file, so an interrupted run
+started again with the same output skips them. Files that failed with a 5xx
+or got a fallback analysis (Groq unavailable) are not checkpointed and are
+retried by the next run; the output keeps the latest line per path.
+
+Run from the backend directory:
+    python bulk_analyze.py resumes/ --output results.jsonl
+        [--manifest] [--workers 4] [--concurrency 8] [--checkpoint PATH]
+        [--deadline 120] [--quiet]
+"""
+
+import argparse
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+# A CLI runs no job queue threads
+os.environ.setdefault("JOB_WORKERS", "0")
+
+SUPPORTED_EXTENSIONS = (".pdf", ".doc", ".docx", ".txt")
+
+# Files in flight per extraction worker / per analysis slot; bounds memory
+# while keeping both pools busy
+EXTRACT_AHEAD = 2
+ANALYZE_AHEAD = 2
+
+# fsync the output and checkpoint every this many records
+SYNC_EVERY = 100
+
+STAGES = ("extract", "validate", "analyze")
+
+
+def iter_directory(root: str):
+    """Supported files under root, in a stable order"""
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(SUPPORTED_EXTENSIONS) and not filename.startswith("."):
+                yield os.path.join(directory, filename)
+
+
+def iter_manifest(manifest: str):
+    """Paths listed in a manifest (relative ones resolve against its directory)"""
+    base = os.path.dirname(os.path.abspath(manifest))
+    with open(manifest, encoding="utf-8") as lines:
+        for line in lines:
+            path = line.strip()
+            if path and not path.startswith("#"):
+                yield os.path.join(base, path)
+
+
+def load_checkpoint(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as lines:
+        return {line.rstrip("\n") for line in lines if line.strip()}
+
+
+def init_worker(quiet: bool):
+    """Extraction worker setup, before app is imported"""
+    # The bulk pool already parallelizes files: one PDF process per worker
+    os.environ["PDF_EXTRACTION_WORKERS"] = "1"
+    os.environ["JOB_WORKERS"] = "0"
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+    import app
+
+    # A pool worker joins its child processes on exit before any atexit hook
+    # runs, so the PDF pools it started are shut down first (or it hangs).
+    # The priority is above that of the pools' own queue finalizers (10),
+    # which would otherwise close the queues before the stop messages go out.
+    for extractor in (app.analyzer.pdf_extractor, app.analyzer.pdf_heavy_extractor):
+        multiprocessing.util.Finalize(None, extractor.shutdown, exitpriority=100)
+
+
+def prepare_file(path: str, deadline_seconds: float) -> dict:
+    """Worker: everything up to the Groq stage for one file
+
+    Returns {"body", "status"} when the file is already decided (cached,
+    rejected, unreadable), otherwise the text and its local_validation
+    verdict for analyze_file. "timings" holds seconds per stage.
+    """
+    import app
+    from deadline import Deadline, DeadlineExceeded
+    from pdf_inspector import PDFRejectedError
+
+    filename = os.path.basename(path)
+    timings = {}
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as stream:
+            file_size = os.fstat(stream.fileno()).st_size
+            if file_size > app.MAX_FILE_SIZE:
+                return {"body": {"error": app.DIRECT_MESSAGES["too_large"]}, "status": 413}
+            if not app.allowed_file(filename):
+                return {"body": {"error": app.DIRECT_MESSAGES["invalid_type"]}, "status": 400}
+
+            cache_key = app.upload_cache_key(filename, stream)
+            cached = app.analysis_cache.get(cache_key)
+            if cached is not None:
+                return {"body": app.cached_upload_body(filename, file_size, cached), "status": 200}
+
+            text = app.extract_text_from_stream(filename, stream, Deadline(deadline_seconds))
+        timings["extract"] = time.perf_counter() - started
+
+        if not text or len(text.strip()) < 50:
+            return {
+                "body": {"error": app.DIRECT_MESSAGES["no_text"]},
+                "status": 400,
+                "timings": timings,
+            }
+
+        started = time.perf_counter()
+        verdict = app.analyzer.local_validation(text)
+        timings["validate"] = time.perf_counter() - started
+        return {
+            "filename": filename,
+            "file_size": file_size,
+            "text": text,
+            "cache_key": cache_key,
+            "verdict": verdict,
+            "timings": timings,
+        }
+
+    except PDFRejectedError as e:
+        return {"body": {"error": str(e), "success": False}, "status": 422, "timings": timings}
+
+    except DeadlineExceeded as e:
+        return {"body": {"error": str(e), "success": False}, "status": 504, "timings": timings}
+
+    except Exception as e:
+        return {"body": {"error": str(e)}, "status": 500, "timings": timings}
+
+
+def analyze_file(prepared: dict, deadline_seconds: float) -> dict:
+    """Analysis thread: validation (AI for borderline files) and analysis"""
+    import app
+    from deadline import Deadline, DeadlineExceeded
+
+    started = time.perf_counter()
+    try:
+        body, status = app.analyze_extracted_upload(
+            prepared["filename"],
+            prepared["file_size"],
+            prepared["text"],
+            prepared["cache_key"],
+            Deadline(deadline_seconds),
+            verdict=prepared["verdict"],
+        )
+    except DeadlineExceeded as e:
+        body, status = {"error": str(e), "success": False}, 504
+    except Exception as e:
+        body, status = {"error": str(e)}, 500
+    timings = {**prepared["timings"], "analyze": time.perf_counter() - started}
+    return {"body": body, "status": status, "timings": timings}
+
+
+def is_final(result: dict) -> bool:
+    """Whether a file is done for good (checkpointed) or worth retrying"""
+    import app
+
+    if result["status"] >= 500:
+        return False
+    data = result["body"].get("data")
+    return not (result["status"] == 200 and data and app.is_fallback_analysis(data))
+
+
+class BulkRun:
+    """Output/checkpoint writer and the counters behind the summaries"""
+
+    def __init__(self, output: str, checkpoint: str):
+        self.output = open(output, "a", encoding="utf-8")
+        self.checkpoint = open(checkpoint, "a", encoding="utf-8")
+        self.started = time.monotonic()
+        self.done = 0
+        self.retryable = 0
+        self.statuses = {}
+        self.timings = {stage: [] for stage in STAGES}
+
+    def record(self, path: str, result: dict):
+        line = {**result["body"], "path": path, "status": result["status"]}
+        self.output.write(json.dumps(line) + "\n")
+        self.output.flush()
+        # The checkpoint is written after the output line: a crash in
+        # between re-analyzes the file instead of losing it
+        if is_final(result):
+            self.checkpoint.write(path + "\n")
+            self.checkpoint.flush()
+        else:
+            self.retryable += 1
+
+        self.done += 1
+        self.statuses[result["status"]] = self.statuses.get(result["status"], 0) + 1
+        for stage, seconds in result.get("timings", {}).items():
+            self.timings[stage].append(seconds)
+        if self.done % SYNC_EVERY == 0:
+            self.sync()
+            self.progress()
+
+    def sync(self):
+        for handle in (self.output, self.checkpoint):
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def close(self):
+        self.sync()
+        self.output.close()
+        self.checkpoint.close()
+
+    def progress(self):
+        elapsed = time.monotonic() - self.started
+        print(
+            f"📦 {self.done} files in {elapsed:.1f}s ({self.done / max(elapsed, 1e-9):.1f} files/s)",
+            file=sys.stderr,
+        )
+
+    def summary(self, skipped: int):
+        from circuit_breaker import percentile
+
+        elapsed = time.monotonic() - self.started
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        print(
+            f"\n✅ {self.done} files in {elapsed:.1f}s "
+            f"({self.done / max(elapsed, 1e-9):.2f} files/s), "
+            f"{skipped} skipped (checkpoint), {self.retryable} to retry",
+            file=sys.stderr,
+        )
+        print(f"   status codes: {statuses or 'none'}", file=sys.stderr)
+        print(
+            f"   {'stage':<9} {'files':>6} {'total s':>9} {'mean s':>8} {'p50 s':>7} {'p95 s':>7}",
+            file=sys.stderr,
+        )
+        for stage in STAGES:
+            values = self.timings[stage]
+            print(
+                f"   {stage:<9} {len(values):>6} {sum(values):>9.1f} "
+                f"{sum(values) / max(len(values), 1):>8.3f} "
+                f"{percentile(values, 0.5):>7.3f} {percentile(values, 0.95):>7.3f}",
+                file=sys.stderr,
+            )
+
+
+def run(args) -> int:
+    paths = iter_manifest(args.source) if args.manifest else iter_directory(args.source)
+    checkpoint = args.checkpoint or args.output + ".checkpoint"
+    finished = load_checkpoint(checkpoint)
+    if finished:
+        print(f"↩️ Resuming: {len(finished)} files already in {checkpoint}", file=sys.stderr)
+
+    # Import here, after JOB_WORKERS is set and before any worker starts
+    import app  # noqa: F401
+
+    bulk = BulkRun(args.output, checkpoint)
+    skipped = 0
+    extract_pool = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(args.quiet,),
+    )
+    analyze_pool = ThreadPoolExecutor(max_workers=args.concurrency)
+    extracting = {}
+    analyzing = {}
+    try:
+        paths = iter(paths)
+        exhausted = False
+        while True:
+            # Backpressure: stop reading paths while the analysis stage is full
+            while (
+                not exhausted
+                and len(extracting) < args.workers * EXTRACT_AHEAD
+                and len(analyzing) < args.concurrency * ANALYZE_AHEAD
+            ):
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                elif path in finished:
+                    skipped += 1
+                else:
+                    extracting[extract_pool.submit(prepare_file, path, args.deadline)] = path
+
+            if not extracting and not analyzing:
+                break
+
+            done, _ = wait(list(extracting) + list(analyzing), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in extracting:
+                    path = extracting.pop(future)
+                    try:
+                        prepared = future.result()
+                    except Exception as e:
+                        # The worker process died (e.g. a crashing extractor)
+                        bulk.record(path, {"body": {"error": str(e)}, "status": 500})
+                        continue
+                    if "body" in prepared:
+                        bulk.record(path, prepared)
+                    else:
+                        analyzing[analyze_pool.submit(analyze_file, prepared, args.deadline)] = path
+                else:
+                    bulk.record(analyzing.pop(future), future.result())
+
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrupted; run again with the same output to resume", file=sys.stderr)
+        for future in list(extracting) + list(analyzing):
+            future.cancel()
+        return 130
+
+    finally:
+        extract_pool.shutdown(wait=False, cancel_futures=True)
+        analyze_pool.shutdown(wait=False, cancel_futures=True)
+        bulk.close()
+        bulk.summary(skipped)
+
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="directory to walk, or a manifest with --manifest")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--manifest", action="store_true", help="source lists paths, one per line")
+    parser.add_argument("--checkpoint", help="default: <output>.checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="extraction processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="files in the Groq stage at once")
+    parser.add_argument("--deadline", type=float, default=120, help="seconds per file and stage")
+    parser.add_argument("--quiet", action="store_true", help="silence the pipeline's own logs")
+    args = parser.parse_args()
+
+    if args.quiet:
+        sys.stdout = open(os.devnull, "w")
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The dependency is failing; the call was not attempted"""
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by error rate and tail latency
+
+    Outcomes of the last `window` calls are kept. Once at least `min_calls`
+    are recorded, the breaker opens when the error rate reaches
+    `error_rate_threshold` or the p95 latency reaches `slow_call_seconds`.
+    After `open_seconds` it lets `half_open_max_calls` probes through;
+    `probe_successes` successful probes close it again, any failure reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 50,
+        min_calls: int = 10,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 20,
+        open_seconds: float = 30,
+        half_open_max_calls: int = 1,
+        probe_successes: int = 2,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.probe_successes = probe_successes
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.open_reason = ""
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self._outcomes = deque(maxlen=window)  # (ok, latency)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def _open(self, reason: str):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.open_reason = reason
+        self.times_opened += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        print(f"🔌 Circuit '{self.name}' OPEN: {reason}")
+
+    def available(self) -> bool:
+        """Whether a call could go through now (does not take a probe slot)"""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self.opened_at >= self.open_seconds
+            if self.state == HALF_OPEN:
+                return self._probes_in_flight < self.half_open_max_calls
+            return True
+
+    def allow(self) -> bool:
+        """Reserve permission for one call; pair with record_success/failure"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    self.rejected_calls += 1
+                    return False
+                self.state = HALF_OPEN
+                print(f"🔌 Circuit '{self.name}' HALF-OPEN: probing")
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    self.rejected_calls += 1
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def record_success(self, latency: float):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if latency >= self.slow_call_seconds:
+                    self._open(f"probe took {latency:.1f}s")
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.probe_successes:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                    print(f"🔌 Circuit '{self.name}' CLOSED: recovered")
+                return
+            self._outcomes.append((True, latency))
+            self._evaluate()
+
+    def record_failure(self, latency: float):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._open("probe failed")
+                return
+            self._outcomes.append((False, latency))
+            self._evaluate()
+
+    def _evaluate(self):
+        if self.state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        failures = sum(1 for ok, _ in self._outcomes if not ok)
+        error_rate = failures / len(self._outcomes)
+        p95 = percentile([latency for _, latency in self._outcomes], 0.95)
+        if error_rate >= self.error_rate_threshold:
+            self._open(f"error rate {error_rate:.0%} over last {len(self._outcomes)} calls")
+        elif p95 >= self.slow_call_seconds:
+            self._open(f"p95 latency {p95:.1f}s over last {len(self._outcomes)} calls")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = [latency for _, latency in self._outcomes]
+            failures = sum(1 for ok, _ in self._outcomes if not ok)
+            snapshot = {
+                "state": self.state,
+                "window_calls": len(self._outcomes),
+                "error_rate": round(failures / len(self._outcomes), 3) if self._outcomes else 0.0,
+                "latency_p50": round(percentile(latencies, 0.5), 3),
+                "latency_p95": round(percentile(latencies, 0.95), 3),
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected_calls,
+            }
+            if self.state != CLOSED:
+                snapshot["open_reason"] = self.open_reason
+                snapshot["seconds_open"] = round(time.monotonic() - self.opened_at, 1)
+            return snapshot
@@ -0,0 +1,77 @@
+import select
+import socket
+import time
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time or its client went away"""
+
+    def __init__(self, message: str, disconnected: bool = False):
+        super().__init__(message)
+        self.disconnected = disconnected
+
+
+class Deadline:
+    """Time budget for one request, shared by every stage of the pipeline"""
+
+    def __init__(self, seconds: float, is_disconnected=None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.is_disconnected = is_disconnected
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str = ""):
+        """Raise DeadlineExceeded if the budget is spent or the client left"""
+        where = f" during {stage}" if stage else ""
+        if self.is_disconnected is not None and self.is_disconnected():
+            raise DeadlineExceeded(f"Client disconnected{where}", disconnected=True)
+        if self.expired():
+            raise DeadlineExceeded(f"Request deadline of {self.seconds:g}s exceeded{where}")
+
+    def timeout(self, cap: float, reserve: float = 0, stage: str = "") -> float:
+        """Timeout for a stage: its own cap, bounded by the remaining budget
+
+        `reserve` keeps some budget back for later stages (e.g. the local
+        fallback after a Groq call).
+        """
+        self.check(stage)
+        available = self.remaining() - reserve
+        if available <= 0:
+            raise DeadlineExceeded(
+                f"Not enough time left for {stage or 'this stage'} "
+                f"({self.remaining():.1f}s of {self.seconds:g}s)"
+            )
+        return min(cap, available)
+
+
+def socket_disconnect_probe(environ: dict):
+    """Best-effort check whether the WSGI client closed its connection
+
+    Peeks at the client socket without blocking: an orderly close reads as
+    b"". Returns None when the server does not expose the socket.
+    """
+    sock = environ.get("gunicorn.socket") or environ.get("werkzeug.socket")
+    if sock is None:
+        return None
+
+    def is_disconnected() -> bool:
+        try:
+            # Readable with nothing to read means the peer closed; poll first
+            # so sockets with a timeout never block here
+            readable, _, _ = select.select([sock], [], [], 0)
+            if not readable:
+                return False
+            return sock.recv(1, socket.MSG_PEEK) == b""
+        except (BlockingIOError, InterruptedError):
+            return False
+        except ValueError:  # e.g. TLS sockets do not support MSG_PEEK
+            return False
+        except OSError:
+            return True
+
+    return is_disconnected
@@ -0,0 +1,109 @@
+import re
+
+import numpy as np
+
+# Positions of each signal in the feature vector
+LENGTH = 0
+RESUME_KEYWORDS = 1
+NON_RESUME_KEYWORDS = 2
+HAS_CONTACT = 3
+HAS_EXPERIENCE = 4
+HAS_EDUCATION = 5
+HAS_SKILLS = 6
+STRUCTURED_LINES = 7
+HAS_DATES = 8
+HAS_BULLETS = 9
+
+FEATURE_NAMES = (
+    "length",
+    "resume_keywords",
+    "non_resume_keywords",
+    "has_contact",
+    "has_experience",
+    "has_education",
+    "has_skills",
+    "structured_lines",
+    "has_dates",
+    "has_bullets",
+)
+
+# Per-feature weight and (min, max) cap of its score contribution
+FEATURE_WEIGHTS = np.array(
+    [1 / 500, 3, -5, 5, 10, 10, 5, 2, 5, 5], dtype=np.float64
+)
+FEATURE_CAPS_LOW = np.array([0, 0, -20, 0, 0, 0, 0, 0, 0, 0], dtype=np.float64)
+FEATURE_CAPS_HIGH = np.array([10, 30, 0, 5, 10, 10, 5, 10, 5, 5], dtype=np.float64)
+
+CONTACT_PATTERN = re.compile(
+    r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
+    r"|(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}"
+)
+
+# Section-style lines ("Skills:" or "Work Experience  Acme"), one match per
+# line. [^\S\n] keeps the whitespace class from running across line breaks.
+STRUCTURED_LINE_PATTERN = re.compile(
+    r"^[A-Z](?:[a-zA-Z]|[^\S\n])+(?::|[^\S\n]+[A-Z])", re.MULTILINE
+)
+
+DATE_PATTERN = re.compile(
+    r"\b(19|20)\d{2}\b"  # Years like 2020, 2019
+    r"|\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\b"  # Month Year
+    r"|\b\d{1,2}/\d{4}\b"  # MM/YYYY
+    r"|\b\d{4}\s*[-–]\s*(Present|Current|\d{4})\b",  # Date ranges
+    re.IGNORECASE,
+)
+
+BULLET_PATTERN = re.compile(r"•|[-*] ")
+
+
+class DocumentFeatures:
+    """Compute the strict validation signals of a document as a feature vector"""
+
+    def __init__(self, keyword_matcher):
+        self.keyword_matcher = keyword_matcher
+
+    def extract(self, text: str, keyword_hits: dict = None) -> np.ndarray:
+        """Build the feature vector for one document"""
+        if keyword_hits is None:
+            keyword_hits = self.keyword_matcher.scan(text)
+
+        features = np.zeros(len(FEATURE_NAMES), dtype=np.float64)
+        features[LENGTH] = len(text)
+        features[RESUME_KEYWORDS] = len(self.keyword_matcher.found(keyword_hits, "resume"))
+        features[NON_RESUME_KEYWORDS] = len(
+            self.keyword_matcher.found(keyword_hits, "non_resume")
+        )
+        features[HAS_CONTACT] = CONTACT_PATTERN.search(text) is not None
+        features[HAS_EXPERIENCE] = bool(keyword_hits["experience"])
+        features[HAS_EDUCATION] = bool(keyword_hits["education"])
+        features[HAS_SKILLS] = bool(keyword_hits["skills"])
+        features[STRUCTURED_LINES] = sum(1 for _ in STRUCTURED_LINE_PATTERN.finditer(text))
+        features[HAS_DATES] = DATE_PATTERN.search(text) is not None
+
+        bullet_counts = {"•": 0, "-": 0, "*": 0}
+        for match in BULLET_PATTERN.finditer(text):
+            bullet_counts[match.group(0)[0]] += 1
+        features[HAS_BULLETS] = max(bullet_counts.values()) > 2
+
+        return features
+
+    def extract_batch(self, texts) -> np.ndarray:
+        """Stack the feature vectors of many documents into one matrix"""
+        if not texts:
+            return np.zeros((0, len(FEATURE_NAMES)), dtype=np.float64)
+        return np.vstack([self.extract(text) for text in texts])
+
+    @staticmethod
+    def score_batch(features: np.ndarray) -> np.ndarray:
+        """Score a (documents x features) matrix in one vectorized step (0-100)"""
+        contributions = np.clip(
+            np.atleast_2d(features) * FEATURE_WEIGHTS,
+            FEATURE_CAPS_LOW,
+            FEATURE_CAPS_HIGH,
+        )
+        return np.maximum(contributions.sum(axis=1), 0)
+
+    @classmethod
+    def score(cls, features: np.ndarray) -> float:
+        """Score a single feature vector (0-100)"""
+        return float(cls.score_batch(features)[0])
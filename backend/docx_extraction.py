@@ -0,0 +1,94 @@
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+PARAGRAPH = W_NS + "p"
+TEXT = W_NS + "t"
+TAB = W_NS + "tab"
+BREAKS = {W_NS + "br", W_NS + "cr"}
+# Elements whose finished children can be dropped while parsing
+CONTAINERS = {W_NS + "body", W_NS + "hdr", W_NS + "ftr"}
+
+HEADER_PART = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PART = re.compile(r"^word/footer\d*\.xml$")
+
+
+def _part_order(name: str) -> int:
+    return int(re.sub(r"\D", "", name) or 0)
+
+
+def iter_part_paragraphs(part):
+    """Yield paragraph texts of one WordprocessingML part in document order
+
+    Paragraphs inside tables and text boxes are yielded like body paragraphs.
+    Elements are cleared as soon as they have been read, so memory stays flat
+    regardless of document size.
+    """
+    stack = []  # text buffers of open (possibly nested) paragraphs
+    fallback_depth = 0  # inside mc:Fallback, a duplicate of the mc:Choice content
+    container = None
+
+    for event, elem in ET.iterparse(part, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                continue
+            elif tag == PARAGRAPH:
+                stack.append([])
+            elif tag in CONTAINERS and container is None:
+                container = elem
+            continue
+
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+            elem.clear()
+            continue
+        if fallback_depth:
+            continue
+
+        if tag == TEXT and stack:
+            stack[-1].append(elem.text or "")
+        elif tag == TAB and stack:
+            stack[-1].append("\t")
+        elif tag in BREAKS and stack:
+            stack[-1].append("\n")
+        elif tag == PARAGRAPH and stack:
+            text = "".join(stack.pop())
+            if text.strip():
+                yield text
+
+        if not stack and container is not None and elem is not container:
+            # Outside any paragraph: everything parsed so far has been read
+            container.clear()
+
+
+def _docx_parts(archive: zipfile.ZipFile):
+    names = archive.namelist()
+    headers = sorted((n for n in names if HEADER_PART.match(n)), key=_part_order)
+    footers = sorted((n for n in names if FOOTER_PART.match(n)), key=_part_order)
+    # Headers usually carry the name and contact details, so they come first
+    return headers + ["word/document.xml"] + footers
+
+
+def iter_docx_text(source):
+    """Yield the paragraph texts of a DOCX (bytes, path or file object)"""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    with zipfile.ZipFile(source) as archive:
+        seen_header_footer = set()
+        for name in _docx_parts(archive):
+            with archive.open(name) as part:
+                for text in iter_part_paragraphs(part):
+                    # Headers and footers repeat per section; keep one copy
+                    if name != "word/document.xml":
+                        if text in seen_header_footer:
+                            continue
+                        seen_header_footer.add(text)
+                    yield text
@@ -0,0 +1,424 @@
+import asyncio
+import json
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import CircuitOpenError
+from deadline import DeadlineExceeded
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Budget a request deadline keeps back for the local fallback and the response
+DEADLINE_RESERVE = 1.0
+
+# Groq reports rate-limit resets as durations such as "2m59.56s", "7.66s" or "120ms"
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+
+
+def parse_duration(value: str):
+    """Seconds in a Groq reset duration, or None if it cannot be parsed"""
+    parts = DURATION_PART.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(value: str):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class BaseGroqClient:
+    """Retry policy, backoff and circuit breaking shared by the Groq clients
+
+    Subclasses do the I/O: they run `_retries` (sending each attempt, and
+    sleeping between them) inside `_admit` / `_record`.
+    """
+
+    # Transport errors of the subclass's HTTP library
+    TIMEOUT_ERRORS = ()
+    CONNECTION_ERRORS = ()
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8,
+        max_wait: float = 10,
+        breaker=None,
+        on_rate_limit=None,
+    ):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+        self.breaker = breaker
+        # Called with (model, seconds until the limit resets) on every 429
+        self.on_rate_limit = on_rate_limit
+
+        self.session = self._make_session(pool_size)
+
+    def _make_session(self, pool_size: int):
+        raise NotImplementedError
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": spread retries of concurrent workers apart
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def retry_delay(self, response, attempt: int) -> float:
+        """Seconds to wait before retrying, honoring the server's hints"""
+        delay = self._backoff(attempt)
+        if response is None:
+            return delay
+
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        if retry_after is not None:
+            return max(delay, retry_after)
+
+        # Only wait for a reset of the budget that is actually exhausted
+        for kind in ("requests", "tokens"):
+            if headers.get(f"x-ratelimit-remaining-{kind}") == "0":
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset is not None:
+                    delay = max(delay, reset)
+        return delay
+
+    def available(self) -> bool:
+        """False while the circuit breaker is open"""
+        return self.breaker is None or self.breaker.available()
+
+    def _admit(self, timeout: float, deadline=None):
+        """Before a call: enough of the deadline left and the breaker closed
+
+        Raises DeadlineExceeded or CircuitOpenError without calling Groq. A
+        call admitted here must report its outcome with `_record`.
+        """
+        if deadline is not None:
+            deadline.timeout(timeout, reserve=DEADLINE_RESERVE, stage="Groq call")
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError("Groq circuit breaker is open")
+
+    def _record(self, start: float, response):
+        """Report a call's outcome to the breaker, from a `finally`
+
+        No response means the call raised or was cancelled; like 429/5xx
+        responses that counts as a failure, and frees a half-open probe slot.
+        """
+        if self.breaker is None:
+            return
+        latency = time.monotonic() - start
+        if response is None or response.status_code in RETRY_STATUS_CODES:
+            self.breaker.record_failure(latency)
+        else:
+            self.breaker.record_success(latency)
+
+    def _retries(self, payload: dict, timeout: float, deadline=None, fallback_model: str = None):
+        """The retry loop of a chat completion POST, without the I/O
+
+        A generator of ("send", payload, timeout) and ("sleep", seconds)
+        steps. A "send" step is answered with the response, or its transport
+        error is thrown in; the final response is the return value.
+
+        Retries 429/5xx responses and connection errors. Read timeouts are not
+        retried since the caller has already spent the whole timeout waiting.
+        Gives up early when the server asks for a longer wait than max_wait,
+        or when the wait plus a retry would not fit in the deadline.
+        """
+        attempt = 0
+        while True:
+            attempt_timeout = timeout
+            if deadline is not None:
+                attempt_timeout = min(timeout, deadline.remaining() - DEADLINE_RESERVE)
+
+            try:
+                response = yield "send", payload, attempt_timeout
+            except self.TIMEOUT_ERRORS:
+                if attempt_timeout < timeout:
+                    raise DeadlineExceeded(
+                        f"Request deadline of {deadline.seconds:g}s exceeded during Groq call"
+                    )
+                raise
+            except self.CONNECTION_ERRORS:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_delay(None, attempt)
+                if not self._fits_deadline(delay, deadline):
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    if response.status_code == 429:
+                        self._rate_limited(payload, response, attempt)
+                    return response
+                delay = self.retry_delay(response, attempt)
+                if response.status_code == 429:
+                    self._rate_limited(payload, response, attempt, delay)
+                    if fallback_model and payload.get("model") != fallback_model:
+                        print(f"🔀 {payload.get('model')} rate-limited, retrying on {fallback_model}")
+                        response.close()
+                        payload = {**payload, "model": fallback_model}
+                        attempt += 1
+                        continue
+                if delay > self.max_wait:
+                    print(f"⏳ Groq asked to wait {delay:.1f}s, not retrying")
+                    return response
+                if not self._fits_deadline(delay, deadline):
+                    print(f"⏳ No time left in the request deadline to retry in {delay:.1f}s")
+                    return response
+                response.close()  # hand a streamed connection back to the pool
+                print(
+                    f"🔁 Groq returned {response.status_code}, retrying in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+
+            yield "sleep", delay
+            attempt += 1
+
+    def _rate_limited(self, payload: dict, response, attempt: int, delay: float = None):
+        if self.on_rate_limit is None:
+            return
+        if delay is None:
+            delay = self.retry_delay(response, attempt)
+        self.on_rate_limit(payload.get("model"), delay)
+
+    @staticmethod
+    def _fits_deadline(delay: float, deadline) -> bool:
+        # A retry needs the wait plus at least a second for the call itself
+        return deadline is None or delay + 1.0 < deadline.remaining() - DEADLINE_RESERVE
+
+
+class GroqClient(BaseGroqClient):
+    """Shared keep-alive Groq client with jittered exponential backoff"""
+
+    TIMEOUT_ERRORS = (requests.ReadTimeout,)
+    CONNECTION_ERRORS = (requests.ConnectionError,)
+
+    def _make_session(self, pool_size: int):
+        # One pool per process, sized to the number of concurrent request
+        # threads so every in-flight call reuses a warm TLS connection
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0),
+        )
+        session.headers.update(self._headers())
+        return session
+
+    def post(
+        self,
+        payload: dict,
+        timeout: float = 30,
+        deadline=None,
+        stream: bool = False,
+        fallback_model: str = None,
+    ) -> requests.Response:
+        """POST a chat completion through the circuit breaker
+
+        Raises CircuitOpenError without calling Groq while the breaker is
+        open. 429/5xx responses and exceptions count as failures. With a
+        request `deadline`, raises DeadlineExceeded up front when too little
+        of it is left, and never waits or retries past it. With a
+        `fallback_model`, a 429 is retried on that model right away instead
+        of waiting for the limit to reset.
+        """
+        self._admit(timeout, deadline)
+        start = time.monotonic()
+        response = None
+        try:
+            response = self._post_with_retries(
+                payload, timeout, deadline, stream, fallback_model
+            )
+            return response
+        finally:
+            self._record(start, response)
+
+    def _post_with_retries(
+        self,
+        payload: dict,
+        timeout: float,
+        deadline=None,
+        stream: bool = False,
+        fallback_model: str = None,
+    ) -> requests.Response:
+        """Run `_retries` on the requests session; returns the final response"""
+        steps = self._retries(payload, timeout, deadline, fallback_model)
+        try:
+            step = next(steps)
+            while True:
+                if step[0] == "sleep":
+                    time.sleep(step[1])
+                    step = next(steps)
+                    continue
+                _, payload, attempt_timeout = step
+                try:
+                    response = self.session.post(
+                        self.api_url, json=payload, timeout=attempt_timeout, stream=stream
+                    )
+                except Exception as e:
+                    step = steps.throw(e)
+                else:
+                    step = steps.send(response)
+        except StopIteration as done:
+            return done.value
+
+    def stream(
+        self, payload: dict, timeout: float = 30, deadline=None, fallback_model: str = None
+    ):
+        """Stream a chat completion, yielding content deltas as they arrive
+
+        Retries, model fallback and the circuit breaker apply until the
+        response headers arrive. `timeout` bounds each read, not the whole
+        generation.
+        """
+        response = self.post(
+            {**payload, "stream": True},
+            timeout,
+            deadline,
+            stream=True,
+            fallback_model=fallback_model,
+        )
+        with response:
+            if response.status_code != 200:
+                raise Exception(f"API error: {response.status_code} - {response.text}")
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("error"):
+                    raise Exception(f"Stream error: {chunk['error']}")
+                for choice in chunk.get("choices", []):
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+
+
+class AsyncResponse:
+    """A fully read aiohttp response, with the requests.Response attributes
+    the Groq callers use"""
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        """Nothing to release: the body was read and the connection returned"""
+
+
+class AsyncGroqClient(BaseGroqClient):
+    """Groq client for the ASGI app, on a shared aiohttp session
+
+    Same retries, rate-limit fallback, circuit breaker and deadline handling
+    as GroqClient, but waiting on Groq (or on a backoff) suspends a coroutine
+    instead of holding a worker thread. `pool_size` caps the concurrent
+    connections; calls beyond it wait for a free connection within their
+    timeout. Completions are not streamed.
+    """
+
+    # aiohttp's read timeouts are also ClientErrors: TIMEOUT_ERRORS match first
+    TIMEOUT_ERRORS = (asyncio.TimeoutError,)
+    CONNECTION_ERRORS = (aiohttp.ClientError,)
+
+    def _make_session(self, pool_size: int):
+        # aiohttp sessions belong to an event loop: created on first use
+        self.pool_size = pool_size
+        return None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=self._headers(),
+                connector=aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size),
+            )
+        return self.session
+
+    async def aclose(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def post(
+        self,
+        payload: dict,
+        timeout: float = 30,
+        deadline=None,
+        fallback_model: str = None,
+    ) -> AsyncResponse:
+        """POST a chat completion through the circuit breaker (see GroqClient.post)"""
+        self._admit(timeout, deadline)
+        start = time.monotonic()
+        response = None
+        try:
+            response = await self._post_with_retries(payload, timeout, deadline, fallback_model)
+            return response
+        finally:
+            # Also on cancellation, which is not an Exception
+            self._record(start, response)
+
+    async def _send(self, payload: dict, timeout: float) -> AsyncResponse:
+        # Like requests' timeout: bounds getting a connection and each read
+        client_timeout = aiohttp.ClientTimeout(total=None, connect=timeout, sock_read=timeout)
+        async with self._get_session().post(
+            self.api_url, json=payload, timeout=client_timeout
+        ) as response:
+            return AsyncResponse(response.status, response.headers, await response.read())
+
+    async def _post_with_retries(
+        self, payload: dict, timeout: float, deadline=None, fallback_model: str = None
+    ) -> AsyncResponse:
+        """Run `_retries` on the aiohttp session; returns the final response"""
+        steps = self._retries(payload, timeout, deadline, fallback_model)
+        try:
+            step = next(steps)
+            while True:
+                if step[0] == "sleep":
+                    await asyncio.sleep(step[1])
+                    step = next(steps)
+                    continue
+                _, payload, attempt_timeout = step
+                try:
+                    response = await self._send(payload, attempt_timeout)
+                except Exception as e:
+                    step = steps.throw(e)
+                else:
+                    step = steps.send(response)
+        except StopIteration as done:
+            return done.value
@@ -0,0 +1,267 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobStore:
+    """Durable analysis job queue in SQLite (WAL), shared by every worker
+    process on the host
+
+    A job keeps its input until it finishes, so queued work survives
+    restarts. A running job whose lease expires (its worker died) is claimed
+    again, up to max_attempts.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+        retention_seconds: float = 24 * 3600,
+        poll_seconds: float = 0.5,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self.poll_seconds = poll_seconds
+        self._local = threading.local()
+        # Wakes long-polls in this process; other processes are polled
+        self._finished = threading.Condition()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                filename TEXT,
+                payload BLOB,
+                status_code INTEGER,
+                result TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                lease_until REAL,
+                finished_at REAL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at)")
+
+    def _connect(self):
+        # One connection per thread; WAL lets workers read while one writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, kind: str, payload: bytes, filename: str = None) -> str:
+        """Queue a job ("file" bytes or "text") and return its id"""
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, kind, filename, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, QUEUED, kind, filename, payload, time.time()),
+        )
+        return job_id
+
+    def claim(self):
+        """Take the oldest runnable job (with its payload), or None"""
+        conn = self._connect()
+        while True:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    """SELECT id, kind, filename, payload, attempts FROM jobs
+                    WHERE status = ? OR (status = ? AND lease_until < ?)
+                    ORDER BY created_at LIMIT 1""",
+                    (QUEUED, RUNNING, now),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                job_id, kind, filename, payload, attempts = row
+                if attempts >= self.max_attempts:
+                    # Its worker died on every attempt: give up on it
+                    self._finish(
+                        conn,
+                        job_id,
+                        500,
+                        {"error": f"Job failed after {attempts} attempts", "success": False},
+                        now,
+                    )
+                    conn.execute("COMMIT")
+                    self._notify()
+                    continue
+
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = ?, started_at = ?, lease_until = ? WHERE id = ?",
+                    (RUNNING, attempts + 1, now, now + self.lease_seconds, job_id),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return {
+                "id": job_id,
+                "kind": kind,
+                "filename": filename,
+                "payload": payload,
+                "attempt": attempts + 1,
+            }
+
+    def finish(self, job_id: str, status_code: int, body: dict):
+        """Store a job's response; 5xx responses mark it failed"""
+        now = time.time()
+        conn = self._connect()
+        self._finish(conn, job_id, status_code, body, now)
+        conn.execute(
+            "DELETE FROM jobs WHERE finished_at < ?", (now - self.retention_seconds,)
+        )
+        self._notify()
+
+    def _finish(self, conn, job_id: str, status_code: int, body: dict, now: float):
+        # The input is dropped: only the result is kept for retrieval
+        conn.execute(
+            """UPDATE jobs SET status = ?, status_code = ?, result = ?, payload = NULL,
+            lease_until = NULL, finished_at = ? WHERE id = ?""",
+            (
+                FAILED if status_code >= 500 else DONE,
+                status_code,
+                json.dumps(body),
+                now,
+                job_id,
+            ),
+        )
+
+    def _notify(self):
+        with self._finished:
+            self._finished.notify_all()
+
+    def get(self, job_id: str):
+        """Job status and result (without its payload), or None"""
+        row = (
+            self._connect()
+            .execute(
+                """SELECT id, status, filename, status_code, result, attempts,
+                created_at, started_at, finished_at FROM jobs WHERE id = ?""",
+                (job_id,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        job_id, status, filename, status_code, result, attempts, created, started, finished = row
+        return {
+            "id": job_id,
+            "status": status,
+            "filename": filename,
+            "status_code": status_code,
+            "result": json.loads(result) if result is not None else None,
+            "attempts": attempts,
+            "created_at": created,
+            "started_at": started,
+            "finished_at": finished,
+        }
+
+    def wait(self, job_id: str, timeout: float):
+        """get(), waiting up to timeout seconds for the job to finish"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in (DONE, FAILED) or remaining <= 0:
+                return job
+            with self._finished:
+                self._finished.wait(min(remaining, self.poll_seconds))
+
+    def counts(self) -> dict:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for status, count in self._connect().execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ):
+            counts[status] = count
+        return counts
+
+
+class JobWorkers:
+    """Background threads that run queued jobs through `handler`
+
+    handler(job) returns (response body, status code). At most `workers`
+    jobs run at once in each process, so an upload burst becomes a queue
+    instead of as many simultaneous Groq calls.
+    """
+
+    def __init__(self, store: JobStore, handler, workers: int = 4, poll_seconds: float = 1.0):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        """Start the threads once per process (gunicorn workers fork after import)
+
+        Does nothing in multiprocessing children (e.g. PDF extraction
+        workers), which re-import the app but serve no jobs.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if (
+                self._pid == os.getpid()
+                or self.workers <= 0
+                or multiprocessing.parent_process() is not None
+            ):
+                return
+            self._pid = os.getpid()
+            for index in range(self.workers):
+                threading.Thread(target=self._run, name=f"job-worker-{index}", daemon=True).start()
+
+    def notify(self):
+        """A job was submitted in this process: wake an idle worker"""
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            try:
+                job = self.store.claim()
+            except Exception as e:
+                print(f"⚠️ Job queue error: {str(e)}")
+                job = None
+            if job is None:
+                # Jobs submitted by other processes are picked up by polling
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+
+            print(f"🧾 Running job {job['id']} (attempt {job['attempt']})")
+            try:
+                body, status_code = self.handler(job)
+            except Exception as e:
+                print(f"Job error: {str(e)}")
+                traceback.print_exc()
+                body, status_code = {"error": str(e)}, 500
+            try:
+                self.store.finish(job["id"], status_code, body)
+            except Exception as e:
+                print(f"⚠️ Could not store the result of job {job['id']}: {str(e)}")
@@ -0,0 +1,97 @@
+from collections import deque
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher that finds keywords from several lists in one pass"""
+
+    def __init__(self, keyword_groups: dict):
+        # keyword_groups maps a group name to its list of keywords. The same
+        # keyword may appear in several groups (or twice in one list).
+        self.groups = {name: list(keywords) for name, keywords in keyword_groups.items()}
+
+        self.keywords = []
+        keyword_index = {}
+        for keywords in self.groups.values():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword and keyword not in keyword_index:
+                    keyword_index[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+
+        self.keyword_groups = [set() for _ in self.keywords]
+        for name, keywords in self.groups.items():
+            for keyword in keywords:
+                if keyword:
+                    self.keyword_groups[keyword_index[keyword.lower()]].add(name)
+
+        self._build()
+
+    def _build(self):
+        """Build the trie, failure links and a full transition table"""
+        goto = [{}]
+        outputs = [[]]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword_id)
+
+        # Breadth-first pass resolves failure links so every state knows where
+        # to continue on any character seen in the keyword alphabet.
+        fail = [0] * len(goto)
+        delta = [dict(transitions) for transitions in goto]
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, fallback in delta[fail[state]].items():
+                if ch not in goto[state]:
+                    delta[state][ch] = fallback
+            for ch, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(ch, 0)
+                queue.append(next_state)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def find_all(self, text: str):
+        """Yield (start, keyword_id) for every keyword occurrence in lowercase text"""
+        delta = self._delta
+        outputs = self._outputs
+        keywords = self.keywords
+        state = 0
+
+        for i, ch in enumerate(text):
+            # Characters outside the keyword alphabet always restart at the root
+            state = delta[state].get(ch, 0)
+            out = outputs[state]
+            if out:
+                end = i + 1
+                for keyword_id in out:
+                    yield end - len(keywords[keyword_id]), keyword_id
+
+    def scan(self, text: str) -> dict:
+        """Return {group: {keyword: [positions]}} for every hit in one pass"""
+        hits = {name: {} for name in self.groups}
+        keywords = self.keywords
+        keyword_groups = self.keyword_groups
+
+        for start, keyword_id in self.find_all(text.lower()):
+            keyword = keywords[keyword_id]
+            for name in keyword_groups[keyword_id]:
+                hits[name].setdefault(keyword, []).append(start)
+
+        return hits
+
+    def found(self, hits: dict, group: str) -> list:
+        """Keywords of a group that were hit, in the group's original order"""
+        group_hits = hits[group]
+        return [keyword for keyword in self.groups[group] if keyword.lower() in group_hits]
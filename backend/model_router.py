@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import deque
+
+from circuit_breaker import percentile
+from resume_sections import split_sections
+
+
+class ModelRouter:
+    """Route Groq calls between a fast and a large model
+
+    Simple, well-structured resumes and validation-only checks go to the
+    fast model; complex documents keep the large one. While the large model
+    is rate-limited, its calls are downgraded to the fast model. Latency and
+    fallback rate are tracked per route ("<task>:<fast|large|downgraded>").
+    """
+
+    def __init__(
+        self,
+        fast_model: str,
+        large_model: str,
+        simple_max_chars: int = 3500,
+        simple_min_sections: int = 3,
+        simple_min_score: float = 70,
+        downgrade_seconds: float = 30,
+        window: int = 200,
+    ):
+        self.fast_model = fast_model
+        self.large_model = large_model
+        self.simple_max_chars = simple_max_chars
+        self.simple_min_sections = simple_min_sections
+        self.simple_min_score = simple_min_score
+        self.downgrade_seconds = downgrade_seconds
+        self.window = window
+
+        self.rate_limited_until = {}
+        self.downgrades = 0
+        self._routes = {}  # route -> deque of (fallback, latency)
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def is_complex(self, text: str, score: float = None) -> bool:
+        """Local complexity estimate: long, loosely structured or low-scoring"""
+        if len(text) > self.simple_max_chars:
+            return True
+        if score is not None and score < self.simple_min_score:
+            return True
+        sections = split_sections(text).keys() - {"header"}
+        return len(sections) < self.simple_min_sections
+
+    def rate_limited(self, model: str) -> bool:
+        with self._lock:
+            return time.monotonic() < self.rate_limited_until.get(model, 0)
+
+    def route(self, task: str, complex_document: bool = True) -> tuple:
+        """(route name, model) for one call"""
+        if not complex_document:
+            return f"{task}:fast", self.fast_model
+        if self.rate_limited(self.large_model):
+            return f"{task}:downgraded", self.fast_model
+        return f"{task}:large", self.large_model
+
+    def fallback_model(self, model: str):
+        """Model to switch to when `model` is rate-limited, if any"""
+        return self.fast_model if model == self.large_model else None
+
+    def record_rate_limit(self, model: str, seconds: float = None):
+        """Groq answered 429 for `model`: downgrade its calls for a while"""
+        seconds = max(seconds or 0, self.downgrade_seconds)
+        with self._lock:
+            self.rate_limited_until[model] = time.monotonic() + seconds
+            self.downgrades += 1
+        print(f"🔀 {model} is rate-limited, downgrading for {seconds:.0f}s")
+
+    def record(self, route: str, latency: float, fallback: bool = False):
+        """Outcome of one call; fallback means it failed and a local result was used"""
+        with self._lock:
+            outcomes = self._routes.get(route)
+            if outcomes is None:
+                outcomes = self._routes[route] = deque(maxlen=self.window)
+            outcomes.append((fallback, latency))
+            self._calls[route] = self._calls.get(route, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {}
+            for route, outcomes in sorted(self._routes.items()):
+                latencies = [latency for _, latency in outcomes]
+                fallbacks = sum(1 for fallback, _ in outcomes if fallback)
+                routes[route] = {
+                    "calls": self._calls[route],
+                    "fallback_rate": round(fallbacks / len(outcomes), 3),
+                    "latency_p50": round(percentile(latencies, 0.5), 3),
+                    "latency_p95": round(percentile(latencies, 0.95), 3),
+                }
+            now = time.monotonic()
+            return {
+                "fast_model": self.fast_model,
+                "large_model": self.large_model,
+                "rate_limited": sorted(
+                    model for model, until in self.rate_limited_until.items() if until > now
+                ),
+                "downgrades": self.downgrades,
+                "routes": routes,
+            }
@@ -0,0 +1,246 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import pdfplumber
+
+
+def _open_source(source):
+    """A PDF source is either a file path or the document bytes"""
+    return source if isinstance(source, str) else io.BytesIO(source)
+
+
+def _count_pages(source, check=None) -> int:
+    """Worker: number of pages in the PDF, once check(source) has passed"""
+    if check is not None:
+        check(source)
+    with pdfplumber.open(_open_source(source)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_page_range(source, start: int, end: int) -> list:
+    """Worker: text of pages [start, end), one entry per page"""
+    texts = []
+    with pdfplumber.open(_open_source(source), pages=list(range(start + 1, end + 1))) as pdf:
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+    return texts
+
+
+class PDFExtractionTimeout(Exception):
+    """Extraction did not finish within its timeout"""
+
+
+class _Job:
+    """A submitted page-count or page-range job and the pool running it"""
+
+    __slots__ = ("fn", "args", "future", "executor", "submitted_at")
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+
+
+class PDFExtractionService:
+    """Runs pdfplumber in a managed process pool so request threads only wait on futures
+
+    A job still running `timeout` seconds after it was submitted is treated
+    as stuck: its pool is retired. New work goes to a fresh pool while jobs
+    already submitted to the old one (other requests') run to completion,
+    then the old pool's processes are terminated; their jobs that had not
+    started yet are moved to the new pool. A request that gives up earlier
+    (its own deadline) just abandons its jobs.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        pages_per_job: int = 2,
+        jobs_ahead: int = None,
+        timeout: float = 20,
+        max_tasks_per_child: int = 50,
+    ):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.pages_per_job = pages_per_job
+        self.jobs_ahead = jobs_ahead or 2
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor = None
+        # Unfinished futures of each pool, live or retired
+        self._outstanding = {}
+        # Other requests' futures lost when a retired pool was terminated
+        self._evicted = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created lazily so gunicorn workers do not inherit a pool from the master
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+                self._outstanding[self._executor] = set()
+            return self._executor
+
+    def _submit(self, job: _Job) -> _Job:
+        """Run a job on the live pool"""
+        while True:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(job.fn, *job.args)
+            except BrokenProcessPool:
+                # A worker of this pool died earlier: replace the pool
+                self._retire(executor)
+                continue
+            except RuntimeError:
+                # Retired between _get_executor and submit: use its successor
+                with self._lock:
+                    if self._executor is executor:
+                        raise
+                continue
+            with self._lock:
+                outstanding = self._outstanding.get(executor)
+                if outstanding is not None:
+                    outstanding.add(future)
+            future.add_done_callback(lambda done: self._forget(executor, done))
+            job.future, job.executor, job.submitted_at = future, executor, time.monotonic()
+            return job
+
+    def _result(self, job: _Job, deadline: float):
+        while True:
+            try:
+                return job.future.result(timeout=max(deadline - time.monotonic(), 0))
+            except CancelledError:
+                # It was queued on a pool retired meanwhile: run it on the new one
+                self._submit(job)
+            except BrokenProcessPool:
+                with self._lock:
+                    evicted = job.future in self._evicted
+                    self._evicted.discard(job.future)
+                if not evicted:
+                    raise
+                self._submit(job)
+
+    def _forget(self, executor, future):
+        with self._lock:
+            outstanding = self._outstanding.get(executor)
+            if outstanding is not None:
+                outstanding.discard(future)
+
+    def _retire(self, executor, stuck=()):
+        """Stop sending work to a pool; terminate it once others' jobs finish"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            outstanding = self._outstanding.pop(executor, None)
+        if outstanding is None:
+            return  # already retired
+        # shutdown() drops the process table; keep it to terminate them later
+        processes = executor._processes
+        executor.shutdown(wait=False)
+        others = outstanding - set(stuck)
+        # Jobs still queued behind the stuck one move to the new pool
+        # (_result resubmits them); running ones are left to finish
+        for future in others:
+            future.cancel()
+        threading.Thread(
+            target=self._reap, args=(processes, others), name="pdf-pool-reaper", daemon=True
+        ).start()
+
+    def _reap(self, processes, others):
+        # Other requests' jobs get up to the usual timeout to finish; any
+        # still unfinished (e.g. waiting in the pool's call queue behind the
+        # stuck job) are rerun on the new pool
+        _, unfinished = wait(others, timeout=self.timeout)
+        with self._lock:
+            self._evicted.update(unfinished)
+        for process in list((processes or {}).values()):
+            if process.is_alive():
+                process.terminate()
+
+    def _watch(self, job: _Job):
+        """Retire the pool if an abandoned job is still running at its timeout"""
+        future = job.future
+        timer = threading.Timer(
+            max(self.timeout - (time.monotonic() - job.submitted_at), 0),
+            lambda: future.done() or self._retire(job.executor, stuck=[future]),
+        )
+        timer.daemon = True
+        future.add_done_callback(lambda done: timer.cancel())
+        timer.start()
+
+    def iter_pages(
+        self, source, max_chars: int = None, timeout: float = None, check=None
+    ):
+        """Yield page texts in order, stopping once max_chars have been produced
+
+        source is a file path (workers open it themselves) or the PDF bytes.
+        Page ranges are submitted lazily, at most jobs_ahead at a time, so
+        pages past the budget are never parsed. check (picklable) runs in a
+        worker first and may raise to reject the document.
+        """
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        pending = deque()
+        try:
+            pending.append(self._submit(_Job(_count_pages, (source, check))))
+            page_count = self._result(pending[0], deadline)
+            pending.popleft()
+            ranges = (
+                (start, min(start + self.pages_per_job, page_count))
+                for start in range(0, page_count, self.pages_per_job)
+            )
+
+            def submit_next():
+                page_range = next(ranges, None)
+                if page_range is not None:
+                    pending.append(
+                        self._submit(_Job(_extract_page_range, (source, *page_range)))
+                    )
+
+            for _ in range(self.jobs_ahead):
+                submit_next()
+
+            produced = 0
+            while pending:
+                page_texts = self._result(pending[0], deadline)
+                pending.popleft()
+                submit_next()
+                for text in page_texts:
+                    yield text
+                    produced += len(text)
+                    if max_chars and produced >= max_chars:
+                        return
+        except TimeoutError:
+            raise PDFExtractionTimeout(f"PDF extraction timed out after {timeout}s")
+        except BrokenProcessPool:
+            # A worker died: that pool fails all its jobs anyway
+            self._retire(pending[0].executor)
+            raise Exception("PDF extraction worker crashed")
+        finally:
+            # Early exit, timeout or an abandoned generator: drop work not yet
+            # started and leave running jobs to finish (or be found stuck)
+            for job in pending:
+                if not job.future.cancel() and not job.future.done():
+                    self._watch(job)
+
+    def extract(self, source, max_chars: int = None, timeout: float = None) -> str:
+        """Extract page texts (up to max_chars, whole pages) as one string"""
+        return "\n".join(
+            text for text in self.iter_pages(source, max_chars, timeout) if text
+        ).strip()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._outstanding.pop(executor, None)
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
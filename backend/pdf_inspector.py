@@ -0,0 +1,306 @@
+import mmap
+import re
+import threading
+import zlib
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # installed with pdfplumber, but only needed for the text-layer probe
+    pdfium = None
+
+OBJECT_PATTERN = re.compile(rb"\d+\s+\d+\s+obj\b")
+PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+PAGE_COUNT_PATTERN = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b")
+STREAM_PATTERN = re.compile(rb"(?<!end)stream\r?\n")
+LENGTH_PATTERN = re.compile(rb"/Length\s+(\d+)(\s+\d+\s+R)?")
+IMAGE_PATTERN = re.compile(rb"/Subtype\s*/Image\b")
+FLATE_PATTERN = re.compile(rb"/FlateDecode\b")
+OBJECT_STREAM_PATTERN = re.compile(rb"/Type\s*/ObjStm\b")
+FONT_PATTERN = re.compile(rb"/Font\b")
+# Streams that are not page content: embedded font programs (/Length1-3, or
+# a /Subtype such as /Type1C), object and xref streams, XMP metadata
+NON_CONTENT_PATTERN = re.compile(
+    rb"/Length[123]\b|/Subtype\s*/(?!Form\b)|/Type\s*/(?:ObjStm|XRef|Metadata)\b"
+)
+
+# How far back from a "stream" keyword to look for its dictionary
+DICT_WINDOW = 2048
+# Output probed per Flate stream to estimate its expansion ratio
+INFLATE_PROBE_BYTES = 256 * 1024
+
+
+# PDFium is not thread-safe. The probe runs in the PDF extraction workers
+# (check_text_layer), one job per process, so this lock is uncontended there;
+# request threads only take it to count pages the scan could not find
+_pdfium_lock = threading.Lock()
+
+
+class PDFRejectedError(Exception):
+    """The PDF is too expensive (or malicious) to parse"""
+
+
+class ScannedPDFError(PDFRejectedError):
+    """The PDF has no text layer (scanned or image-only)"""
+
+
+def _stream_dict(data, stream_start: int) -> bytes:
+    window_start = max(0, stream_start - DICT_WINDOW)
+    window = data[window_start:stream_start]
+    obj_match = None
+    for obj_match in OBJECT_PATTERN.finditer(window):
+        pass
+    return window[obj_match.end() :] if obj_match else window
+
+
+def _probe_inflated_size(raw: bytes) -> tuple:
+    """Estimate the inflated size of a Flate stream without fully inflating it"""
+    inflater = zlib.decompressobj()
+    try:
+        out = inflater.decompress(raw, INFLATE_PROBE_BYTES)
+    except zlib.error:
+        return 0, 0.0
+    consumed = len(raw) - len(inflater.unconsumed_tail)
+    if consumed <= 0:
+        return len(out), 0.0
+    ratio = len(out) / consumed
+    if inflater.unconsumed_tail:
+        return int(ratio * len(raw)), ratio
+    return len(out), ratio
+
+
+def scan_pdf(data) -> dict:
+    """Cheap structural scan of raw PDF bytes (no object parsing)
+
+    "inflated_content_bytes" counts page content only, which is what
+    pdfplumber interprets; "inflated_bytes" adds fonts, object streams and
+    the like, for spotting compression bombs.
+    """
+    stats = {
+        "size": len(data),
+        "pages": 0,
+        "objects": sum(1 for _ in OBJECT_PATTERN.finditer(data)),
+        "object_streams": sum(1 for _ in OBJECT_STREAM_PATTERN.finditer(data)),
+        "fonts": sum(1 for _ in FONT_PATTERN.finditer(data)),
+        "streams": 0,
+        "content_bytes": 0,
+        "inflated_content_bytes": 0,
+        "inflated_bytes": 0,
+        "images": 0,
+        "image_bytes": 0,
+        "max_inflate_ratio": 0.0,
+    }
+
+    declared_pages = [
+        int(a or b) for a, b in PAGE_COUNT_PATTERN.findall(data)
+    ]
+    stats["pages"] = max(declared_pages) if declared_pages else sum(
+        1 for _ in PAGE_PATTERN.finditer(data)
+    )
+
+    for match in STREAM_PATTERN.finditer(data):
+        start = match.end()
+        header = _stream_dict(data, match.start())
+        if not header.rstrip().endswith(b">>"):
+            continue  # "stream" inside some other token, not a stream body
+        length_match = LENGTH_PATTERN.search(header)
+        if length_match and not length_match.group(2):
+            length = int(length_match.group(1))
+        else:
+            end = data.find(b"endstream", start)
+            length = (end if end != -1 else len(data)) - start
+        length = max(0, min(length, len(data) - start))
+
+        stats["streams"] += 1
+        if IMAGE_PATTERN.search(header):
+            stats["images"] += 1
+            stats["image_bytes"] += length
+            continue
+
+        if FLATE_PATTERN.search(header):
+            inflated, ratio = _probe_inflated_size(data[start : start + length])
+            stats["max_inflate_ratio"] = max(stats["max_inflate_ratio"], ratio)
+        else:
+            inflated = length
+        stats["inflated_bytes"] += inflated
+        if not NON_CONTENT_PATTERN.search(header):
+            stats["content_bytes"] += length
+            stats["inflated_content_bytes"] += inflated
+
+    stats["max_inflate_ratio"] = round(stats["max_inflate_ratio"], 1)
+    return stats
+
+
+def _load_pdf_bytes(source):
+    return source if isinstance(source, str) else bytes(source)
+
+
+def _pdfium_page_count(source) -> int:
+    """Page count from the document catalog, for page trees hidden in object
+    streams (opening the document does not load any page)"""
+    if pdfium is None:
+        return 0
+    with _pdfium_lock:
+        try:
+            pdf = pdfium.PdfDocument(_load_pdf_bytes(source))
+        except Exception:
+            return 0  # pdfplumber reports the real parsing error
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def probe_text_layer(source, max_pages: int = 2, min_chars: int = 20) -> dict:
+    """Look for a text layer on the first pages with PDFium (fast, native)
+
+    A page counts as scanned when it has (almost) no text characters and an
+    image covering most of it.
+    """
+    result = {"checked_pages": 0, "chars": 0, "image_pages": 0, "has_text_layer": True}
+    if pdfium is None:
+        return result
+
+    with _pdfium_lock:
+        try:
+            pdf = pdfium.PdfDocument(_load_pdf_bytes(source))
+        except Exception:
+            return result  # let pdfplumber report the real parsing error
+        try:
+            for index in range(min(max_pages, len(pdf))):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                result["chars"] += textpage.count_chars()
+                textpage.close()
+
+                width, height = page.get_size()
+                for obj in page.get_objects(max_depth=1):
+                    if obj.type != pdfium.raw.FPDF_PAGEOBJ_IMAGE:
+                        continue
+                    get_bounds = getattr(obj, "get_bounds", None) or obj.get_pos
+                    left, bottom, right, top = get_bounds()
+                    if (right - left) * (top - bottom) >= 0.5 * width * height:
+                        result["image_pages"] += 1
+                        break
+                page.close()
+                result["checked_pages"] += 1
+        finally:
+            pdf.close()
+
+    result["has_text_layer"] = not (
+        result["checked_pages"]
+        and result["chars"] < min_chars
+        and result["image_pages"] == result["checked_pages"]
+    )
+    return result
+
+
+def detect_scanned_pdf(source, stats: dict) -> str:
+    """Return a reason when the PDF has no text layer, otherwise an empty string"""
+    # Text cannot be drawn without a font; only conclusive when no object
+    # streams could be hiding the font dictionaries
+    if stats["fonts"] == 0 and stats["object_streams"] == 0 and stats["images"]:
+        return "no fonts or text in the document, only images"
+
+    probe = probe_text_layer(source)
+    if not probe["has_text_layer"]:
+        return (
+            f"the first {probe['checked_pages']} page(s) contain only images "
+            f"({probe['chars']} text characters)"
+        )
+    return ""
+
+
+def check_text_layer(source, stats: dict):
+    """Raise ScannedPDFError when the PDF has no text layer
+
+    Opens the document with PDFium, so it is meant to run in a PDF
+    extraction worker (see PDFExtractionService.iter_pages), not a request
+    thread.
+    """
+    reason = detect_scanned_pdf(source, stats)
+    if reason:
+        raise ScannedPDFError(
+            "This PDF appears to be a scanned image without selectable text "
+            f"({reason}). Please upload a text-based PDF, DOCX or TXT file."
+        )
+
+
+class PDFCostGuard:
+    """Estimate pdfplumber cost before parsing and pick a lane for the job
+
+    The defaults are fitted with benchmarks/bench_pdf_cost.py; parse time
+    mostly follows the amount of page content, so text-dense pages dominate.
+    Per-page overhead is absorbed by the per-object term (every page adds
+    objects), which is why seconds_per_page fits to 0.
+    """
+
+    def __init__(
+        self,
+        seconds_per_page: float = 0,
+        seconds_per_mb: float = 39,
+        seconds_per_thousand_objects: float = 0.94,
+        heavy_seconds: float = 5,
+        reject_seconds: float = 60,
+        max_pages: int = 100,
+        max_inflated_bytes: int = 200 * 1024 * 1024,
+        max_inflate_ratio: float = 200,
+    ):
+        self.seconds_per_page = seconds_per_page
+        self.seconds_per_mb = seconds_per_mb
+        self.seconds_per_thousand_objects = seconds_per_thousand_objects
+        self.heavy_seconds = heavy_seconds
+        self.reject_seconds = reject_seconds
+        self.max_pages = max_pages
+        self.max_inflated_bytes = max_inflated_bytes
+        self.max_inflate_ratio = max_inflate_ratio
+
+    def estimate(self, stats: dict) -> float:
+        """Rough pdfplumber wall time in seconds for the scanned structure"""
+        return (
+            stats["pages"] * self.seconds_per_page
+            + stats["inflated_content_bytes"] / (1024 * 1024) * self.seconds_per_mb
+            + stats["objects"] / 1000 * self.seconds_per_thousand_objects
+        )
+
+    def assess(self, source) -> dict:
+        """Scan a PDF (bytes or file path) and return its stats, cost and lane"""
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # empty file
+                    data = b""
+                try:
+                    stats = scan_pdf(data)
+                finally:
+                    if isinstance(data, mmap.mmap):
+                        data.close()
+        else:
+            stats = scan_pdf(source)
+        if not stats["pages"]:
+            # The page tree is inside object streams, invisible to the scan
+            stats["pages"] = _pdfium_page_count(source)
+
+        cost = round(self.estimate(stats), 2)
+        assessment = {"lane": "normal", "estimated_seconds": cost, "reason": "", **stats}
+
+        if stats["inflated_bytes"] > self.max_inflated_bytes or (
+            stats["max_inflate_ratio"] > self.max_inflate_ratio
+            and stats["inflated_bytes"] > self.max_inflated_bytes / 10
+        ):
+            assessment["lane"] = "reject"
+            assessment["reason"] = (
+                f"PDF content expands to ~{stats['inflated_bytes'] // (1024 * 1024)}MB "
+                f"(compression ratio {stats['max_inflate_ratio']}:1)"
+            )
+        elif stats["pages"] > self.max_pages:
+            assessment["lane"] = "reject"
+            assessment["reason"] = f"PDF has {stats['pages']} pages (max {self.max_pages})"
+        elif cost > self.reject_seconds:
+            assessment["lane"] = "reject"
+            assessment["reason"] = f"PDF is too complex to process (estimated {cost}s)"
+        elif cost > self.heavy_seconds:
+            assessment["lane"] = "heavy"
+            assessment["reason"] = f"Estimated {cost}s to parse"
+
+        return assessment
@@ -0,0 +1,161 @@
+import re
+
+from resume_sections import split_sections
+
+# Local stand-in for the Llama tokenizer: short letter runs, 1-3 digit
+# groups and single punctuation marks each cost about one token
+TOKEN_PATTERN = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+
+LINE_SPACE = re.compile(r"[^\S\n]+")
+PAGE_MARKER = re.compile(
+    r"^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*(?:of|/)\s*\d+|-\s*\d+\s*-)$", re.IGNORECASE
+)
+
+# PDF extraction ends each page with a form feed, so normalize_text can tell
+# running headers/footers from lines that merely repeat
+PAGE_BREAK = "\f\n"
+# Non-blank lines at the top and bottom of a page that may be header/footer
+PAGE_EDGE_LINES = 2
+EDGE_DIGITS = re.compile(r"\d+")
+
+# Sections in order of value for each task; unlisted sections come last
+TASK_PRIORITIES = {
+    "analyze": (
+        "header",
+        "summary",
+        "experience",
+        "projects",
+        "skills",
+        "education",
+        "certifications",
+        "achievements",
+    ),
+    "validate": (
+        "header",
+        "summary",
+        "experience",
+        "education",
+        "skills",
+        "projects",
+        "certifications",
+        "achievements",
+    ),
+}
+
+# Below this many tokens a partial section is not worth including
+MIN_PARTIAL_TOKENS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    return sum(1 for _ in TOKEN_PATTERN.finditer(text))
+
+
+def _running_lines(pages: list) -> set:
+    """Keys of lines at the edges of at least half the pages (and two):
+    running headers and footers"""
+    counts = {}
+    for lines in pages:
+        content = [line for line in lines if line]
+        edges = content[:PAGE_EDGE_LINES] + content[-PAGE_EDGE_LINES:]
+        for key in {_edge_key(line) for line in edges}:
+            counts[key] = counts.get(key, 0) + 1
+    threshold = max(2, len(pages) // 2)
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def _edge_key(line: str) -> str:
+    # Page numbers and dates inside a header change from page to page
+    return EDGE_DIGITS.sub("#", line.lower())
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace, drop page markers and repeated page headers/footers
+
+    Pages are separated by form feeds (PAGE_BREAK). A running header or
+    footer keeps its first occurrence; other repeated lines all stay.
+    """
+    pages = []
+    for page in text.split("\f"):
+        lines = [LINE_SPACE.sub(" ", raw_line).strip() for raw_line in page.splitlines()]
+        pages.append([line for line in lines if not PAGE_MARKER.match(line)])
+    running = _running_lines(pages) if len(pages) > 1 else set()
+
+    lines = []
+    seen = set()
+    blank = False
+    for page in pages:
+        content = [index for index, line in enumerate(page) if line]
+        edges = set(content[:PAGE_EDGE_LINES] + content[-PAGE_EDGE_LINES:])
+        for index, line in enumerate(page):
+            if not line:
+                if lines and not blank:
+                    lines.append("")
+                    blank = True
+                continue
+            key = _edge_key(line) if index in edges else None
+            if key in running:
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+            blank = False
+    return "\n".join(lines).strip()
+
+
+def _take_lines(text: str, max_tokens: int) -> str:
+    """Leading lines of text that fit in max_tokens"""
+    kept = []
+    used = 0
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            if not kept:  # a single huge line: cut it by words
+                words = []
+                for word in line.split(" "):
+                    used += estimate_tokens(word)
+                    if used > max_tokens:
+                        break
+                    words.append(word)
+                kept.append(" ".join(words))
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept).strip()
+
+
+def compress_resume(text: str, max_tokens: int, task: str = "analyze") -> str:
+    """Fit resume text into a token budget, keeping the most useful sections
+
+    The text is normalized first. If it still does not fit, sections are
+    added whole in TASK_PRIORITIES order, the first one that does not fit is
+    cut at a line boundary, and the result keeps the document order.
+    """
+    text = normalize_text(text)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sections = split_sections(text)
+    priorities = TASK_PRIORITIES.get(task, TASK_PRIORITIES["analyze"])
+    ranked = sorted(
+        sections,
+        key=lambda name: priorities.index(name) if name in priorities else len(priorities),
+    )
+
+    kept = {}
+    remaining = max_tokens
+    for name in ranked:
+        heading = "" if name == "header" else f"{name.upper()}\n"
+        body = sections[name]
+        cost = estimate_tokens(heading) + estimate_tokens(body) + 2
+        if cost <= remaining:
+            kept[name] = heading + body
+            remaining -= cost
+        elif remaining >= MIN_PARTIAL_TOKENS:
+            partial = _take_lines(body, remaining - estimate_tokens(heading) - 2)
+            if partial:
+                kept[name] = heading + partial
+            break
+        else:
+            break
+
+    return "\n\n".join(kept[name] for name in sections if name in kept)
@@ -0,0 +1,106 @@
+import json
+
+# Opening brace positions tried before giving up (prose before the JSON may
+# itself contain braces)
+MAX_START_ATTEMPTS = 3
+# Truncation cut points tried, newest first
+MAX_REPAIR_ATTEMPTS = 4
+
+
+def _drop_trailing_comma(out: list):
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index]
+
+
+def _loads(text: str):
+    try:
+        value = json.loads(text, strict=False)  # allow raw newlines in strings
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _decode_from(text: str, start: int):
+    """Scan one object starting at text[start] == "{" and decode it
+
+    Returns (object, repaired), or (None, False) if it cannot be recovered.
+    """
+    out = []
+    stack = []  # closers of the open objects/arrays
+    cut_points = []  # (output length, open closers) where the value so far is complete
+    in_string = escape = False
+    repaired = False
+
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+            out.append(char)
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+            cut_points.append((len(out), tuple(stack)))
+        elif char in "}]":
+            before = len(out)
+            _drop_trailing_comma(out)
+            closer = stack.pop()
+            repaired = repaired or len(out) != before or closer != char
+            out.append(closer)
+            if not stack:
+                value = _loads("".join(out))
+                return (value, repaired) if value is not None else (None, False)
+        elif char == ",":
+            cut_points.append((len(out), tuple(stack)))
+            out.append(char)
+        else:
+            out.append(char)
+
+    # Truncated (e.g. max_tokens was hit): close what is open, then fall
+    # back to the last points where a complete value ended
+    if escape:
+        out.pop()
+    tail = ['"'] if in_string else []
+    candidates = [(out + tail, stack)]
+    for length, closers in reversed(cut_points[-MAX_REPAIR_ATTEMPTS:]):
+        candidates.append((out[:length], closers))
+
+    for chars, closers in candidates:
+        chars = list(chars)
+        _drop_trailing_comma(chars)
+        value = _loads("".join(chars) + "".join(reversed(closers)))
+        if value is not None:
+            return value, True
+    return None, False
+
+
+def decode_json_object(text: str, with_status: bool = False):
+    """Decode the JSON object in an LLM response in a single linear scan
+
+    Skips prose and ``` fences around the object, stops at its matching
+    closing brace (so trailing text with braces is ignored) and repairs
+    trailing commas, mismatched closers and output cut off mid-object.
+    Raises ValueError when no object can be recovered. With `with_status`,
+    returns (object, repaired).
+    """
+    start = text.find("{")
+    for _ in range(MAX_START_ATTEMPTS):
+        if start == -1:
+            break
+        value, repaired = _decode_from(text, start)
+        if value is not None:
+            return (value, repaired) if with_status else value
+        start = text.find("{", start + 1)
+    raise ValueError("No JSON object found in response")
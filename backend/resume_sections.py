@@ -0,0 +1,109 @@
+import re
+
+# Heading lines that start each section, most specific first
+SECTION_HEADINGS = {
+    "summary": ("professional summary", "summary", "objective", "profile", "about me"),
+    "experience": (
+        "professional experience",
+        "work experience",
+        "work history",
+        "employment history",
+        "employment",
+        "experience",
+        "internships",
+    ),
+    "education": ("education", "academic background", "academics", "qualifications"),
+    "projects": ("personal projects", "academic projects", "key projects", "projects"),
+    "skills": ("technical skills", "core competencies", "skills", "technologies", "tech stack"),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+    "achievements": ("achievements", "awards", "honors", "honours", "accomplishments"),
+}
+
+HEADING_SECTIONS = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+# A heading is a short line of its own, optionally bulleted or ending in ":"
+HEADING_PATTERN = re.compile(
+    r"^[^\S\n]*(?:[#*•\-][^\S\n]*)?("
+    + "|".join(
+        re.escape(heading) for heading in sorted(HEADING_SECTIONS, key=len, reverse=True)
+    )
+    + r")\b[^\S\n]*(?:&[^\n]{0,20})?:?[^\S\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Sections each fan-out request reads, and the compact fields it returns.
+# The contact header and summary go with the profile request.
+FANOUT_GROUPS = {
+    "profile": (
+        ("header", "summary", "experience", "education", "certifications", "achievements"),
+        ("i", "y", "e", "c", "a", "st"),
+    ),
+    "projects": (("projects", "experience"), ("p",)),
+    "skills": (("skills", "summary", "projects"), ("s",)),
+}
+
+
+def split_sections(text: str) -> dict:
+    """Split resume text into {section: text} by its heading lines
+
+    Text before the first heading is the "header". Unrecognised headings
+    stay with the section they appear in; repeated sections are joined.
+    """
+    sections = {}
+    name, start = "header", 0
+    for match in HEADING_PATTERN.finditer(text):
+        body = text[start : match.start()].strip()
+        if body:
+            sections[name] = f"{sections[name]}\n{body}" if name in sections else body
+        name, start = HEADING_SECTIONS[match.group(1).lower()], match.end()
+    body = text[start:].strip()
+    if body:
+        sections[name] = f"{sections[name]}\n{body}" if name in sections else body
+    return sections
+
+
+def chunk_text(text: str, max_chars: int) -> list:
+    """Split text into chunks of at most max_chars, at line breaks where possible"""
+    chunks = []
+    while len(text) > max_chars:
+        cut = text.rfind("\n", 0, max_chars)
+        if cut <= max_chars // 2:
+            cut = max_chars
+        chunks.append(text[:cut].strip())
+        text = text[cut:]
+    if text.strip():
+        chunks.append(text.strip())
+    return chunks
+
+
+def plan_fanout(text: str, chunk_chars: int, max_requests: int) -> list:
+    """[(group, compact keys, text)] requests that together cover the resume
+
+    Returns an empty list when fewer than two sections are recognised (the
+    document is analyzed in one request instead).
+    """
+    sections = split_sections(text)
+    if len(sections.keys() - {"header"}) < 2:
+        return []
+
+    requests = []
+    for group, (names, keys) in FANOUT_GROUPS.items():
+        group_text = "\n\n".join(
+            f"{name.upper()}\n{sections[name]}" for name in names if name in sections
+        )
+        if not group_text:
+            continue
+        for chunk in chunk_text(group_text, chunk_chars):
+            requests.append((group, keys, chunk))
+
+    if len(requests) > max_requests:
+        print(f"⚠️ Fan-out needs {len(requests)} requests, keeping the first {max_requests}")
+        # Keep every group represented before adding more chunks of any one
+        first_chunks = {}
+        for request in requests:
+            first_chunks.setdefault(request[0], request)
+        rest = [request for request in requests if request not in first_chunks.values()]
+        requests = list(first_chunks.values()) + rest[: max_requests - len(first_chunks)]
+    return requests
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+from deadline import Deadline, DeadlineExceeded
+
+# How often a waiting duplicate re-checks its own deadline and client
+WAIT_SLICE = 0.5
+
+
+def _retry_after(error) -> bool:
+    """The leader's own deadline ran out, its client left or it was cancelled:
+    the result belongs to that request only, so waiting callers run again"""
+    return isinstance(error, (DeadlineExceeded, asyncio.CancelledError))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation
+
+    The first caller (the leader) runs fn; callers with the same key that
+    arrive while it is in flight wait for it and share its result, or its
+    exception. Nothing is kept once the call finishes: later repeats are the
+    analysis cache's job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, deadline: Deadline = None) -> tuple:
+        """(fn() result, whether it was shared from another caller's call)
+
+        A waiting caller gives up when its own deadline runs out.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self.leaders += 1
+            if leader:
+                return self._lead(key, call, fn), False
+
+            while not call.done.wait(WAIT_SLICE):
+                if deadline is not None:
+                    deadline.check("waiting for an identical analysis")
+            if _retry_after(call.error):
+                continue
+            with self._lock:
+                self.coalesced += 1
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+    def _lead(self, key, call: _Call, fn):
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+            }
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines on one event loop (asgi_app)
+
+    fn is a coroutine function; the leader awaits it in its own task.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, deadline: Deadline = None) -> tuple:
+        while True:
+            outcome = self._calls.get(key)
+            if outcome is None:
+                return await self._lead(key, fn), False
+
+            while not outcome.done():
+                try:
+                    # shield: a caller that gives up must not cancel the
+                    # outcome the others are waiting on
+                    await asyncio.wait_for(asyncio.shield(outcome), WAIT_SLICE)
+                except asyncio.TimeoutError:
+                    if deadline is not None:
+                        deadline.check("waiting for an identical analysis")
+            result, error = outcome.result()
+            if _retry_after(error):
+                continue
+            self.coalesced += 1
+            if error is not None:
+                raise error
+            return result, True
+
+    async def _lead(self, key, fn):
+        # The outcome is a (result, error) pair rather than a future holding
+        # the exception, which would be reported as never retrieved when
+        # nobody waited on it
+        outcome = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.leaders += 1
+        result = error = None
+        try:
+            result = await fn()
+            return result
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            del self._calls[key]
+            outcome.set_result((result, error))
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,88 @@
+import re
+
+# Skill tokens may end in symbols (c++, c#, node.js), so plain \b boundaries
+# do not work: "\bc\+\+\b" never matches "C++ developer". A skill is instead
+# bounded by anything that is not a word character, and must not be followed
+# by "+" or "#" so that "c" does not match inside "c++" or "c#".
+LEFT_BOUNDARY = r"(?<![A-Za-z0-9_])"
+RIGHT_BOUNDARY = r"(?![A-Za-z0-9_+#])"
+
+
+def _alias_pattern(alias: str) -> str:
+    """Regex for one alias, allowing any run of whitespace between words"""
+    return r"\s+".join(re.escape(word) for word in alias.split())
+
+
+def _normalize(alias: str) -> str:
+    return " ".join(alias.lower().split())
+
+
+class SkillOntology:
+    """Skill taxonomy compiled once into a single alternation matcher"""
+
+    def __init__(self, skill_categories: dict, aliases: dict = None):
+        # skill_categories maps a category to its canonical skill names,
+        # aliases maps a canonical skill name to alternative spellings
+        self.skill_categories = skill_categories
+        self.categories_by_skill = {}
+        for category, skill_list in skill_categories.items():
+            for skill in skill_list:
+                self.categories_by_skill.setdefault(_normalize(skill), []).append(
+                    category
+                )
+
+        self.canonical_by_alias = {}
+        for skill in self.categories_by_skill:
+            self.canonical_by_alias[skill] = skill
+        for skill, skill_aliases in (aliases or {}).items():
+            for alias in skill_aliases:
+                self.canonical_by_alias.setdefault(_normalize(alias), _normalize(skill))
+
+        # Longest aliases first so "spring boot" wins over "spring" and
+        # "node.js" over "node" at the same position. Each alias is a named
+        # group: IGNORECASE also folds Unicode ("cſſ" matches "css", "kotlın"
+        # matches "kotlin"), so the matched text is not a reliable key
+        ordered_aliases = sorted(self.canonical_by_alias, key=len, reverse=True)
+        self.alias_by_group = {f"a{i}": alias for i, alias in enumerate(ordered_aliases)}
+        self.pattern = re.compile(
+            LEFT_BOUNDARY
+            + "(?:"
+            + "|".join(
+                f"(?P<{group}>{_alias_pattern(alias)})"
+                for group, alias in self.alias_by_group.items()
+            )
+            + ")"
+            + RIGHT_BOUNDARY,
+            re.IGNORECASE,
+        )
+
+        # A single scan reports non-overlapping matches only, so precompute
+        # the shorter skills each alias also contains ("spring boot" also
+        # counts as "spring") to keep per-skill search semantics
+        self.skills_by_alias = {}
+        for alias, skill in self.canonical_by_alias.items():
+            implied = {skill}
+            for other in ordered_aliases:
+                if len(other) < len(alias) and re.search(
+                    LEFT_BOUNDARY + _alias_pattern(other) + RIGHT_BOUNDARY,
+                    alias,
+                ):
+                    implied.add(self.canonical_by_alias[other])
+            self.skills_by_alias[alias] = implied
+
+    def find_skills(self, text: str) -> set:
+        """Canonical names of every skill mentioned in the text"""
+        found = set()
+        for match in self.pattern.finditer(text):
+            found |= self.skills_by_alias[self.alias_by_group[match.lastgroup]]
+        return found
+
+    def categorize(self, text: str) -> dict:
+        """Map each category to the skills found in the text, in taxonomy order"""
+        found = self.find_skills(text)
+        skills_found = {}
+        for category, skill_list in self.skill_categories.items():
+            matches = [skill.title() for skill in skill_list if _normalize(skill) in found]
+            if matches:
+                skills_found[category] = matches
+        return skills_found
@@ -0,0 +1,91 @@
+from response_decoder import decode_json_object
+
+
+class IncrementalObjectParser:
+    """Parse a JSON object as it streams in, member by member
+
+    Text before the opening brace (prose, a ``` fence) is skipped. Each
+    top-level member is decoded as soon as the comma or closing brace after
+    it arrives, so callers can use "personal_info" while "projects" is still
+    being generated. Every character is scanned once.
+    """
+
+    def __init__(self):
+        self.members = {}
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, chunk: str) -> list:
+        """Add streamed text; returns the (key, value) members it completed"""
+        completed = []
+        if self.done or not chunk:
+            return completed
+
+        self._text += chunk
+        text = self._text
+        pos = self._pos
+        while pos < len(text):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    if char != "{":
+                        self._depth = 0  # stray bracket before the object
+                    else:
+                        self._member_start = pos + 1
+            elif char in "}]" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._close_member(text, pos))
+                    self.done = True
+                    break
+            elif char == "," and self._depth == 1:
+                completed.extend(self._close_member(text, pos))
+                self._member_start = pos + 1
+            pos += 1
+
+        # Drop everything before the member being built
+        if self._member_start is not None and not self.done:
+            self._text = text[self._member_start :]
+            self._pos = pos - self._member_start
+            self._member_start = 0
+        else:
+            self._text = "" if self.done else text
+            self._pos = 0 if self.done else pos
+        return completed
+
+    def finish(self) -> list:
+        """Call at the end of the stream: salvages a member cut off mid-way
+        (e.g. when max_tokens was hit)"""
+        if self.done or self._member_start is None:
+            return []
+        self.done = True
+        return self._decode_member(self._text[self._member_start :])
+
+    def _close_member(self, text: str, end: int) -> list:
+        return self._decode_member(text[self._member_start : end] + "}")
+
+    def _decode_member(self, member: str) -> list:
+        if not member.strip("} \t\r\n"):
+            return []
+        try:
+            parsed = decode_json_object("{" + member)
+        except ValueError:
+            return []  # malformed member; the rest of the object still counts
+        self.members.update(parsed)
+        return list(parsed.items())
@@ -0,0 +1,147 @@
+from analysis_schema import expand_analysis, expand_field, merge_compact
+
+
+def test_merge_compact_fills_personal_info_gaps():
+    merged = merge_compact(
+        [{"i": ["Jane Doe", "", ""]}, {"i": ["J. Doe", "jane@example.com"]}, {"i": ["", "", "555"]}]
+    )
+    assert merged["i"] == ["Jane Doe", "jane@example.com", "555"]
+
+
+def test_merge_compact_keeps_the_largest_years():
+    merged = merge_compact([{"y": "5 years"}, {"y": 12}, {"y": 7.5}, {"y": None}])
+    assert merged["y"] == 12
+
+
+def test_merge_compact_deduplicates_rows_from_overlapping_chunks():
+    parts = [
+        {"e": [["M.S.", "Stanford", "2009"]], "p": [["Log search", "tool", ["Rust"], []]]},
+        {"e": [["m.s.", "STANFORD", "2009"], ["B.S.", "MIT", "2007"]], "a": ["Speaker"]},
+        {
+            "p": [["Log search", "tool", ["Rust"], []], ["CLI", "tool", [], []]],
+            "a": ["speaker", "Award"],
+        },
+    ]
+    merged = merge_compact(parts)
+    assert merged["e"] == [["M.S.", "Stanford", "2009"], ["B.S.", "MIT", "2007"]]
+    assert merged["p"] == [["Log search", "tool", ["Rust"], []], ["CLI", "tool", [], []]]
+    assert merged["a"] == ["Speaker", "Award"]
+
+
+def test_merge_compact_unions_skills_per_code():
+    merged = merge_compact(
+        [
+            {"s": {"L": ["Python", "Go"], "T": ["Docker"]}},
+            {"s": {"L": ["python", "Rust"], "D": "oops"}},
+        ]
+    )
+    assert merged["s"] == {"L": ["Python", "Go", "Rust"], "T": ["Docker"]}
+
+
+def test_merge_compact_keeps_the_first_scalar():
+    assert merge_compact([{"why": "first"}, {"why": "second"}]) == {"why": "first"}
+
+
+COMPACT = {
+    "i": ["Jane Doe", "jane@example.com", "+1 555 123 4567"],
+    "y": "12 years",
+    "e": [["M.S. Computer Science", "Stanford", 2009]],
+    "p": [["Log search", "Open-source tool", ["Rust", "Kafka"], ["Indexes 1TB/day"]]],
+    "s": {
+        "L": ["Python", "Go"],
+        "W": ["React"],
+        "D": ["PostgreSQL"],
+        "F": ["Django"],
+        "T": ["Docker"],
+    },
+    "c": [["AWS Solutions Architect", "2021"]],
+    "a": ["Speaker at PyCon"],
+    "st": ["Distributed systems"],
+}
+
+
+def test_expand_analysis_round_trip():
+    assert expand_analysis(COMPACT) == {
+        "personal_info": {
+            "name": "Jane Doe",
+            "email": "jane@example.com",
+            "phone": "+1 555 123 4567",
+        },
+        "experience": {"years": 12},
+        "education": [
+            {"degree": "M.S. Computer Science", "institution": "Stanford", "year": "2009"}
+        ],
+        "projects": [
+            {
+                "name": "Log search",
+                "description": "Open-source tool",
+                "technologies": ["Rust", "Kafka"],
+                "main_points": ["Indexes 1TB/day"],
+            }
+        ],
+        "skills": {
+            "Programming Languages": ["Python", "Go"],
+            "Web Technologies": ["React"],
+            "Databases": ["PostgreSQL"],
+            "Frameworks & Libraries": ["Django"],
+            "Tools & Platforms": ["Docker"],
+        },
+        "certifications": [{"name": "AWS Solutions Architect", "year": "2021"}],
+        "achievements": ["Speaker at PyCon"],
+        "analysis_summary": {"overall_strengths": ["Distributed systems"]},
+    }
+
+
+def test_expand_analysis_pads_short_rows_and_truncates_long_ones():
+    expanded = expand_analysis(
+        {
+            "i": ["Jane Doe"],
+            "e": [["M.S."], ["B.S.", "MIT", "2007", "extra"]],
+            "p": [["CLI", "tool", "Go"]],
+        }
+    )
+    assert expanded["personal_info"] == {"name": "Jane Doe", "email": "", "phone": ""}
+    assert expanded["education"] == [
+        {"degree": "M.S.", "institution": "", "year": ""},
+        {"degree": "B.S.", "institution": "MIT", "year": "2007"},
+    ]
+    assert expanded["projects"] == [
+        {"name": "CLI", "description": "tool", "technologies": ["Go"], "main_points": []}
+    ]
+
+
+def test_expand_analysis_tolerates_malformed_values():
+    expanded = expand_analysis(
+        {
+            "i": "Jane Doe",
+            "y": "about ten",
+            "e": "Stanford",
+            "p": [{"name": "Object row", "technologies": "Rust"}, None],
+            "s": {"L": "Python", "X": ["Custom"], "T": []},
+            "c": None,
+            "a": "not a list",
+            "st": {"bad": 1},
+        }
+    )
+    assert expanded["personal_info"] == {"name": "Jane Doe", "email": "", "phone": ""}
+    assert expanded["experience"] == {"years": 0}
+    assert expanded["education"] == []
+    assert expanded["projects"] == [
+        {"name": "Object row", "description": "", "technologies": ["Rust"], "main_points": []},
+        {"name": "", "description": "", "technologies": [], "main_points": []},
+    ]
+    assert expanded["skills"] == {"X": ["Custom"]}
+    assert expanded["certifications"] == []
+    assert expanded["achievements"] == []
+    assert expanded["analysis_summary"] == {"overall_strengths": []}
+
+
+def test_expand_analysis_passes_the_verbose_shape_through():
+    verbose = {"personal_info": {"name": "Jane"}, "experience": {"years": 3}, "skills": {}}
+    assert expand_analysis(verbose) is verbose
+
+
+def test_expand_field_for_streamed_fields():
+    assert expand_field("y", 4.5) == ("experience", {"years": 4.5})
+    assert expand_field("s", {"D": ["Redis"]}) == ("skills", {"Databases": ["Redis"]})
+    assert expand_field("unknown", [1]) == ("unknown", [1])
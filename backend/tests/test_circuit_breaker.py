@@ -0,0 +1,122 @@
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, percentile
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "test", window=10, min_calls=4, error_rate_threshold=0.5, slow_call_seconds=5, open_seconds=30
+    )
+
+
+def trip(breaker):
+    for _ in range(4):
+        assert breaker.allow()
+        breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+
+def test_percentile():
+    assert percentile([], 0.95) == 0.0
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile(range(101), 0.95) == 95
+
+
+def test_stays_closed_below_min_calls(breaker):
+    for _ in range(3):
+        breaker.record_failure(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_error_rate(breaker):
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure(0.1)
+    assert breaker.state == CLOSED
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+    assert breaker.open_reason == "error rate 50% over last 4 calls"
+    assert breaker.times_opened == 1
+
+
+def test_opens_on_p95_latency(breaker):
+    for _ in range(4):
+        breaker.record_success(6)
+    assert breaker.state == OPEN
+    assert breaker.open_reason.startswith("p95 latency 6.0s")
+
+
+def test_open_rejects_until_open_seconds_pass(breaker, clock):
+    trip(breaker)
+    assert not breaker.available()
+    assert not breaker.allow()
+    assert breaker.rejected_calls == 1
+
+    clock.now += 30
+    assert breaker.available()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_limits_probes(breaker, clock):
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.available()
+    assert not breaker.allow()
+
+
+def test_probe_successes_close_it(breaker, clock):
+    trip(breaker)
+    clock.now += 30
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["window_calls"] == 0
+
+
+def test_failed_probe_reopens_it(breaker, clock):
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+    assert breaker.open_reason == "probe failed"
+    assert breaker.times_opened == 2
+    assert not breaker.allow()
+
+
+def test_slow_probe_reopens_it(breaker, clock):
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success(5)
+    assert breaker.state == OPEN
+    assert breaker.open_reason == "probe took 5.0s"
+
+
+def test_snapshot_reports_open_state(breaker, clock):
+    trip(breaker)
+    clock.now += 12
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == OPEN
+    assert snapshot["error_rate"] == 1.0
+    assert snapshot["seconds_open"] == 12
@@ -0,0 +1,201 @@
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import groq_client
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from deadline import DeadlineExceeded
+from groq_client import GroqClient, parse_duration, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict = None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Answers each POST with the next scripted response, or raises it"""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = []
+
+    def post(self, url, json=None, timeout=None, stream=False):
+        self.calls.append({"model": json["model"], "timeout": timeout})
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class FakeDeadline:
+    def __init__(self, remaining: float, seconds: float = 30):
+        self.seconds = seconds
+        self._remaining = remaining
+
+    def remaining(self) -> float:
+        return self._remaining
+
+    def timeout(self, cap, reserve=0, stage=""):
+        return min(cap, self._remaining - reserve)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Sleep durations requested by the retry loop (nothing actually sleeps)"""
+    slept = []
+    monkeypatch.setattr(groq_client.time, "sleep", slept.append)
+    # Full jitter always draws its upper bound
+    monkeypatch.setattr(groq_client.random, "uniform", lambda low, high: high)
+    return slept
+
+
+def client(*script, **kwargs) -> GroqClient:
+    groq = GroqClient("key", "https://groq.invalid/v1/chat/completions", **kwargs)
+    groq.session = FakeSession(*script)
+    return groq
+
+
+PAYLOAD = {"model": "llama-3.3-70b-versatile", "messages": []}
+
+
+def test_parse_duration():
+    assert parse_duration("2m59.56s") == pytest.approx(179.56)
+    assert parse_duration("7.66s") == pytest.approx(7.66)
+    assert parse_duration("120ms") == pytest.approx(0.12)
+    assert parse_duration("1h") == 3600
+    assert parse_duration("") is None
+    assert parse_duration(None) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_5xx_is_retried_with_exponential_backoff(sleeps):
+    groq = client(FakeResponse(503), FakeResponse(502), FakeResponse(200))
+    assert groq.post(PAYLOAD).status_code == 200
+    assert len(groq.session.calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_backoff_is_capped_and_retries_run_out(sleeps):
+    groq = client(*(FakeResponse(500) for _ in range(4)), backoff_base=3, backoff_max=8)
+    response = groq.post(PAYLOAD)
+    assert response.status_code == 500
+    assert len(groq.session.calls) == 4  # max_retries=3 retries after the first call
+    assert sleeps == [3, 6, 8]
+
+
+def test_429_waits_for_retry_after(sleeps):
+    groq = client(FakeResponse(429, {"Retry-After": "2"}), FakeResponse(200))
+    assert groq.post(PAYLOAD).status_code == 200
+    assert sleeps == [2]
+
+
+def test_429_waits_for_the_exhausted_rate_limit_only(sleeps):
+    headers = {
+        "x-ratelimit-remaining-requests": "12",
+        "x-ratelimit-reset-requests": "59s",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-reset-tokens": "7.5s",
+    }
+    groq = client(FakeResponse(429, headers), FakeResponse(200))
+    assert groq.post(PAYLOAD).status_code == 200
+    assert sleeps == [7.5]
+
+
+def test_wait_longer_than_max_wait_is_not_retried(sleeps):
+    groq = client(FakeResponse(429, {"Retry-After": "30"}), FakeResponse(200), max_wait=10)
+    assert groq.post(PAYLOAD).status_code == 429
+    assert len(groq.session.calls) == 1
+    assert sleeps == []
+
+
+def test_429_switches_to_the_fallback_model_without_waiting(sleeps):
+    limited = []
+    first = FakeResponse(429, {"Retry-After": "20"})
+    groq = client(first, FakeResponse(200), on_rate_limit=lambda *args: limited.append(args))
+
+    response = groq.post(PAYLOAD, fallback_model="llama-3.1-8b-instant")
+    assert response.status_code == 200
+    assert [call["model"] for call in groq.session.calls] == [
+        "llama-3.3-70b-versatile",
+        "llama-3.1-8b-instant",
+    ]
+    assert sleeps == []
+    assert first.closed
+    assert limited == [("llama-3.3-70b-versatile", 20)]
+
+
+def test_429_on_the_fallback_model_waits(sleeps):
+    groq = client(
+        FakeResponse(429, {"Retry-After": "1"}),
+        FakeResponse(429, {"Retry-After": "2"}),
+        FakeResponse(200),
+    )
+    response = groq.post(PAYLOAD, fallback_model="llama-3.1-8b-instant")
+    assert response.status_code == 200
+    assert [call["model"] for call in groq.session.calls] == [
+        "llama-3.3-70b-versatile",
+        "llama-3.1-8b-instant",
+        "llama-3.1-8b-instant",
+    ]
+    assert sleeps == [2]
+
+
+def test_connection_errors_are_retried(sleeps):
+    groq = client(requests.ConnectionError("reset"), FakeResponse(200))
+    assert groq.post(PAYLOAD).status_code == 200
+    assert sleeps == [0.5]
+
+
+def test_connection_error_is_raised_when_retries_run_out(sleeps):
+    groq = client(*(requests.ConnectionError("reset") for _ in range(3)), max_retries=2)
+    with pytest.raises(requests.ConnectionError):
+        groq.post(PAYLOAD)
+    assert len(groq.session.calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_read_timeout_is_not_retried(sleeps):
+    groq = client(requests.ReadTimeout("slow"), FakeResponse(200))
+    with pytest.raises(requests.ReadTimeout):
+        groq.post(PAYLOAD, timeout=30)
+    assert len(groq.session.calls) == 1
+
+
+def test_attempt_timeout_is_capped_by_the_deadline(sleeps):
+    groq = client(requests.ReadTimeout("slow"))
+    with pytest.raises(DeadlineExceeded):
+        groq.post(PAYLOAD, timeout=30, deadline=FakeDeadline(remaining=6))
+    assert groq.session.calls[0]["timeout"] == 5  # keeps DEADLINE_RESERVE back
+
+
+def test_backoff_that_does_not_fit_the_deadline_is_not_retried(sleeps):
+    groq = client(FakeResponse(503, {"Retry-After": "3"}), FakeResponse(200))
+    response = groq.post(PAYLOAD, timeout=30, deadline=FakeDeadline(remaining=4))
+    assert response.status_code == 503
+    assert len(groq.session.calls) == 1
+    assert sleeps == []
+
+
+def test_breaker_records_the_final_outcome(sleeps):
+    breaker = CircuitBreaker("groq", min_calls=1, error_rate_threshold=1.0)
+    groq = client(FakeResponse(503), FakeResponse(503), max_retries=1, breaker=breaker)
+    assert groq.post(PAYLOAD).status_code == 503
+    assert breaker.snapshot()["window_calls"] == 1
+    with pytest.raises(CircuitOpenError):
+        groq.post(PAYLOAD)
@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+import job_queue
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(job_queue, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return JobStore(str(tmp_path / "jobs.db"), lease_seconds=60, max_attempts=2, retention_seconds=3600)
+
+
+def test_claim_takes_the_oldest_queued_job_once(store, clock):
+    first = store.submit("file", b"%PDF", "a.pdf")
+    clock.now += 1
+    second = store.submit("text", b"resume text")
+
+    job = store.claim()
+    assert job == {
+        "id": first,
+        "kind": "file",
+        "filename": "a.pdf",
+        "payload": b"%PDF",
+        "attempt": 1,
+    }
+    assert store.claim()["id"] == second
+    assert store.claim() is None
+    assert store.counts() == {QUEUED: 0, RUNNING: 2, DONE: 0, FAILED: 0}
+
+
+def test_running_job_is_not_claimed_before_its_lease_expires(store, clock):
+    job_id = store.submit("text", b"x")
+    store.claim()
+    clock.now += 59
+    assert store.claim() is None
+
+    clock.now += 2
+    job = store.claim()
+    assert job["id"] == job_id
+    assert job["attempt"] == 2
+    assert store.get(job_id)["attempts"] == 2
+
+
+def test_job_fails_once_its_attempts_run_out(store, clock):
+    job_id = store.submit("text", b"x")
+    store.claim()
+    clock.now += 61
+    store.claim()
+    clock.now += 61
+
+    assert store.claim() is None
+    job = store.get(job_id)
+    assert job["status"] == FAILED
+    assert job["status_code"] == 500
+    assert job["result"] == {"error": "Job failed after 2 attempts", "success": False}
+
+
+def test_finish_stores_the_result_and_drops_the_payload(store):
+    done = store.submit("text", b"x")
+    failed = store.submit("text", b"y")
+    store.claim()
+    store.claim()
+    store.finish(done, 200, {"success": True})
+    store.finish(failed, 503, {"error": "unavailable"})
+
+    assert store.get(done)["status"] == DONE
+    assert store.get(done)["result"] == {"success": True}
+    assert store.get(failed)["status"] == FAILED
+    payloads = store._connect().execute("SELECT COUNT(*) FROM jobs WHERE payload IS NOT NULL")
+    assert payloads.fetchone() == (0,)
+    # A finished job is never claimed again, even after its old lease time
+    assert store.claim() is None
+
+
+def test_finished_jobs_are_deleted_after_retention(store, clock):
+    old = store.submit("text", b"x")
+    store.claim()
+    store.finish(old, 200, {})
+    clock.now += 3601
+    new = store.submit("text", b"y")
+    store.claim()
+    store.finish(new, 200, {})
+
+    assert store.get(old) is None
+    assert store.get(new)["status"] == DONE
+
+
+def test_concurrent_claims_never_share_a_job(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    submitted = {store.submit("text", b"x") for _ in range(40)}
+    claimed = []
+
+    def worker():
+        while True:
+            job = store.claim()
+            if job is None:
+                return
+            claimed.append(job["id"])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert sorted(claimed) == sorted(submitted)
@@ -0,0 +1,110 @@
+import pytest
+
+import model_router
+from model_router import ModelRouter
+
+FAST = "llama-3.1-8b-instant"
+LARGE = "llama-3.3-70b-versatile"
+
+SIMPLE_RESUME = """Jane Doe
+Experience
+Acme Corp, Engineer, 2018 - Present
+Education
+B.S. Computer Science, 2018
+Skills
+Python, Go
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(model_router, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def router(clock):
+    return ModelRouter(FAST, LARGE, downgrade_seconds=30)
+
+
+def test_short_structured_resume_is_simple(router):
+    assert not router.is_complex(SIMPLE_RESUME)
+    assert not router.is_complex(SIMPLE_RESUME, score=85)
+
+
+@pytest.mark.parametrize(
+    "text, score",
+    [
+        (SIMPLE_RESUME + "x" * 3500, None),  # too long
+        (SIMPLE_RESUME, 60),  # low local validation score
+        ("Jane Doe\nSkills\nPython\nEducation\nB.S.", None),  # too few sections
+    ],
+)
+def test_complex_documents(router, text, score):
+    assert router.is_complex(text, score)
+
+
+def test_route_by_complexity(router):
+    assert router.route("analyze", complex_document=False) == ("analyze:fast", FAST)
+    assert router.route("analyze") == ("analyze:large", LARGE)
+    assert router.route("validate", complex_document=True) == ("validate:large", LARGE)
+
+
+def test_rate_limited_large_model_is_downgraded_for_the_window(router, clock):
+    router.record_rate_limit(LARGE, 5)  # shorter than downgrade_seconds
+    assert router.route("analyze") == ("analyze:downgraded", FAST)
+    assert router.route("analyze", complex_document=False) == ("analyze:fast", FAST)
+
+    clock.now += 29
+    assert router.route("analyze") == ("analyze:downgraded", FAST)
+    clock.now += 1
+    assert router.route("analyze") == ("analyze:large", LARGE)
+    assert router.downgrades == 1
+
+
+def test_longer_reset_extends_the_downgrade_window(router, clock):
+    router.record_rate_limit(LARGE, 90)
+    clock.now += 60
+    assert router.rate_limited(LARGE)
+    assert router.snapshot()["rate_limited"] == [LARGE]
+    clock.now += 30
+    assert not router.rate_limited(LARGE)
+    assert router.snapshot()["rate_limited"] == []
+
+
+def test_rate_limited_fast_model_does_not_affect_large_routes(router):
+    router.record_rate_limit(FAST)
+    assert router.route("analyze") == ("analyze:large", LARGE)
+
+
+def test_fallback_model():
+    router = ModelRouter(FAST, LARGE)
+    assert router.fallback_model(LARGE) == FAST
+    assert router.fallback_model(FAST) is None
+
+
+def test_snapshot_reports_per_route_stats(clock):
+    router = ModelRouter(FAST, LARGE, window=3)
+    for latency in (1.0, 2.0, 3.0, 4.0):
+        router.record("analyze:large", latency)
+    router.record("analyze:fast", 0.5, fallback=True)
+    router.record("analyze:fast", 0.7)
+
+    routes = router.snapshot()["routes"]
+    assert routes["analyze:large"] == {
+        "calls": 4,
+        "fallback_rate": 0.0,
+        "latency_p50": 3.0,
+        "latency_p95": 4.0,
+    }
+    assert routes["analyze:fast"]["calls"] == 2
+    assert routes["analyze:fast"]["fallback_rate"] == 0.5
@@ -0,0 +1,146 @@
+import os
+import random
+import struct
+import zlib
+
+import pytest
+
+from pdf_inspector import PDFCostGuard, scan_pdf
+
+TEXT = b"BT /F1 10 Tf 50 750 Td 12 TL " + b"(Senior engineer, Python and Go) Tj T* " * 45 + b"ET"
+
+
+def stream(body: bytes, extra: bytes = b"") -> bytes:
+    data = zlib.compress(body)
+    header = b"<< /Length %d /Filter /FlateDecode %s>>" % (len(data), extra)
+    return header + b"\nstream\n" + data + b"\nendstream"
+
+
+def write_pdf(objects: list, trailer: bytes) -> bytes:
+    """Numbered objects 1..n with a classic xref table"""
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d %s >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        trailer,
+        xref,
+    )
+    return bytes(out)
+
+
+def resume_with_fonts(fonts: int, font_bytes: int, filler: bytes = None) -> bytes:
+    """One-page PDF whose text uses `fonts` embedded Type1 font programs"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", stream(TEXT)]
+    names = []
+    for index in range(fonts):
+        program = b"%!PS-AdobeFont-1.0\ncurrentfile eexec\n"
+        body = filler or random.Random(index).randbytes(font_bytes)
+        objects.append(
+            stream(program + body, b"/Length1 %d /Length2 %d /Length3 0 " % (len(program), len(body)))
+        )
+        objects.append(
+            b"<< /Type /FontDescriptor /FontName /CMR%d /FontFile %d 0 R >>" % (index, len(objects))
+        )
+        objects.append(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /CMR%d /FontDescriptor %d 0 R >>"
+            % (index, len(objects))
+        )
+        names.append(b"/F%d %d 0 R" % (index + 1, len(objects)))
+    objects.append(
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 3 0 R "
+        b"/Resources << /Font << %s >> >> >>" % b" ".join(names)
+    )
+    objects[1] = b"<< /Type /Pages /Kids [%d 0 R] /Count 1 >>" % len(objects)
+    return write_pdf(objects, b"/Root 1 0 R")
+
+
+def page_tree_in_object_stream(pages: int) -> bytes:
+    """PDF 1.5 whose catalog, page tree and pages are compressed in an object
+    stream, so no /Type /Page is visible in the raw bytes"""
+    # 1: object stream, 2: catalog, 3: pages, 4: font, 5: content,
+    # 6..: pages, then the xref stream
+    compressed = {
+        2: b"<< /Type /Catalog /Pages 3 0 R >>",
+        3: b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % (6 + i) for i in range(pages)), pages),
+        4: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i in range(pages):
+        compressed[6 + i] = (
+            b"<< /Type /Page /Parent 3 0 R /MediaBox [0 0 612 792] /Contents 5 0 R "
+            b"/Resources << /Font << /F1 4 0 R >> >> >>"
+        )
+    index, bodies = [], b""
+    for number, body in compressed.items():
+        index.append(b"%d %d" % (number, len(bodies)))
+        bodies += body + b"\n"
+    header = b" ".join(index) + b"\n"
+    object_stream = stream(
+        header + bodies, b"/Type /ObjStm /N %d /First %d " % (len(compressed), len(header))
+    )
+
+    out = bytearray(b"%PDF-1.5\n")
+    offsets = {}
+    for number, body in ((1, object_stream), (5, stream(TEXT))):
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_number = 6 + pages
+    offsets[xref_number] = len(out)
+    entries = b""
+    for number in range(xref_number + 1):
+        if number in offsets:
+            entries += struct.pack(">BIH", 1, offsets[number], 0)
+        elif number in compressed:
+            entries += struct.pack(">BIH", 2, 1, list(compressed).index(number))
+        else:
+            entries += struct.pack(">BIH", 0, 0, 65535)
+    xref = stream(entries, b"/Type /XRef /Size %d /W [1 4 2] /Root 2 0 R " % (xref_number + 1))
+    out += b"%d 0 obj\n" % xref_number + xref + b"\nendobj\n"
+    out += b"startxref\n%d\n%%%%EOF\n" % offsets[xref_number]
+    return bytes(out)
+
+
+@pytest.fixture
+def guard():
+    return PDFCostGuard(heavy_seconds=5, reject_seconds=60, max_pages=100)
+
+
+def test_embedded_fonts_are_not_page_content():
+    stats = scan_pdf(resume_with_fonts(fonts=4, font_bytes=300_000))
+    assert stats["pages"] == 1
+    assert stats["inflated_content_bytes"] == len(TEXT)
+    assert stats["inflated_bytes"] > 1_200_000
+
+
+@pytest.mark.parametrize("fonts, font_bytes", [(3, 500_000), (4, 300_000)])
+def test_small_resume_with_embedded_fonts_stays_in_the_normal_lane(guard, fonts, font_bytes):
+    assessment = guard.assess(resume_with_fonts(fonts, font_bytes))
+    assert assessment["lane"] == "normal"
+    assert assessment["estimated_seconds"] < 1
+
+
+def test_compression_bomb_in_a_font_stream_is_still_rejected(guard):
+    bomb = resume_with_fonts(fonts=1, font_bytes=0, filler=b"\0" * (40 * 1024 * 1024))
+    assessment = guard.assess(bomb)
+    assert assessment["lane"] == "reject"
+    assert assessment["reason"].startswith("PDF content expands to ~")
+
+
+def test_page_count_inside_object_streams_comes_from_pdfium(guard, tmp_path):
+    data = page_tree_in_object_stream(pages=3)
+    assert b"/Type /Page" not in data
+    assert scan_pdf(data)["pages"] == 0
+    assert guard.assess(data)["pages"] == 3
+
+    path = os.path.join(tmp_path, "objstm.pdf")
+    with open(path, "wb") as f:
+        f.write(page_tree_in_object_stream(pages=101))
+    assessment = guard.assess(path)
+    assert assessment["lane"] == "reject"
+    assert assessment["reason"] == "PDF has 101 pages (max 100)"
@@ -0,0 +1,42 @@
+from prompt_compressor import PAGE_BREAK, compress_resume, estimate_tokens, normalize_text
+
+HEADER = "Jane Doe  |  Engineer  |  jane@example.com"
+
+
+def page(number: int, *body) -> str:
+    return "\n".join([HEADER, *body, f"Confidential - printed 2024-0{number}-01", f"Page {number} of 3"])
+
+
+def test_running_headers_and_footers_keep_their_first_occurrence():
+    text = PAGE_BREAK.join(
+        [
+            page(1, "Experience", "Acme   Corp", "•  Led a team", "•  Led a team"),
+            page(2, "Globex", "•  Led a team", "More work", "Even more"),
+            page(3, "Skills", "Python, Go", "Education", "BSc"),
+        ]
+    )
+    lines = normalize_text(text).split("\n")
+    assert lines.count("Jane Doe | Engineer | jane@example.com") == 1
+    assert lines.count("Confidential - printed 2024-01-01") == 1
+    assert "Confidential - printed 2024-02-01" not in lines
+    # Repeated body lines are not headers
+    assert lines.count("• Led a team") == 3
+    assert "Page 2 of 3" not in lines
+
+
+def test_text_without_page_breaks_keeps_repeated_lines():
+    text = "Summary\n\n\n• Led a team\n• Led a team\nPage 1 of 2\n-  2 -\nAcme    Corp"
+    assert normalize_text(text) == "Summary\n\n• Led a team\n• Led a team\nAcme Corp"
+
+
+def test_compress_resume_fits_the_budget_in_priority_order():
+    text = "\n".join(
+        ["Jane Doe", "Summary", "Backend engineer", "Experience"]
+        + [f"Company {i} Senior Engineer 2010 - 2012, built services in Python" for i in range(60)]
+        + ["Education", "BSc Computer Science"]
+    )
+    compressed = compress_resume(text, 200, "analyze")
+    assert estimate_tokens(compressed) <= 200
+    assert compressed.startswith("Jane Doe\n\nSUMMARY\nBackend engineer\n\nEXPERIENCE\nCompany 0")
+    assert "EDUCATION" not in compressed
+    assert compress_resume("Short resume", 200) == "Short resume"
@@ -0,0 +1,60 @@
+import pytest
+
+from response_decoder import decode_json_object
+
+
+def test_plain_object_is_not_repaired():
+    assert decode_json_object('{"a": 1, "b": [1, 2]}', with_status=True) == (
+        {"a": 1, "b": [1, 2]},
+        False,
+    )
+
+
+def test_skips_prose_and_code_fences():
+    text = 'Here is the analysis:\n```json\n{"name": "Jane"}\n```\nHope this helps {:}'
+    assert decode_json_object(text) == {"name": "Jane"}
+
+
+def test_prose_with_braces_before_the_object():
+    assert decode_json_object('Use {braces} wisely. {"ok": true}') == {"ok": True}
+
+
+def test_trailing_commas_are_repaired():
+    assert decode_json_object('{"a": [1, 2,], "b": 3,}', with_status=True) == (
+        {"a": [1, 2], "b": 3},
+        True,
+    )
+
+
+def test_mismatched_closer_is_repaired():
+    assert decode_json_object('{"a": [1, 2}', with_status=True) == ({"a": [1, 2]}, True)
+
+
+def test_raw_newlines_in_strings_are_allowed():
+    assert decode_json_object('{"summary": "line one\nline two"}') == {
+        "summary": "line one\nline two"
+    }
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    assert decode_json_object('{"a": "}{", "b": "\\"}"} trailing }') == {"a": "}{", "b": '"}'}
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"skills": ["Python", "Go"', {"skills": ["Python", "Go"]}),
+        ('{"name": "Jane", "summary": "Backend eng', {"name": "Jane", "summary": "Backend eng"}),
+        ('{"name": "Jane", "years": ', {"name": "Jane"}),
+        ('{"a": {"b": 1}, "c": "x\\', {"a": {"b": 1}, "c": "x"}),
+        ('{"a": tru', {}),
+    ],
+)
+def test_truncated_output_keeps_the_complete_part(text, expected):
+    assert decode_json_object(text, with_status=True) == (expected, True)
+
+
+@pytest.mark.parametrize("text", ["", "no json here", "[1, 2, 3]"])
+def test_unrecoverable_text_raises_value_error(text):
+    with pytest.raises(ValueError):
+        decode_json_object(text)
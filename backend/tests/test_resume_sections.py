@@ -0,0 +1,85 @@
+from resume_sections import FANOUT_GROUPS, chunk_text, plan_fanout, split_sections
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 123 4567
+
+Professional Summary:
+Backend engineer with 12 years of experience.
+
+• Work Experience
+Acme Corp, Senior Engineer, 2015 - Present
+Built payment services in Go.
+
+Key Projects
+Log search: open-source tool in Rust.
+
+Technical Skills & Tools
+Python, Go, Rust
+
+Education
+M.S. Computer Science, 2009
+
+Experience
+Initech, Engineer, 2010 - 2015
+"""
+
+
+def test_split_sections_by_heading_lines():
+    sections = split_sections(RESUME)
+    assert list(sections) == ["header", "summary", "experience", "projects", "skills", "education"]
+    assert sections["header"] == "Jane Doe\njane@example.com | +1 555 123 4567"
+    assert sections["skills"] == "Python, Go, Rust"
+    # A repeated section is joined
+    assert sections["experience"].endswith(
+        "Built payment services in Go.\nInitech, Engineer, 2010 - 2015"
+    )
+
+
+def test_heading_words_inside_a_line_are_not_headings():
+    sections = split_sections("Jane Doe\nMy education and experience are listed below\nPython")
+    assert list(sections) == ["header"]
+
+
+def test_chunk_text_cuts_at_line_breaks():
+    text = "\n".join(f"line {i:02d} " + "x" * 20 for i in range(10))
+    chunks = chunk_text(text, 100)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert "\n".join(chunks) == text
+    assert all(chunk.startswith("line") for chunk in chunks)
+
+
+def test_chunk_text_cuts_a_long_line_at_max_chars():
+    assert chunk_text("a" * 250, 100) == ["a" * 100, "a" * 100, "a" * 50]
+
+
+def test_plan_fanout_sends_each_group_its_sections():
+    requests = plan_fanout(RESUME, chunk_chars=4000, max_requests=6)
+    assert [group for group, _, _ in requests] == ["profile", "projects", "skills"]
+    for group, keys, text in requests:
+        assert keys == FANOUT_GROUPS[group][1]
+    profile, projects, skills = (text for _, _, text in requests)
+    assert profile.startswith("HEADER\nJane Doe")
+    assert "EDUCATION\nM.S. Computer Science" in profile
+    assert projects.startswith("PROJECTS\nLog search") and "EXPERIENCE\nAcme" in projects
+    assert skills == (
+        "SKILLS\nPython, Go, Rust\n\nSUMMARY\nBackend engineer with 12 years of experience."
+        "\n\nPROJECTS\nLog search: open-source tool in Rust."
+    )
+
+
+def test_plan_fanout_needs_two_sections():
+    assert plan_fanout("Jane Doe\nSkills\nPython", 4000, 6) == []
+
+
+def test_plan_fanout_chunks_long_groups_and_keeps_every_group_under_the_cap():
+    jobs = "\n".join(f"Company {i}, Engineer, 2001 - 2002, built things" for i in range(200))
+    text = f"Jane Doe\nExperience\n{jobs}\nProjects\nLog search\nSkills\nPython"
+
+    uncapped = plan_fanout(text, chunk_chars=1000, max_requests=100)
+    assert all(len(chunk) <= 1000 for _, _, chunk in uncapped)
+    assert [group for group, _, _ in uncapped].count("profile") > 4
+
+    capped = plan_fanout(text, chunk_chars=1000, max_requests=4)
+    assert len(capped) == 4
+    assert [group for group, _, _ in capped] == ["profile", "projects", "skills", "profile"]
+    assert capped[0] == uncapped[0] and capped[3] == uncapped[1]
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import single_flight
+from deadline import Deadline, DeadlineExceeded
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+class WatchedEvent(threading.Event):
+    """Event that records which threads are waiting on it"""
+
+    def __init__(self):
+        super().__init__()
+        self.waiters = set()
+
+    def wait(self, timeout=None):
+        self.waiters.add(threading.get_ident())
+        return super().wait(timeout)
+
+
+class WatchedCall(single_flight._Call):
+    def __init__(self):
+        super().__init__()
+        self.done = WatchedEvent()
+
+
+@pytest.fixture
+def flight(monkeypatch):
+    monkeypatch.setattr(single_flight, "_Call", WatchedCall)
+    monkeypatch.setattr(single_flight, "WAIT_SLICE", 0.01)
+    return SingleFlight()
+
+
+class Calls:
+    """fn for flight.do that blocks the leader until released"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.count = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.count += 1
+        self.started.set()
+        self.release.wait(5)
+        outcome = self.outcomes[min(self.count, len(self.outcomes)) - 1]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def start(flight, fn, deadline=None) -> tuple:
+    """Thread calling flight.do("k", fn); outcome[0] is its result or exception"""
+    outcome = []
+
+    def call():
+        try:
+            outcome.append(flight.do("k", fn, deadline))
+        except BaseException as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=call)
+    thread.start()
+    return thread, outcome
+
+
+def wait_for_waiters(flight, count: int):
+    call = flight._calls["k"]
+    while len(call.done.waiters) < count:
+        time.sleep(0.001)
+
+
+def finish(fn, *threads):
+    fn.release.set()
+    for thread in threads:
+        thread.join(5)
+
+
+def test_concurrent_callers_share_one_call(flight):
+    fn = Calls("result")
+    leader, leader_outcome = start(flight, fn)
+    fn.started.wait(5)
+    waiters = [start(flight, fn) for _ in range(3)]
+    wait_for_waiters(flight, 3)
+    finish(fn, leader, *(thread for thread, _ in waiters))
+
+    assert fn.count == 1
+    assert leader_outcome == [("result", False)]
+    assert [outcome for _, outcome in waiters] == [[("result", True)]] * 3
+    assert flight.snapshot() == {"in_flight": 0, "leaders": 1, "coalesced": 3}
+
+
+def test_leader_exception_is_shared(flight):
+    fn = Calls(ValueError("boom"))
+    leader, leader_outcome = start(flight, fn)
+    fn.started.wait(5)
+    waiter, waiter_outcome = start(flight, fn)
+    wait_for_waiters(flight, 1)
+    finish(fn, leader, waiter)
+
+    assert isinstance(leader_outcome[0], ValueError)
+    assert waiter_outcome[0] is leader_outcome[0]
+
+
+def test_waiter_runs_again_when_the_leader_deadline_expires(flight):
+    fn = Calls(DeadlineExceeded("leader ran out of time"), "second")
+    leader, leader_outcome = start(flight, fn)
+    fn.started.wait(5)
+    waiter, waiter_outcome = start(flight, fn)
+    wait_for_waiters(flight, 1)
+    finish(fn, leader, waiter)
+
+    assert isinstance(leader_outcome[0], DeadlineExceeded)
+    assert waiter_outcome == [("second", False)]
+    assert fn.count == 2
+
+
+def test_waiter_gives_up_at_its_own_deadline(flight):
+    fn = Calls("late")
+    leader, _ = start(flight, fn)
+    fn.started.wait(5)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            flight.do("k", fn, Deadline(0.05))
+    finally:
+        finish(fn, leader)
+    assert flight.snapshot()["coalesced"] == 0
+
+
+def test_different_keys_and_later_calls_are_not_shared(flight):
+    assert flight.do("a", lambda: 1) == (1, False)
+    assert flight.do("b", lambda: 2) == (2, False)
+    assert flight.do("a", lambda: 3) == (3, False)
+    assert flight.snapshot() == {"in_flight": 0, "leaders": 3, "coalesced": 0}
+
+
+def test_async_callers_share_one_call():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", fn) for _ in range(4)))
+
+    assert asyncio.run(main()) == [("result", False)] + [("result", True)] * 3
+    assert calls == [1]
+    assert flight.snapshot() == {"in_flight": 0, "leaders": 1, "coalesced": 3}
+
+
+def test_async_waiter_runs_again_when_the_leader_is_cancelled():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do("k", fn))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do("k", fn))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(main()) == (2, False)
+    assert len(calls) == 2
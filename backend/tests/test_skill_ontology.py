@@ -0,0 +1,52 @@
+import pytest
+
+from skill_ontology import SkillOntology
+
+SKILL_CATEGORIES = {
+    "Programming Languages": ["c", "c++", "c#", "kotlin", "java"],
+    "Web Technologies": ["css", "node.js"],
+    "Frameworks & Libraries": ["spring", "spring boot"],
+}
+ALIASES = {"node.js": ["nodejs", "node"], "c#": ["csharp"]}
+
+
+@pytest.fixture(scope="module")
+def ontology():
+    return SkillOntology(SKILL_CATEGORIES, ALIASES)
+
+
+def test_symbol_skills_do_not_match_their_prefix(ontology):
+    assert ontology.find_skills("C++ developer") == {"c++"}
+    assert ontology.find_skills("Wrote C# and C") == {"c#", "c"}
+
+
+def test_aliases_map_to_the_canonical_skill(ontology):
+    assert ontology.find_skills("NodeJS services and CSharp") == {"node.js", "c#"}
+
+
+def test_longer_alias_also_counts_the_shorter_skill(ontology):
+    assert ontology.find_skills("Spring   Boot") == {"spring boot", "spring"}
+
+
+def test_no_partial_word_matches(ontology):
+    assert ontology.find_skills("javascript, cssx, springfield") == set()
+
+
+@pytest.mark.parametrize(
+    "text, skill",
+    [
+        ("I know cſſ well", "css"),  # long s folds to "s"
+        ("kotlın", "kotlin"),  # dotless i folds to "i"
+        ("Kotlin", "kotlin"),  # Kelvin sign folds to "k"
+    ],
+)
+def test_unicode_case_folds_match_without_key_error(ontology, text, skill):
+    assert ontology.find_skills(text) == {skill}
+
+
+def test_categorize_keeps_taxonomy_order(ontology):
+    assert ontology.categorize("Spring Boot, Java and Kotlin, CSS") == {
+        "Programming Languages": ["Kotlin", "Java"],
+        "Web Technologies": ["Css"],
+        "Frameworks & Libraries": ["Spring", "Spring Boot"],
+    }
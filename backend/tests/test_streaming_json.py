@@ -0,0 +1,62 @@
+from streaming_json import IncrementalObjectParser
+
+RESPONSE = (
+    'Sure! ```json\n{"personal_info": {"name": "Jane, Doe", "tags": ["a", "b"]}, '
+    '"summary": "uses \\"quotes\\" and {braces}", "years": 12}\n``` done {"x": 1}'
+)
+
+
+def feed_all(chunks) -> tuple:
+    parser = IncrementalObjectParser()
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return parser, completed
+
+
+def test_members_complete_in_order():
+    parser, completed = feed_all([RESPONSE])
+    assert completed == [
+        ("personal_info", {"name": "Jane, Doe", "tags": ["a", "b"]}),
+        ("summary", 'uses "quotes" and {braces}'),
+        ("years", 12),
+    ]
+    assert parser.done
+
+
+def test_any_chunking_gives_the_same_members():
+    _, whole = feed_all([RESPONSE])
+    for size in (1, 2, 3, 7, 16):
+        _, chunked = feed_all(RESPONSE[i : i + size] for i in range(0, len(RESPONSE), size))
+        assert chunked == whole
+
+
+def test_member_is_emitted_as_soon_as_it_closes():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"personal_info": {"name": "Jane"}') == []
+    assert parser.feed(', "proj') == [("personal_info", {"name": "Jane"})]
+    assert not parser.done
+
+
+def test_text_after_the_object_is_ignored():
+    parser, _ = feed_all([RESPONSE])
+    assert parser.feed('{"late": 1}') == []
+    assert "x" not in parser.members
+
+
+def test_stray_bracket_before_the_object_is_skipped():
+    _, completed = feed_all(['Result [see below]: {"a": 1}'])
+    assert completed == [("a", 1)]
+
+
+def test_finish_salvages_a_truncated_member():
+    parser, completed = feed_all(['{"a": 1, "skills": ["Python", "G'])
+    assert completed == [("a", 1)]
+    assert parser.finish() == [("skills", ["Python", "G"])]
+    assert parser.members == {"a": 1, "skills": ["Python", "G"]}
+    assert parser.finish() == []
+
+
+def test_malformed_member_is_dropped():
+    _, completed = feed_all(['{"a": nope, "b": 2}'])
+    assert completed == [("b", 2)]
@@ -0,0 +1,31 @@
+import io
+import os
+
+from werkzeug.test import EnvironBuilder
+
+from upload_stream import SPOOL_MAX_MEMORY, UploadRequest, upload_source
+
+
+def upload_request(size: int) -> UploadRequest:
+    builder = EnvironBuilder(
+        method="POST", data={"file": (io.BytesIO(b"x" * size), "resume.pdf")}
+    )
+    return UploadRequest(builder.get_environ())
+
+
+def test_small_upload_stays_in_memory():
+    request = upload_request(1024)
+    assert upload_source(request.files["file"].stream) == b"x" * 1024
+    request.close()
+
+
+def test_large_upload_is_reopenable_by_name_and_deleted_on_close():
+    request = upload_request(SPOOL_MAX_MEMORY + 1)
+    path = upload_source(request.files["file"].stream)
+    assert isinstance(path, str)
+    # Workers open the file by name while the request still holds it open
+    with open(path, "rb") as reopened:
+        assert len(reopened.read()) == SPOOL_MAX_MEMORY + 1
+
+    request.close()
+    assert not os.path.exists(path)
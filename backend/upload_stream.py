@@ -0,0 +1,130 @@
+import io
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+
+from flask import Request
+
+# Uploads up to this size stay in memory, larger ones go to a named temp file
+SPOOL_MAX_MEMORY = 500 * 1024
+
+
+class UploadRequest(Request):
+    """Request that spools large uploads to named temp files
+
+    Werkzeug's default spool rolls over to an anonymous TemporaryFile, which
+    extractor worker processes cannot open. A named file lets them read the
+    upload by path instead of receiving a pickled copy of its bytes. The file
+    is created with delete=False, since Windows cannot reopen a delete=True
+    temp file by name while it is open, and is deleted when the request
+    closes.
+
+    endpoint_limits overrides MAX_CONTENT_LENGTH for endpoints that accept
+    larger bodies (e.g. batch uploads).
+    """
+
+    endpoint_limits = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._spooled_paths = []
+
+    @property
+    def max_content_length(self):
+        limit = self.endpoint_limits.get(self.endpoint)
+        if limit is not None:
+            return limit
+        return super().max_content_length
+
+    def _get_file_stream(
+        self, total_content_length, content_type, filename=None, content_length=None
+    ):
+        if total_content_length is not None and total_content_length <= SPOOL_MAX_MEMORY:
+            return io.BytesIO()
+        spooled = tempfile.NamedTemporaryFile("wb+", prefix="upload-", delete=False)
+        self._spooled_paths.append(spooled.name)
+        return spooled
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            for path in self._spooled_paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass  # already gone
+
+
+def upload_size(stream) -> int:
+    """Size of an uploaded stream without reading it"""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _memory_buffer(stream):
+    """The BytesIO holding an upload that is still in memory, or None"""
+    if isinstance(stream, io.BytesIO):
+        return stream
+    # Starlette spools uploads to a SpooledTemporaryFile, whose fileno()
+    # would roll it over to disk
+    if isinstance(stream, tempfile.SpooledTemporaryFile) and not stream._rolled:
+        return stream._file
+    return None
+
+
+def upload_path(stream):
+    """Filesystem path of an upload spooled to disk, or None"""
+    name = getattr(stream, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        stream.flush()
+        return name
+    return None
+
+
+def upload_source(stream):
+    """Path of the upload when it is on disk, otherwise its bytes"""
+    path = upload_path(stream)
+    if path is not None:
+        return path
+    buffer = _memory_buffer(stream)
+    if buffer is not None:
+        return buffer.getvalue()
+    stream.seek(0)
+    content = stream.read()
+    stream.seek(0)
+    return content
+
+
+@contextmanager
+def upload_view(stream):
+    """Zero-copy buffer over the upload (mmap for files, memoryview for BytesIO)"""
+    buffer = _memory_buffer(stream)
+    if buffer is not None:
+        view = buffer.getbuffer()
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+
+    if fileno is None or upload_size(stream) == 0:
+        stream.seek(0)
+        yield stream.read()
+        stream.seek(0)
+        return
+
+    stream.flush()
+    view = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    try:
+        yield view
+    finally:
+        view.close()
@@ -56,6 +56,8 @@ export async function POST(request: NextRequest) {
             const analysisResponse = await fetch(`${BACKEND_URL}/backend/analyze_resume_direct`, {
                 method: 'POST',
                 body: backendFormData,
+                // Let the backend finish (or fall back) before we abort at 60s
+                headers: { 'X-Request-Timeout': '55' },
                 signal: controller.signal,
             });
 